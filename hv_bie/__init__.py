@@ -1,3 +1,48 @@
-from .snapshot import parse_snapshot
+from .aio import AsyncParser, parse_snapshot_async
+from .archive import iter_pages, iter_snapshots
+from .batch import parse_many, parse_many_keyed
+from .cache import CacheInfo, SnapshotCache
+from .diff import SnapshotDelta, apply_delta, diff
+from .export import to_columns, write_columns
+from .fragments import parse_fragments
+from .observe import Span, add_observer, observing, remove_observer
+from .parsers import LogCursor
+from .parsers.backends import (
+    available_backends,
+    get_default_backend,
+    set_default_backend,
+)
+from .session import BattleSession
+from .snapshot import LazyBattleSnapshot, parse_snapshot
+from .stats import ParseStats
+from .store import HistoryStore
 
-__all__ = ["parse_snapshot"]
+__all__ = [
+    "parse_snapshot",
+    "LazyBattleSnapshot",
+    "ParseStats",
+    "add_observer",
+    "remove_observer",
+    "observing",
+    "Span",
+    "parse_snapshot_async",
+    "AsyncParser",
+    "parse_fragments",
+    "diff",
+    "apply_delta",
+    "SnapshotDelta",
+    "BattleSession",
+    "HistoryStore",
+    "parse_many",
+    "parse_many_keyed",
+    "SnapshotCache",
+    "CacheInfo",
+    "iter_pages",
+    "iter_snapshots",
+    "to_columns",
+    "write_columns",
+    "LogCursor",
+    "available_backends",
+    "get_default_backend",
+    "set_default_backend",
+]
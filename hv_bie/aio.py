@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Optional, Union
+
+from .snapshot import parse_snapshot
+from .types.models import BattleSnapshot
+
+EXECUTOR_KINDS: tuple[str, ...] = ("thread", "process")
+
+
+class AsyncParser:
+    """Parse battle pages off the event loop, with bounded concurrency.
+
+    ``executor`` is ``"thread"`` (default), ``"process"`` or an existing
+    ``concurrent.futures.Executor``; executors created here are owned and shut
+    down by ``close()``. At most ``max_concurrency`` pages (default
+    ``max_workers``, or 4) are submitted at once; further ``parse()`` calls
+    wait for a free slot, so the executor queue cannot grow without bound.
+    """
+
+    def __init__(
+        self,
+        executor: Union[str, Executor] = "thread",
+        *,
+        max_workers: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        limit = max_concurrency if max_concurrency is not None else max_workers or 4
+        if limit < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if isinstance(executor, Executor):
+            self._executor = executor
+            self._owned = False
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="hv_bie"
+            )
+            self._owned = True
+        elif executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+            self._owned = True
+        else:
+            raise ValueError(
+                f"unknown executor {executor!r}; expected one of {list(EXECUTOR_KINDS)}"
+            )
+        self.max_concurrency = limit
+        self._slots = asyncio.Semaphore(limit)
+        self._in_process = isinstance(self._executor, ProcessPoolExecutor)
+
+    async def parse(self, html: str, **options: Any) -> BattleSnapshot:
+        """Parse one page in the executor; ``options`` go to ``parse_snapshot``."""
+        if self._in_process and options.get("log_cursor") is not None:
+            # The cursor would be updated in a copy inside the worker
+            raise ValueError("log_cursor requires a thread executor")
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(parse_snapshot, html, **options)
+            )
+
+    def close(self) -> None:
+        if self._owned:
+            self._executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self) -> AsyncParser:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+
+async def parse_snapshot_async(html: str, **options: Any) -> BattleSnapshot:
+    """Parse one page in the event loop's default executor.
+
+    Returns the same ``BattleSnapshot`` as ``parse_snapshot(html, **options)``
+    without blocking the loop; use ``AsyncParser`` to bound concurrency.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(parse_snapshot, html, **options))
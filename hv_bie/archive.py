@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import gzip
+import json
+import mmap
+import os
+import tarfile
+import zipfile
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import IO, Any, Iterable, Iterator, Optional, Union
+
+from .batch import _empty_snapshot, parse_many_keyed
+from .types.models import BattleSnapshot
+
+PAGE_PATTERNS: tuple[str, ...] = ("*.htm", "*.html")
+_JSONL_SUFFIXES: tuple[str, ...] = (".jsonl", ".ndjson", ".jsonl.gz", ".ndjson.gz")
+
+Source = Union[str, "os.PathLike[str]"]
+
+
+def _decode(data: Union[bytes, mmap.mmap]) -> str:
+    # str() decodes any buffer in place, without copying it to bytes first
+    return str(data, "utf-8", "replace")
+
+
+class UnreadablePage(str):
+    """An empty page standing in for a dump record that could not be read.
+
+    ``iter_pages`` yields it as the HTML of such a record; ``reason`` says
+    what was wrong. ``iter_snapshots`` turns it into an empty snapshot with
+    an ``unreadable record: ...`` warning instead of parsing it.
+    """
+
+    reason: str
+
+    def __new__(cls, reason: str) -> UnreadablePage:
+        page = super().__new__(cls, "")
+        page.reason = reason
+        return page
+
+
+def _is_page(name: str, patterns: tuple[str, ...]) -> bool:
+    base = name.rsplit("/", 1)[-1]
+    return any(fnmatch(base, p) for p in patterns)
+
+
+def _read_mapped(path: Path) -> str:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            return _decode(m)
+
+
+def _iter_directory(root: Path, patterns: tuple[str, ...]) -> Iterator[tuple[str, str]]:
+    paths = sorted(
+        p for p in root.rglob("*") if p.is_file() and _is_page(p.name, patterns)
+    )
+    for path in paths:
+        yield str(path), _read_mapped(path)
+
+
+def _iter_zip(path: Path, patterns: tuple[str, ...]) -> Iterator[tuple[str, str]]:
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not _is_page(info.filename, patterns):
+                continue
+            with zf.open(info) as member:
+                yield f"{path}!{info.filename}", _decode(member.read())
+
+
+def _iter_tar(path: Path, patterns: tuple[str, ...]) -> Iterator[tuple[str, str]]:
+    # "r|*" reads the (possibly compressed) stream front to back, once
+    with tarfile.open(path, "r|*") as tf:
+        for info in tf:
+            if not info.isfile() or not _is_page(info.name, patterns):
+                continue
+            member = tf.extractfile(info)
+            if member is not None:
+                yield f"{path}!{info.name}", _decode(member.read())
+
+
+def _iter_jsonl(
+    path: Path, html_key: str, id_key: Optional[str]
+) -> Iterator[tuple[str, str]]:
+    opener = gzip.open if path.name.endswith(".gz") else open
+    f: IO[str]
+    with opener(path, "rt", encoding="utf-8", errors="replace") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record: Any = None
+            html: str
+            try:
+                record = json.loads(line)
+                html = record[html_key]
+                if not isinstance(html, str):
+                    raise TypeError(f"{html_key!r} is not a string")
+            except ValueError as exc:
+                html = UnreadablePage(f"invalid JSON: {exc}")
+            except KeyError:
+                html = UnreadablePage(f"no {html_key!r} field")
+            except TypeError as exc:
+                html = UnreadablePage(str(exc))
+            source_id = (
+                record.get(id_key) if id_key and isinstance(record, dict) else None
+            )
+            yield str(source_id or f"{path}:{lineno}"), html
+
+
+def iter_pages(
+    source: Source,
+    *,
+    patterns: Iterable[str] = PAGE_PATTERNS,
+    html_key: str = "html",
+    id_key: Optional[str] = "id",
+) -> Iterator[tuple[str, str]]:
+    """Lazily yield ``(source_id, html)`` for every battle page in ``source``.
+
+    ``source`` is a directory (searched recursively, files memory-mapped),
+    a zip or tar archive (tar may be gzip/bz2/xz compressed and is streamed),
+    a JSONL dump (``.jsonl``/``.ndjson``, optionally ``.gz``; one object per
+    line holding the page under ``html_key`` and its id under ``id_key``) or
+    a single HTML file. Archive members are read one at a time. Ids are the
+    file path, ``<archive>!<member>`` or the record id (``<dump>:<line>``
+    when absent). A dump record that is not JSON or has no string page
+    under ``html_key`` is yielded as an empty ``UnreadablePage`` whose
+    ``reason`` says why.
+    """
+    path = Path(source)
+    pats = tuple(patterns)
+    if path.is_dir():
+        return _iter_directory(path, pats)
+    if path.name.endswith(_JSONL_SUFFIXES):
+        return _iter_jsonl(path, html_key, id_key)
+    if zipfile.is_zipfile(path):
+        return _iter_zip(path, pats)
+    if tarfile.is_tarfile(path):
+        return _iter_tar(path, pats)
+    return iter([(str(path), _read_mapped(path))])
+
+
+def iter_snapshots(
+    source: Source,
+    *,
+    patterns: Iterable[str] = PAGE_PATTERNS,
+    html_key: str = "html",
+    id_key: Optional[str] = "id",
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    backend: Optional[str] = None,
+    sections: Optional[Iterable[str]] = None,
+    log_events: bool = False,
+    engine: str = "soup",
+    collect_stats: bool = False,
+) -> Iterator[tuple[str, BattleSnapshot]]:
+    """Lazily yield ``(source_id, snapshot)`` for every page in ``source``.
+
+    Pages come from ``iter_pages`` and are parsed through
+    ``parse_many_keyed``, so ``workers``, ``chunksize`` and ``ordered`` have
+    the same meaning and only a bounded number of pages is held in memory.
+    Unreadable dump records yield an empty snapshot whose only warning is
+    ``unreadable record: <reason>``.
+    """
+    pages = iter_pages(source, patterns=patterns, html_key=html_key, id_key=id_key)
+    # Unreadable records ride along in the key and skip the parser
+    keyed = (
+        (
+            ((sid, html.reason), "")
+            if isinstance(html, UnreadablePage)
+            else ((sid, None), html)
+        )
+        for sid, html in pages
+    )
+    results = parse_many_keyed(
+        keyed,
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+        backend=backend,
+        sections=sections,
+        log_events=log_events,
+        engine=engine,
+        collect_stats=collect_stats,
+    )
+    for (sid, reason), snap in results:
+        if reason is not None:
+            snap = _empty_snapshot(f"unreadable record: {reason}")
+        yield sid, snap
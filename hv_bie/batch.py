@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Hashable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Iterable, Iterator, Optional, TypeVar
+
+from .snapshot import _check_engine, parse_snapshot
+from .types.models import (
+    AbilitiesState,
+    BattleSnapshot,
+    CombatLog,
+    ItemsState,
+    PlayerState,
+)
+
+K = TypeVar("K", bound=Hashable)
+
+
+def _empty_snapshot(warning: str) -> BattleSnapshot:
+    return BattleSnapshot(
+        player=PlayerState(),
+        abilities=AbilitiesState(),
+        monsters={},
+        log=CombatLog(),
+        items=ItemsState(),
+        warnings=[warning],
+    )
+
+
+def _failed_snapshot(exc: BaseException) -> BattleSnapshot:
+    return _empty_snapshot(f"parse failed: {type(exc).__name__}: {exc}")
+
+
+def _parse_one(html: str, options: dict[str, Any]) -> BattleSnapshot:
+    try:
+        return parse_snapshot(html, **options)
+    except Exception as exc:
+        return _failed_snapshot(exc)
+
+
+def _parse_chunk(pages: list[str], options: dict[str, Any]) -> list[BattleSnapshot]:
+    # Runs in a worker process; only the HTML travels there, keys stay home
+    return [_parse_one(html, options) for html in pages]
+
+
+def _chunks(
+    pairs: Iterable[tuple[K, str]], size: int
+) -> Iterator[tuple[list[K], list[str]]]:
+    it = iter(pairs)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield [k for k, _ in chunk], [html for _, html in chunk]
+
+
+# A submitted chunk: its keys and the future for its snapshots
+_Pending = tuple[list[K], Future[list[BattleSnapshot]]]
+
+
+def _results(
+    keys: list[K], future: Future[list[BattleSnapshot]]
+) -> Iterator[tuple[K, BattleSnapshot]]:
+    try:
+        snaps = future.result()
+    except Exception as exc:
+        snaps = [_failed_snapshot(exc)] * len(keys)
+    return zip(keys, snaps)
+
+
+def _drain(
+    pending: deque[_Pending[K]], ordered: bool, keep: int
+) -> Iterator[tuple[K, BattleSnapshot]]:
+    # Yield finished chunks until no more than ``keep`` remain in flight
+    while len(pending) > keep:
+        if ordered:
+            done = [pending[0]]
+        else:
+            wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+            done = [entry for entry in pending if entry[1].done()]
+        for entry in done:
+            pending.remove(entry)
+            yield from _results(*entry)
+
+
+def parse_many_keyed(
+    pairs: Iterable[tuple[K, str]],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    backend: Optional[str] = None,
+    sections: Optional[Iterable[str]] = None,
+    log_events: bool = False,
+    engine: str = "soup",
+    collect_stats: bool = False,
+) -> Iterator[tuple[K, BattleSnapshot]]:
+    """Parse ``(key, html)`` pairs in worker processes, yielding ``(key, snapshot)``.
+
+    Pages are sent to the workers ``chunksize`` at a time and at most two
+    chunks per worker are in flight, so the input is consumed lazily and
+    memory stays bounded. With ``ordered=False`` results are yielded as
+    chunks complete. A page that fails to parse yields an empty snapshot
+    whose ``warnings`` describe the error. ``workers`` defaults to the CPU
+    count; ``workers <= 1`` parses serially in this process. ``backend``,
+    ``sections``, ``log_events``, ``engine`` and ``collect_stats`` are passed
+    on to ``parse_snapshot``; stats travel back from the workers with their
+    snapshots.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    options: dict[str, Any] = {
+        "backend": backend,
+        "log_events": log_events,
+        "engine": _check_engine(engine),
+        "collect_stats": collect_stats,
+    }
+    if sections is not None:
+        options["sections"] = (
+            (sections,) if isinstance(sections, str) else tuple(sections)
+        )
+    n_workers = (os.cpu_count() or 1) if workers is None else workers
+    if n_workers <= 1:
+        for key, html in pairs:
+            yield key, _parse_one(html, options)
+        return
+
+    # At most two chunks per worker are queued or running at any time
+    max_pending = 2 * n_workers
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        pending: deque[_Pending[K]] = deque()
+        for keys, pages in _chunks(pairs, chunksize):
+            pending.append((keys, pool.submit(_parse_chunk, pages, options)))
+            yield from _drain(pending, ordered, max_pending - 1)
+        yield from _drain(pending, ordered, 0)
+
+
+def parse_many(
+    pages: Iterable[str],
+    *,
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    ordered: bool = True,
+    backend: Optional[str] = None,
+    sections: Optional[Iterable[str]] = None,
+    log_events: bool = False,
+    engine: str = "soup",
+    collect_stats: bool = False,
+) -> Iterator[BattleSnapshot]:
+    """Parse many battle pages in worker processes; see ``parse_many_keyed``.
+
+    Yields one snapshot per page, in input order unless ``ordered=False``.
+    """
+    for _, snap in parse_many_keyed(
+        enumerate(pages),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+        backend=backend,
+        sections=sections,
+        log_events=log_events,
+        engine=engine,
+        collect_stats=collect_stats,
+    ):
+        yield snap
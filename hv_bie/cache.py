@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import sys
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from hashlib import blake2b
+from threading import Lock
+from typing import Any, Hashable, NamedTuple, Optional
+
+from .parsers.backends import resolve_backend
+from .parsers.plan import DEFAULT_PLAN
+from .snapshot import _check_engine, _select_sections, parse_snapshot
+from .types.models import BattleSnapshot
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+    nbytes: int
+    max_bytes: Optional[int]
+
+
+def _deep_size(obj: Any, seen: set[int]) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(
+            _deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_deep_size(v, seen) for v in obj)
+    if is_dataclass(obj):
+        size += sum(_deep_size(getattr(obj, f.name), seen) for f in fields(obj))
+    if hasattr(obj, "__dict__"):
+        # Hidden per-snapshot parse state (section digests, stats)
+        size += _deep_size(vars(obj), seen)
+    return size
+
+
+def snapshot_nbytes(snap: BattleSnapshot) -> int:
+    """Approximate memory held by ``snap`` (shared objects counted once)."""
+    return _deep_size(snap, set())
+
+
+class SnapshotCache:
+    """LRU cache of parsed snapshots keyed on a hash of the page HTML.
+
+    ``parse(html, **options)`` returns the ``BattleSnapshot`` already built
+    for the same HTML and result-shaping options (the resolved ``backend``,
+    ``sections``, ``log_events``, ``plan``, ``engine``, ``collect_stats``),
+    or parses and stores it. Entries are evicted least recently used first once there
+    are more than ``maxsize`` of them or their estimated size exceeds
+    ``max_bytes``; ``None`` disables either limit (sizes, and ``nbytes`` in
+    ``info()``, are only measured when there is a byte budget). Snapshots
+    are shared between callers and must not be modified.
+
+    Parses with ``log_cursor`` (which depend on and update the cursor) or
+    ``lazy=True`` bypass the cache and are not counted. ``previous`` is
+    only used on a miss; the snapshot is the same either way.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 256, max_bytes: Optional[int] = None):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be non-negative")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[BattleSnapshot, int]] = OrderedDict()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = Lock()
+
+    def _key(
+        self,
+        html: str,
+        backend: Optional[str] = None,
+        sections: Any = None,
+        log_events: bool = False,
+        plan: Any = None,
+        engine: str = "soup",
+        collect_stats: bool = False,
+    ) -> Hashable:
+        digest = blake2b(html.encode("utf-8"), digest_size=16).digest()
+        return (
+            digest,
+            # The builder actually used, so None follows set_default_backend()
+            resolve_backend(backend),
+            _select_sections(sections),
+            log_events,
+            # Plans are compiled once and compared by identity
+            plan if plan is not None else DEFAULT_PLAN,
+            _check_engine(engine),
+            collect_stats,
+        )
+
+    def parse(self, html: str, **options: Any) -> BattleSnapshot:
+        if options.get("log_cursor") is not None or options.get("lazy"):
+            return parse_snapshot(html, **options)
+        previous = options.pop("previous", None)
+        # Explicit defaults of the bypass options do not shape the result
+        options.pop("lazy", None)
+        options.pop("log_cursor", None)
+        key = self._key(html, **options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        snap = parse_snapshot(html, previous=previous, **options)
+        nbytes = snapshot_nbytes(snap) if self.max_bytes is not None else 0
+        with self._lock:
+            self._store(key, snap, nbytes)
+        return snap
+
+    def _store(self, key: Hashable, snap: BattleSnapshot, nbytes: int) -> None:
+        if key in self._entries:
+            # Another thread parsed the same page meanwhile
+            self._entries.move_to_end(key)
+            return
+        if self.maxsize == 0 or (
+            self.max_bytes is not None and nbytes > self.max_bytes
+        ):
+            return
+        self._entries[key] = (snap, nbytes)
+        self._nbytes += nbytes
+        while (self.maxsize is not None and len(self._entries) > self.maxsize) or (
+            self.max_bytes is not None and self._nbytes > self.max_bytes
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._nbytes -= evicted
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self.maxsize,
+                len(self._entries),
+                self._nbytes,
+                self.max_bytes,
+            )
+
+    def clear(self) -> None:
+        """Drop every entry and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,463 @@
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Iterator, Optional, Sequence
+
+from .types.models import (
+    AbilitiesState,
+    Ability,
+    BattleSnapshot,
+    Buff,
+    CombatLog,
+    Item,
+    ItemsState,
+    LogEvents,
+    Monster,
+    PlayerState,
+    QuickSlot,
+)
+
+# Stream layout: MAGIC, version byte, then records of (uvarint length, body).
+# Recurring strings (names, ids, warnings) are written once per stream and
+# referenced by index afterwards. Log lines rarely recur beyond the next
+# turn, so they only refer back to the previous record's lines.
+MAGIC = b"HVBS"
+VERSION = 2
+
+_F64 = struct.Struct("<d")
+
+
+class CodecError(ValueError):
+    """Raised for data that is not a valid snapshot stream."""
+
+
+class _Writer:
+    __slots__ = ("buf", "ids", "prev_lines")
+
+    def __init__(
+        self, ids: dict[str, int], prev_lines: Optional[dict[str, int]] = None
+    ):
+        self.buf = bytearray()
+        self.ids = ids
+        self.prev_lines = prev_lines if prev_lines is not None else {}
+
+    def uvarint(self, n: int) -> None:
+        buf = self.buf
+        while n > 0x7F:
+            buf.append((n & 0x7F) | 0x80)
+            n >>= 7
+        buf.append(n)
+
+    def svarint(self, n: int) -> None:
+        self.uvarint((n << 1) if n >= 0 else ((-n << 1) - 1))
+
+    def opt_int(self, n: Optional[int]) -> None:
+        if n is None:
+            self.uvarint(0)
+        else:
+            self.uvarint(1)
+            self.svarint(n)
+
+    def f64(self, x: float) -> None:
+        self.buf += _F64.pack(x)
+
+    def flag(self, b: bool) -> None:
+        self.buf.append(1 if b else 0)
+
+    def opt_text(self, s: Optional[str]) -> None:
+        # 0: None, 1: new string (length + UTF-8), n >= 2: table[n - 2]
+        if s is None:
+            self.buf.append(0)
+            return
+        idx = self.ids.get(s)
+        if idx is not None:
+            self.uvarint(idx + 2)
+            return
+        self.ids[s] = len(self.ids)
+        raw = s.encode("utf-8")
+        self.buf.append(1)
+        self.uvarint(len(raw))
+        self.buf += raw
+
+    text = opt_text
+
+    def line(self, s: str) -> None:
+        # 0: inline (length + UTF-8), n >= 1: previous record's lines[n - 1]
+        idx = self.prev_lines.get(s)
+        if idx is not None:
+            self.uvarint(idx + 1)
+            return
+        raw = s.encode("utf-8")
+        self.buf.append(0)
+        self.uvarint(len(raw))
+        self.buf += raw
+
+    def slot(self, slot: str | int) -> None:
+        if isinstance(slot, int):
+            self.buf.append(0)
+            self.svarint(slot)
+        else:
+            self.buf.append(1)
+            self.text(slot)
+
+
+class _Reader:
+    __slots__ = ("data", "pos", "end", "strings", "prev_lines")
+
+    def __init__(
+        self,
+        data: bytes,
+        pos: int,
+        end: int,
+        strings: list[str],
+        prev_lines: Sequence[str] = (),
+    ):
+        self.data = data
+        self.pos = pos
+        self.end = end
+        self.strings = strings
+        self.prev_lines = prev_lines
+
+    def byte(self) -> int:
+        if self.pos >= self.end:
+            raise CodecError("truncated snapshot record")
+        b = self.data[self.pos]
+        self.pos += 1
+        return b
+
+    def uvarint(self) -> int:
+        pos = self.pos
+        if pos < self.end and self.data[pos] < 0x80:
+            # Single-byte fast path: counts, small ints and most string refs
+            self.pos = pos + 1
+            return self.data[pos]
+        n = shift = 0
+        while True:
+            b = self.byte()
+            n |= (b & 0x7F) << shift
+            if b < 0x80:
+                return n
+            shift += 7
+
+    def svarint(self) -> int:
+        n = self.uvarint()
+        return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+
+    def opt_int(self) -> Optional[int]:
+        return self.svarint() if self.uvarint() else None
+
+    def f64(self) -> float:
+        end = self.pos + 8
+        if end > self.end:
+            raise CodecError("truncated snapshot record")
+        (x,) = _F64.unpack_from(self.data, self.pos)
+        self.pos = end
+        return x
+
+    def flag(self) -> bool:
+        return self.byte() != 0
+
+    def opt_text(self) -> Optional[str]:
+        tag = self.uvarint()
+        if tag == 0:
+            return None
+        if tag == 1:
+            length = self.uvarint()
+            end = self.pos + length
+            if end > self.end:
+                raise CodecError("truncated snapshot record")
+            s = self.data[self.pos : end].decode("utf-8")
+            self.pos = end
+            self.strings.append(s)
+            return s
+        try:
+            return self.strings[tag - 2]
+        except IndexError:
+            raise CodecError(f"unknown string reference {tag - 2}") from None
+
+    def text(self) -> str:
+        s = self.opt_text()
+        if s is None:
+            raise CodecError("unexpected null string")
+        return s
+
+    def line(self) -> str:
+        tag = self.uvarint()
+        if tag == 0:
+            length = self.uvarint()
+            end = self.pos + length
+            if end > self.end:
+                raise CodecError("truncated snapshot record")
+            s = self.data[self.pos : end].decode("utf-8")
+            self.pos = end
+            return s
+        try:
+            return self.prev_lines[tag - 1]
+        except IndexError:
+            raise CodecError(f"unknown log line reference {tag - 1}") from None
+
+    def slot(self) -> str | int:
+        return self.svarint() if self.byte() == 0 else self.text()
+
+
+def _write_buffs(w: _Writer, buffs: dict[str, Buff]) -> None:
+    w.uvarint(len(buffs))
+    for key, b in buffs.items():
+        w.text(key)
+        w.text(b.name)
+        w.f64(b.remaining_turns)
+        w.flag(b.is_permanent)
+
+
+def _read_buffs(r: _Reader) -> dict[str, Buff]:
+    buffs: dict[str, Buff] = {}
+    for _ in range(r.uvarint()):
+        key = r.text()
+        buffs[key] = Buff(r.text(), r.f64(), r.flag())
+    return buffs
+
+
+def _write_abilities(w: _Writer, abilities: dict[str, Ability]) -> None:
+    w.uvarint(len(abilities))
+    for key, a in abilities.items():
+        w.text(key)
+        w.text(a.name)
+        w.text(a.element_id)
+        w.flag(a.available)
+        w.svarint(a.cost)
+        w.opt_text(a.cost_type)
+        w.svarint(a.cooldown_turns)
+
+
+def _read_abilities(r: _Reader) -> dict[str, Ability]:
+    abilities: dict[str, Ability] = {}
+    for _ in range(r.uvarint()):
+        key = r.text()
+        abilities[key] = Ability(
+            r.text(), r.text(), r.flag(), r.svarint(), r.opt_text(), r.svarint()
+        )
+    return abilities
+
+
+def _write_strs(w: _Writer, strings: list[str]) -> None:
+    w.uvarint(len(strings))
+    for s in strings:
+        w.text(s)
+
+
+def _read_strs(r: _Reader) -> list[str]:
+    return [r.text() for _ in range(r.uvarint())]
+
+
+def _write_ints(w: _Writer, values: list[int]) -> None:
+    w.uvarint(len(values))
+    for n in values:
+        w.svarint(n)
+
+
+def _read_ints(r: _Reader) -> list[int]:
+    return [r.svarint() for _ in range(r.uvarint())]
+
+
+def _write_snapshot(w: _Writer, snap: BattleSnapshot) -> None:
+    p = snap.player
+    w.f64(p.hp_percent)
+    w.svarint(p.hp_value)
+    w.f64(p.mp_percent)
+    w.svarint(p.mp_value)
+    w.f64(p.sp_percent)
+    w.svarint(p.sp_value)
+    w.svarint(p.overcharge_value)
+    _write_buffs(w, p.buffs)
+
+    _write_abilities(w, snap.abilities.skills)
+    _write_abilities(w, snap.abilities.spells)
+
+    w.uvarint(len(snap.monsters))
+    for idx, m in snap.monsters.items():
+        w.svarint(idx)
+        w.svarint(m.slot_index)
+        w.text(m.name)
+        w.flag(m.alive)
+        w.opt_text(m.system_monster_type)
+        w.f64(m.hp_percent)
+        w.f64(m.mp_percent)
+        w.f64(m.sp_percent)
+        _write_buffs(w, m.buffs)
+
+    log = snap.log
+    w.uvarint(len(log.lines))
+    for line in log.lines:
+        w.line(line)
+    w.opt_int(log.current_round)
+    w.opt_int(log.total_round)
+    ev = log.events
+    w.flag(ev is not None)
+    if ev is not None:
+        _write_strs(w, ev.kinds)
+        _write_strs(w, ev.sources)
+        _write_strs(w, ev.targets)
+        _write_ints(w, ev.amounts)
+        _write_strs(w, ev.details)
+        _write_ints(w, ev.line_index)
+
+    w.uvarint(len(snap.items.items))
+    for key, it in snap.items.items.items():
+        w.text(key)
+        w.slot(it.slot)
+        w.text(it.name)
+        w.text(it.element_id)
+        w.flag(it.available)
+    w.uvarint(len(snap.items.quickbar))
+    for q in snap.items.quickbar:
+        w.slot(q.slot)
+        w.text(q.name)
+
+    _write_strs(w, snap.warnings)
+
+
+def _read_snapshot(r: _Reader) -> BattleSnapshot:
+    # Arguments are evaluated left to right, in field order
+    player = PlayerState(
+        r.f64(),
+        r.svarint(),
+        r.f64(),
+        r.svarint(),
+        r.f64(),
+        r.svarint(),
+        r.svarint(),
+        _read_buffs(r),
+    )
+    abilities = AbilitiesState(_read_abilities(r), _read_abilities(r))
+
+    monsters: dict[int, Monster] = {}
+    for _ in range(r.uvarint()):
+        idx = r.svarint()
+        monsters[idx] = Monster(
+            r.svarint(),
+            r.text(),
+            r.flag(),
+            r.opt_text(),
+            r.f64(),
+            r.f64(),
+            r.f64(),
+            _read_buffs(r),
+        )
+
+    lines = [r.line() for _ in range(r.uvarint())]
+    current_round = r.opt_int()
+    total_round = r.opt_int()
+    events = None
+    if r.flag():
+        events = LogEvents(
+            _read_strs(r),
+            _read_strs(r),
+            _read_strs(r),
+            _read_ints(r),
+            _read_strs(r),
+            _read_ints(r),
+        )
+    log = CombatLog(lines, current_round, total_round, events)
+
+    items: dict[str, Item] = {}
+    for _ in range(r.uvarint()):
+        name = r.text()
+        items[name] = Item(r.slot(), r.text(), r.text(), r.flag())
+    quickbar = [QuickSlot(r.slot(), r.text()) for _ in range(r.uvarint())]
+
+    return BattleSnapshot(
+        player, abilities, monsters, log, ItemsState(items, quickbar), _read_strs(r)
+    )
+
+
+class SnapshotEncoder:
+    """Encode snapshots into one binary stream with a shared string table.
+
+    The first ``encode()`` result starts with the stream header; each call
+    returns the bytes to append. Names repeated across snapshots (buffs,
+    abilities, monsters, item and element ids, warnings) are written once
+    per stream; log lines are written once and then only referenced by the
+    next snapshot, so the string table does not grow with the log.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._prev_lines: dict[str, int] = {}
+        self._started = False
+
+    def encode(self, snap: BattleSnapshot) -> bytes:
+        known = len(self._ids)
+        body = _Writer(self._ids, self._prev_lines)
+        try:
+            _write_snapshot(body, snap)
+        except Exception:
+            # Forget strings of the failed record; the decoder never sees them
+            for s in list(self._ids)[known:]:
+                del self._ids[s]
+            raise
+        lines = snap.log.lines
+        # First index of each line, matching what the decoder looks up
+        self._prev_lines = {line: i for i, line in reversed(list(enumerate(lines)))}
+        out = _Writer(self._ids)
+        if not self._started:
+            out.buf += MAGIC
+            out.buf.append(VERSION)
+            self._started = True
+        out.uvarint(len(body.buf))
+        out.buf += body.buf
+        return bytes(out.buf)
+
+
+class SnapshotDecoder:
+    """Decode a stream written by ``SnapshotEncoder``, record by record."""
+
+    def __init__(self) -> None:
+        self._strings: list[str] = []
+        self._prev_lines: tuple[str, ...] = ()
+        self._started = False
+
+    def decode(self, data: bytes) -> Iterator[BattleSnapshot]:
+        """Yield the snapshots in ``data``, the next chunk(s) of the stream."""
+        pos = 0
+        if not self._started:
+            if data[:4] != MAGIC:
+                raise CodecError("not an hv_bie snapshot stream")
+            if len(data) < 5 or data[4] != VERSION:
+                raise CodecError(f"unsupported snapshot stream version {data[4:5]!r}")
+            self._started = True
+            pos = 5
+        while pos < len(data):
+            r = _Reader(data, pos, len(data), self._strings, self._prev_lines)
+            length = r.uvarint()
+            end = r.pos + length
+            if end > len(data):
+                raise CodecError("truncated snapshot record")
+            r.end = end
+            snap = _read_snapshot(r)
+            if r.pos != end:
+                raise CodecError("snapshot record length mismatch")
+            pos = end
+            self._prev_lines = tuple(snap.log.lines)
+            yield snap
+
+
+def encode_many(snapshots: Iterable[BattleSnapshot]) -> bytes:
+    """Encode snapshots as one stream sharing a string table."""
+    enc = SnapshotEncoder()
+    return b"".join(enc.encode(s) for s in snapshots)
+
+
+def decode_many(data: bytes) -> list[BattleSnapshot]:
+    return list(SnapshotDecoder().decode(data))
+
+
+def encode(snap: BattleSnapshot) -> bytes:
+    """Encode a single snapshot as a self-contained stream."""
+    return SnapshotEncoder().encode(snap)
+
+
+def decode(data: bytes) -> BattleSnapshot:
+    snaps = decode_many(data)
+    if len(snaps) != 1:
+        raise CodecError(f"expected one snapshot, found {len(snaps)}")
+    return snaps[0]
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from .serialization import to_dict
+from .types.models import (
+    AbilitiesState,
+    Ability,
+    BattleSnapshot,
+    Buff,
+    CombatLog,
+    Item,
+    ItemsState,
+    LogEvents,
+    Monster,
+    PlayerState,
+    QuickSlot,
+)
+
+K = TypeVar("K")
+V = TypeVar("V")
+D = TypeVar("D")
+
+
+@dataclass(frozen=True, slots=True)
+class MapDelta(Generic[K, V, D]):
+    """Changes to a keyed collection (buffs, abilities, monsters, items).
+
+    ``changed`` holds a field delta for entries present on both sides,
+    ``added`` new entries and entries replaced outright (e.g. a different
+    monster in a slot), ``removed`` the keys that are gone. For buffs the
+    changed value is the new ``Buff`` (typically a ticked duration).
+    """
+
+    changed: dict[K, D] = field(default_factory=dict)
+    added: dict[K, V] = field(default_factory=dict)
+    removed: tuple[K, ...] = ()
+
+
+BuffsDelta = MapDelta[str, Buff, Buff]
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerDelta:
+    """Changed player fields; ``None`` means unchanged."""
+
+    hp_percent: Optional[float] = None
+    hp_value: Optional[int] = None
+    mp_percent: Optional[float] = None
+    mp_value: Optional[int] = None
+    sp_percent: Optional[float] = None
+    sp_value: Optional[int] = None
+    overcharge_value: Optional[int] = None
+    buffs: Optional[BuffsDelta] = None
+
+
+@dataclass(frozen=True, slots=True)
+class MonsterDelta:
+    """Changed fields of the same monster in a slot; ``None`` means unchanged."""
+
+    hp_percent: Optional[float] = None
+    mp_percent: Optional[float] = None
+    sp_percent: Optional[float] = None
+    alive: Optional[bool] = None
+    buffs: Optional[BuffsDelta] = None
+
+    @property
+    def died(self) -> bool:
+        return self.alive is False
+
+
+@dataclass(frozen=True, slots=True)
+class AbilityDelta:
+    available: Optional[bool] = None
+    cooldown_turns: Optional[int] = None
+    cost: Optional[int] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AbilitiesDelta:
+    skills: Optional[MapDelta[str, Ability, AbilityDelta]] = None
+    spells: Optional[MapDelta[str, Ability, AbilityDelta]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ItemDelta:
+    available: Optional[bool] = None
+    element_id: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class ItemsDelta:
+    items: Optional[MapDelta[str, Item, ItemDelta]] = None
+    # The whole new quickbar, when it changed
+    quickbar: Optional[list[QuickSlot]] = None
+
+
+@dataclass(frozen=True, slots=True)
+class LogDelta:
+    """New log lines, after dropping ``dropped`` lines from the front.
+
+    ``rounds`` is the new ``(current_round, total_round)`` and ``events``
+    the new ``LogEvents`` when ``events_changed``.
+    """
+
+    dropped: int = 0
+    appended: tuple[str, ...] = ()
+    rounds: Optional[tuple[Optional[int], Optional[int]]] = None
+    events_changed: bool = False
+    events: Optional[LogEvents] = None
+
+
+@dataclass(frozen=True, slots=True)
+class SnapshotDelta:
+    """Per-section changes between two snapshots; ``None`` means unchanged."""
+
+    player: Optional[PlayerDelta] = None
+    abilities: Optional[AbilitiesDelta] = None
+    monsters: Optional[MapDelta[int, Monster, MonsterDelta]] = None
+    log: Optional[LogDelta] = None
+    items: Optional[ItemsDelta] = None
+    warnings: Optional[list[str]] = None
+
+    @property
+    def empty(self) -> bool:
+        return (
+            self.player is None
+            and self.abilities is None
+            and self.monsters is None
+            and self.log is None
+            and self.items is None
+            and self.warnings is None
+        )
+
+    @property
+    def deaths(self) -> list[int]:
+        """Slots whose monster died between the two snapshots."""
+        if self.monsters is None:
+            return []
+        return [i for i, d in self.monsters.changed.items() if d.died]
+
+    def as_dict(self) -> dict:
+        return to_dict(self)
+
+
+_MISSING: Any = object()
+
+
+def _changed_fields(a: Any, b: Any, names: tuple[str, ...]) -> dict[str, Any]:
+    return {n: getattr(b, n) for n in names if getattr(a, n) != getattr(b, n)}
+
+
+def _diff_map(
+    a: dict[Any, Any],
+    b: dict[Any, Any],
+    diff_value: Callable[[Any, Any], Any],
+) -> Optional[MapDelta[Any, Any, Any]]:
+    if a is b:
+        return None
+    changed: dict[Any, Any] = {}
+    added: dict[Any, Any] = {}
+    for key, new in b.items():
+        old = a.get(key, _MISSING)
+        if old is _MISSING:
+            added[key] = new
+        elif old is not new and old != new:
+            delta = diff_value(old, new)
+            if delta is None:
+                added[key] = new
+            else:
+                changed[key] = delta
+    removed = tuple(key for key in a if key not in b)
+    if not (changed or added or removed):
+        return None
+    return MapDelta(changed, added, removed)
+
+
+def _apply_map(
+    a: dict[Any, Any],
+    delta: Optional[MapDelta[Any, Any, Any]],
+    apply_value: Callable[[Any, Any], Any],
+) -> dict[Any, Any]:
+    if delta is None:
+        return a
+    removed = set(delta.removed)
+    out = {k: v for k, v in a.items() if k not in removed}
+    for key, d in delta.changed.items():
+        out[key] = apply_value(out[key], d)
+    out.update(delta.added)
+    return out
+
+
+def _new_buff(old: Buff, new: Buff) -> Buff:
+    return new
+
+
+def _diff_buffs(a: dict[str, Buff], b: dict[str, Buff]) -> Optional[BuffsDelta]:
+    return _diff_map(a, b, _new_buff)
+
+
+def _apply_buffs(a: dict[str, Buff], delta: Optional[BuffsDelta]) -> dict[str, Buff]:
+    return _apply_map(a, delta, _new_buff)
+
+
+_PLAYER_FIELDS = (
+    "hp_percent",
+    "hp_value",
+    "mp_percent",
+    "mp_value",
+    "sp_percent",
+    "sp_value",
+    "overcharge_value",
+)
+
+
+def _diff_player(a: PlayerState, b: PlayerState) -> Optional[PlayerDelta]:
+    if a is b:
+        return None
+    changes = _changed_fields(a, b, _PLAYER_FIELDS)
+    buffs = _diff_buffs(a.buffs, b.buffs)
+    if not changes and buffs is None:
+        return None
+    return PlayerDelta(buffs=buffs, **changes)
+
+
+def _apply_player(a: PlayerState, d: Optional[PlayerDelta]) -> PlayerState:
+    if d is None:
+        return a
+    changes = {n: getattr(d, n) for n in _PLAYER_FIELDS if getattr(d, n) is not None}
+    return replace(a, buffs=_apply_buffs(a.buffs, d.buffs), **changes)
+
+
+def _diff_monster(a: Monster, b: Monster) -> Optional[MonsterDelta]:
+    if (
+        a.slot_index != b.slot_index
+        or a.name != b.name
+        or a.system_monster_type != b.system_monster_type
+    ):
+        return None
+    changes = _changed_fields(a, b, ("hp_percent", "mp_percent", "sp_percent", "alive"))
+    return MonsterDelta(buffs=_diff_buffs(a.buffs, b.buffs), **changes)
+
+
+def _apply_monster(a: Monster, d: MonsterDelta) -> Monster:
+    return Monster(
+        a.slot_index,
+        a.name,
+        a.alive if d.alive is None else d.alive,
+        a.system_monster_type,
+        a.hp_percent if d.hp_percent is None else d.hp_percent,
+        a.mp_percent if d.mp_percent is None else d.mp_percent,
+        a.sp_percent if d.sp_percent is None else d.sp_percent,
+        _apply_buffs(a.buffs, d.buffs),
+    )
+
+
+def _diff_ability(a: Ability, b: Ability) -> Optional[AbilityDelta]:
+    if a.name != b.name or a.element_id != b.element_id or a.cost_type != b.cost_type:
+        return None
+    return AbilityDelta(
+        **_changed_fields(a, b, ("available", "cooldown_turns", "cost"))
+    )
+
+
+def _apply_ability(a: Ability, d: AbilityDelta) -> Ability:
+    return Ability(
+        a.name,
+        a.element_id,
+        a.available if d.available is None else d.available,
+        a.cost if d.cost is None else d.cost,
+        a.cost_type,
+        a.cooldown_turns if d.cooldown_turns is None else d.cooldown_turns,
+    )
+
+
+def _diff_abilities(a: AbilitiesState, b: AbilitiesState) -> Optional[AbilitiesDelta]:
+    if a is b:
+        return None
+    skills = _diff_map(a.skills, b.skills, _diff_ability)
+    spells = _diff_map(a.spells, b.spells, _diff_ability)
+    if skills is None and spells is None:
+        return None
+    return AbilitiesDelta(skills, spells)
+
+
+def _apply_abilities(a: AbilitiesState, d: Optional[AbilitiesDelta]) -> AbilitiesState:
+    if d is None:
+        return a
+    return AbilitiesState(
+        _apply_map(a.skills, d.skills, _apply_ability),
+        _apply_map(a.spells, d.spells, _apply_ability),
+    )
+
+
+def _diff_item(a: Item, b: Item) -> Optional[ItemDelta]:
+    if a.slot != b.slot or a.name != b.name:
+        return None
+    return ItemDelta(**_changed_fields(a, b, ("available", "element_id")))
+
+
+def _apply_item(a: Item, d: ItemDelta) -> Item:
+    return Item(
+        a.slot,
+        a.name,
+        a.element_id if d.element_id is None else d.element_id,
+        a.available if d.available is None else d.available,
+    )
+
+
+def _diff_items(a: ItemsState, b: ItemsState) -> Optional[ItemsDelta]:
+    if a is b:
+        return None
+    items = _diff_map(a.items, b.items, _diff_item)
+    quickbar = list(b.quickbar) if a.quickbar != b.quickbar else None
+    if items is None and quickbar is None:
+        return None
+    return ItemsDelta(items, quickbar)
+
+
+def _apply_items(a: ItemsState, d: Optional[ItemsDelta]) -> ItemsState:
+    if d is None:
+        return a
+    return ItemsState(
+        _apply_map(a.items, d.items, _apply_item),
+        list(d.quickbar) if d.quickbar is not None else a.quickbar,
+    )
+
+
+def _overlap(a: list[str], b: list[str]) -> int:
+    """Lines to drop from the front of ``a`` so that it is a prefix of ``b``."""
+    n = len(a)
+    if b[:n] == a:
+        return 0
+    for drop in range(1, n):
+        if a[drop] == b[0] and b[: n - drop] == a[drop:]:
+            return drop
+    return n
+
+
+def _diff_log(a: CombatLog, b: CombatLog) -> Optional[LogDelta]:
+    if a is b:
+        return None
+    dropped = 0
+    appended: tuple[str, ...] = ()
+    if a.lines is not b.lines and a.lines != b.lines:
+        dropped = _overlap(a.lines, b.lines) if b.lines else len(a.lines)
+        appended = tuple(b.lines[len(a.lines) - dropped :])
+    rounds = (
+        (b.current_round, b.total_round)
+        if (a.current_round, a.total_round) != (b.current_round, b.total_round)
+        else None
+    )
+    events_changed = a.events is not b.events and a.events != b.events
+    if not (dropped or appended or rounds is not None or events_changed):
+        return None
+    return LogDelta(
+        dropped,
+        appended,
+        rounds,
+        events_changed,
+        b.events if events_changed else None,
+    )
+
+
+def _apply_log(a: CombatLog, d: Optional[LogDelta]) -> CombatLog:
+    if d is None:
+        return a
+    lines = a.lines
+    if d.dropped or d.appended:
+        lines = a.lines[d.dropped :] + list(d.appended)
+    current, total = (
+        d.rounds if d.rounds is not None else (a.current_round, a.total_round)
+    )
+    return CombatLog(lines, current, total, d.events if d.events_changed else a.events)
+
+
+def diff(prev: BattleSnapshot, curr: BattleSnapshot) -> SnapshotDelta:
+    """Compact typed changes that turn ``prev`` into ``curr``.
+
+    Sections and entries that are the same object (as shared by
+    ``parse_snapshot(previous=...)``) or compare equal are skipped without
+    walking them. ``apply_delta(prev, diff(prev, curr)) == curr``.
+    """
+    if prev is curr:
+        return SnapshotDelta()
+    return SnapshotDelta(
+        player=_diff_player(prev.player, curr.player),
+        abilities=_diff_abilities(prev.abilities, curr.abilities),
+        monsters=_diff_map(prev.monsters, curr.monsters, _diff_monster),
+        log=_diff_log(prev.log, curr.log),
+        items=_diff_items(prev.items, curr.items),
+        warnings=list(curr.warnings) if prev.warnings != curr.warnings else None,
+    )
+
+
+def apply_delta(snap: BattleSnapshot, delta: SnapshotDelta) -> BattleSnapshot:
+    """Build the snapshot ``delta`` describes, sharing every unchanged object."""
+    if delta.empty:
+        return snap
+    return BattleSnapshot(
+        player=_apply_player(snap.player, delta.player),
+        abilities=_apply_abilities(snap.abilities, delta.abilities),
+        monsters=_apply_map(snap.monsters, delta.monsters, _apply_monster),
+        log=_apply_log(snap.log, delta.log),
+        items=_apply_items(snap.items, delta.items),
+        warnings=(
+            list(delta.warnings) if delta.warnings is not None else snap.warnings
+        ),
+    )
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import csv
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Iterable, Optional, Union
+
+from .types.models import BattleSnapshot, Buff
+
+
+def _numpy() -> Any:
+    """NumPy, imported on first use, or ``None`` when it is not installed.
+
+    NumPy is optional (CSV and the binary format need only the stdlib) and
+    importing it is slow, so ``import hv_bie`` and batch workers skip it.
+    """
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - exercised only without numpy
+        return None
+    return numpy
+
+
+# Column kinds: "i" int64, "f" float64, "b" bool, "s" str
+_SCHEMAS: dict[str, tuple[tuple[str, str], ...]] = {
+    "player": (
+        ("index", "i"),
+        ("round", "i"),
+        ("hp_percent", "f"),
+        ("hp_value", "i"),
+        ("mp_percent", "f"),
+        ("mp_value", "i"),
+        ("sp_percent", "f"),
+        ("sp_value", "i"),
+        ("overcharge_value", "i"),
+    ),
+    "monsters": (
+        ("index", "i"),
+        ("round", "i"),
+        ("slot", "i"),
+        ("name", "s"),
+        ("alive", "b"),
+        ("hp_percent", "f"),
+        ("mp_percent", "f"),
+        ("sp_percent", "f"),
+    ),
+    "buffs": (
+        ("index", "i"),
+        ("round", "i"),
+        ("slot", "i"),
+        ("name", "s"),
+        ("remaining_turns", "f"),
+        ("is_permanent", "b"),
+    ),
+}
+
+TABLES: tuple[str, ...] = tuple(_SCHEMAS)
+EXPORT_FORMATS: tuple[str, ...] = ("npz", "csv", "binary")
+
+_NUMPY_DTYPES = {"i": "<i8", "f": "<f8", "b": "?"}
+_ARRAY_CODES = {"i": "q", "f": "d", "b": "b"}
+_MAGIC = b"HVC1"
+
+Table = dict[str, list[Any]]
+
+
+def _empty_table(name: str) -> Table:
+    return {column: [] for column, _ in _SCHEMAS[name]}
+
+
+@dataclass(frozen=True)
+class SnapshotColumns:
+    """Snapshot sequence flattened into column lists, one table per entity.
+
+    ``player`` has one row per snapshot, ``monsters`` one row per snapshot and
+    monster slot, ``buffs`` one row per snapshot and buff (long format, slot
+    0 is the player). ``index`` is the snapshot's position in the sequence
+    and ``round`` its ``log.current_round`` (-1 when unknown).
+    """
+
+    player: Table = field(default_factory=lambda: _empty_table("player"))
+    monsters: Table = field(default_factory=lambda: _empty_table("monsters"))
+    buffs: Table = field(default_factory=lambda: _empty_table("buffs"))
+
+    def tables(self) -> dict[str, Table]:
+        return {name: getattr(self, name) for name in TABLES}
+
+    def to_numpy(self) -> dict[str, Any]:
+        """Return one NumPy structured array per table (requires NumPy)."""
+        np = _numpy()
+        if np is None:
+            raise ImportError("to_numpy() requires numpy (pip install numpy)")
+        arrays: dict[str, Any] = {}
+        for name, table in self.tables().items():
+            dtype = []
+            for column, kind in _SCHEMAS[name]:
+                if kind == "s":
+                    width = max((len(v) for v in table[column]), default=0)
+                    dtype.append((column, f"<U{max(width, 1)}"))
+                else:
+                    dtype.append((column, _NUMPY_DTYPES[kind]))
+            arr = np.empty(len(table["index"]), dtype=dtype)
+            for column, _ in _SCHEMAS[name]:
+                arr[column] = table[column]
+            arrays[name] = arr
+        return arrays
+
+
+def _append_row(table: Table, row: tuple[Any, ...]) -> None:
+    # Tables keep their columns in schema order
+    for values, value in zip(table.values(), row):
+        values.append(value)
+
+
+def _add_buffs(
+    table: Table, index: int, rnd: int, slot: int, buffs: dict[str, Buff]
+) -> None:
+    for b in buffs.values():
+        _append_row(
+            table, (index, rnd, slot, b.name, b.remaining_turns, b.is_permanent)
+        )
+
+
+def to_columns(snapshots: Iterable[BattleSnapshot]) -> SnapshotColumns:
+    """Flatten a sequence of snapshots into ``SnapshotColumns``."""
+    cols = SnapshotColumns()
+    for index, snap in enumerate(snapshots):
+        rnd = snap.log.current_round
+        rnd = -1 if rnd is None else rnd
+        p = snap.player
+        _append_row(
+            cols.player,
+            (
+                index,
+                rnd,
+                p.hp_percent,
+                p.hp_value,
+                p.mp_percent,
+                p.mp_value,
+                p.sp_percent,
+                p.sp_value,
+                p.overcharge_value,
+            ),
+        )
+        _add_buffs(cols.buffs, index, rnd, 0, p.buffs)
+        for slot, m in snap.monsters.items():
+            _append_row(
+                cols.monsters,
+                (
+                    index,
+                    rnd,
+                    slot,
+                    m.name,
+                    m.alive,
+                    m.hp_percent,
+                    m.mp_percent,
+                    m.sp_percent,
+                ),
+            )
+            _add_buffs(cols.buffs, index, rnd, slot, m.buffs)
+    return cols
+
+
+def _write_binary(f: IO[bytes], name: str, table: Table) -> None:
+    schema = _SCHEMAS[name]
+    f.write(_MAGIC + struct.pack("<II", len(schema), len(table["index"])))
+    for column, kind in schema:
+        encoded = column.encode("utf-8")
+        f.write(struct.pack("<H", len(encoded)) + encoded + kind.encode("ascii"))
+        if kind == "s":
+            blobs = [v.encode("utf-8") for v in table[column]]
+            offsets = array("Q", [0])
+            for b in blobs:
+                offsets.append(offsets[-1] + len(b))
+            data = offsets
+            payload = b"".join(blobs)
+        else:
+            data = array(_ARRAY_CODES[kind], table[column])
+            payload = b""
+        if sys.byteorder == "big":
+            data.byteswap()
+        f.write(data.tobytes() + payload)
+
+
+def read_binary(path: Union[str, Path]) -> Table:
+    """Read a table written by ``write_columns(..., format="binary")``."""
+    raw = Path(path).read_bytes()
+    if raw[:4] != _MAGIC:
+        raise ValueError(f"{path} is not an hv_bie column file")
+    n_columns, n_rows = struct.unpack_from("<II", raw, 4)
+    pos = 12
+    table: Table = {}
+    for _ in range(n_columns):
+        (length,) = struct.unpack_from("<H", raw, pos)
+        pos += 2
+        column = raw[pos : pos + length].decode("utf-8")
+        kind = chr(raw[pos + length])
+        pos += length + 1
+        code = "Q" if kind == "s" else _ARRAY_CODES[kind]
+        count = n_rows + 1 if kind == "s" else n_rows
+        data = array(code)
+        end = pos + count * data.itemsize
+        data.frombytes(raw[pos:end])
+        if sys.byteorder == "big":
+            data.byteswap()
+        pos = end
+        if kind == "s":
+            table[column] = [
+                raw[pos + a : pos + b].decode("utf-8") for a, b in zip(data, data[1:])
+            ]
+            pos += data[-1]
+        elif kind == "b":
+            table[column] = [bool(v) for v in data]
+        else:
+            table[column] = data.tolist()
+    return table
+
+
+def write_columns(
+    columns: Union[SnapshotColumns, Iterable[BattleSnapshot]],
+    directory: Union[str, Path],
+    *,
+    format: Optional[str] = None,
+) -> list[Path]:
+    """Write the column tables into ``directory`` and return the written paths.
+
+    ``format`` is ``"npz"`` (one ``columns.npz`` of structured arrays, needs
+    NumPy), ``"csv"`` (``<table>.csv``) or ``"binary"`` (``<table>.hvc``,
+    readable with ``read_binary``). ``None`` picks ``"npz"`` when NumPy is
+    installed and ``"binary"`` otherwise.
+    """
+    if not isinstance(columns, SnapshotColumns):
+        columns = to_columns(columns)
+    np = _numpy() if format in (None, "npz") else None
+    if format is None:
+        format = "npz" if np is not None else "binary"
+    if format not in EXPORT_FORMATS:
+        raise ValueError(
+            f"unknown export format {format!r}; expected one of {list(EXPORT_FORMATS)}"
+        )
+    out = Path(directory)
+    out.mkdir(parents=True, exist_ok=True)
+    if format == "npz":
+        if np is None:
+            raise ImportError('format="npz" requires numpy (pip install numpy)')
+        path = out / "columns.npz"
+        np.savez(path, **columns.to_numpy())
+        return [path]
+
+    paths: list[Path] = []
+    for name, table in columns.tables().items():
+        if format == "csv":
+            path = out / f"{name}.csv"
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(table)
+                writer.writerows(zip(*table.values()))
+        else:
+            path = out / f"{name}.hvc"
+            with open(path, "wb") as fb:
+                _write_binary(fb, name, table)
+        paths.append(path)
+    return paths
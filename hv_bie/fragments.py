@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping, NamedTuple, Optional
+
+from bs4 import BeautifulSoup
+
+from .parsers.backends import resolve_backend
+from .parsers.core import (
+    LogCursor,
+    _parse_ability_table,
+    _parse_effect_buffs,
+    _parse_item_pane,
+    _parse_quickbar,
+    _parse_spirit_stance,
+    parse_log,
+    parse_monsters,
+    parse_player_vitals,
+)
+from .parsers.plan import DEFAULT_PLAN, ExtractionPlan, Pane
+from .snapshot import SECTIONS, _section_prints, _select_sections
+from .types.models import BattleSnapshot
+
+# Mutable view of the snapshot sections while fragments are merged in
+_State = dict[str, Any]
+_Apply = Callable[[_State, BeautifulSoup, list[str], ExtractionPlan], None]
+
+
+def _apply_vitals(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    player = state["player"]
+    vitals = parse_player_vitals(soup, warnings, plan)
+    state["player"] = replace(vitals, buffs=player.buffs)
+
+
+def _apply_spirit(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    player = state["player"]
+    buffs = _parse_spirit_stance(soup, plan)
+    buffs.update((k, b) for k, b in player.buffs.items() if k != "spirit stance")
+    state["player"] = replace(player, buffs=buffs)
+
+
+def _apply_effects(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    player = state["player"]
+    buffs = {k: b for k, b in player.buffs.items() if k == "spirit stance"}
+    buffs.update(_parse_effect_buffs(soup, plan))
+    state["player"] = replace(player, buffs=buffs)
+
+
+def _apply_skills(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    skills = _parse_ability_table(soup, plan.spec.skills, warnings, plan)
+    state["abilities"] = replace(state["abilities"], skills=skills)
+
+
+def _apply_magic(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    spells = _parse_ability_table(soup, plan.spec.magic, warnings, plan)
+    state["abilities"] = replace(state["abilities"], spells=spells)
+
+
+def _apply_monsters(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    state["monsters"] = parse_monsters(soup, warnings, plan)
+
+
+def _apply_log(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    state["log"] = parse_log(
+        soup,
+        warnings,
+        cursor=state["log_cursor"],
+        events=state["log_events"],
+        plan=plan,
+    )
+
+
+def _apply_items(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    items = _parse_item_pane(soup, warnings, plan)
+    state["items"] = replace(state["items"], items=items)
+
+
+def _apply_quickbar(
+    state: _State, soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan
+) -> None:
+    quickbar = _parse_quickbar(soup, warnings, plan)
+    state["items"] = replace(state["items"], quickbar=quickbar)
+
+
+# LayoutSpec pane -> (merge step, warnings besides the pane's own "not found"
+# that a fragment supersedes in the previous snapshot)
+_FRAGMENT_HANDLERS: dict[str, tuple[_Apply, tuple[str, ...]]] = {
+    "vitals": (
+        _apply_vitals,
+        ("hp bar width missing", "mp bar width missing", "sp bar width missing"),
+    ),
+    "spirit": (_apply_spirit, ()),
+    "effects": (_apply_effects, ()),
+    "skills": (_apply_skills, ()),
+    "magic": (_apply_magic, ()),
+    "monsters": (_apply_monsters, ()),
+    "log": (_apply_log, ()),
+    "items": (_apply_items, ()),
+    "quickbar": (_apply_quickbar, ()),
+}
+
+
+class _PaneHandler(NamedTuple):
+    section: str
+    tag: str
+    apply: _Apply
+    superseded: tuple[str, ...]
+
+
+@lru_cache(maxsize=8)
+def _pane_handlers(plan: ExtractionPlan) -> dict[str, _PaneHandler]:
+    """Pane id -> handler for the panes of ``plan``'s layout."""
+    spec = plan.spec
+    sections = {
+        pane.element_id: section
+        for section, panes in spec.section_panes().items()
+        for pane in panes
+    }
+    handlers = {}
+    for name, (apply, superseded) in _FRAGMENT_HANDLERS.items():
+        pane: Pane = getattr(spec, name)
+        handlers[pane.element_id] = _PaneHandler(
+            sections[pane.element_id],
+            pane.tag,
+            apply,
+            (pane.missing_warning,) + superseded,
+        )
+    return handlers
+
+
+def _outer_html(pane_id: str, tag: str, html: str) -> str:
+    # Accept either the pane element itself or just its inner HTML
+    if f'id="{pane_id}"' in html:
+        return html
+    return f'<{tag} id="{pane_id}">{html}</{tag}>'
+
+
+def parse_fragments(
+    fragments: Mapping[str, str],
+    previous: BattleSnapshot,
+    *,
+    backend: Optional[str] = None,
+    log_cursor: Optional[LogCursor] = None,
+    log_events: bool = False,
+    plan: ExtractionPlan = DEFAULT_PLAN,
+    sections: Optional[Iterable[str]] = None,
+) -> BattleSnapshot:
+    """Merge battle-action pane fragments into the previous snapshot.
+
+    ``fragments`` maps pane ids (``pane_vitals``, ``pane_effects``,
+    ``ckey_spirit``, ``table_skills``, ``table_magic``, ``pane_monster``,
+    ``textlog``, ``pane_item``, ``quickbar``) to their HTML, either the whole
+    pane element or only its contents. Only the matching parsers run; every
+    other section is carried over from ``previous`` unchanged. A fragment
+    replaces its pane, so ``textlog`` must hold the whole log table; with a
+    ``log_cursor`` only its new rows are read and appended to the cursor,
+    and ``log_events=True`` fills ``log.events`` for a merged ``textlog``.
+    """
+    resolved = resolve_backend(backend)
+    selected = _select_sections(sections)
+    state: _State = {section: getattr(previous, section) for section in SECTIONS}
+    state["log_cursor"] = log_cursor
+    state["log_events"] = log_events
+    stale: set[str] = set()
+    new_warnings: list[str] = []
+    touched: set[str] = set()
+    handlers = _pane_handlers(plan)
+    for pane_id, html in fragments.items():
+        handler = handlers.get(pane_id)
+        if handler is None:
+            new_warnings.append(f"unknown fragment {pane_id}")
+            continue
+        if handler.section not in selected:
+            continue
+        soup = BeautifulSoup(_outer_html(pane_id, handler.tag, html), resolved)
+        handler.apply(state, soup, new_warnings, plan)
+        stale.update(handler.superseded)
+        touched.add(handler.section)
+
+    snap = BattleSnapshot(
+        player=state["player"],
+        abilities=state["abilities"],
+        monsters=state["monsters"],
+        log=state["log"],
+        items=state["items"],
+        warnings=[w for w in previous.warnings if w not in stale] + new_warnings,
+    )
+    # Untouched sections stay reusable by a later parse_snapshot(previous=...)
+    prints = {
+        section: sp
+        for section, sp in _section_prints(previous).items()
+        if section not in touched
+    }
+    object.__setattr__(snap, "_section_prints", prints)
+    return snap
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, TypeVar, cast
+
+from .types.models import (
+    AbilitiesState,
+    BattleSnapshot,
+    CombatLog,
+    ItemsState,
+    PlayerState,
+)
+
+Observer = Callable[["Span"], Any]
+
+# Replaced, never mutated, so parses iterate a stable tuple without locking
+_observers: tuple[Observer, ...] = ()
+_lock = Lock()
+
+
+class Span:
+    """One parse stage, passed to every observer at its start and end.
+
+    ``name`` is ``"parse_snapshot"``, ``"parse_section"`` or the ``core``
+    parser (``"parse_monsters"`` ...); ``section`` the snapshot section it
+    reads, if any. ``input_size`` is the markup length in characters for
+    ``parse_snapshot`` and ``parse_section`` spans and the number of elements
+    in the input tree for ``core`` parser spans. ``element_count`` (entities
+    produced: monsters, abilities, buffs, items and quick slots, log lines),
+    ``warnings`` (added during the stage), ``elapsed`` and ``error`` are
+    filled in when ``phase`` becomes ``"end"``.
+    """
+
+    __slots__ = (
+        "name",
+        "section",
+        "input_size",
+        "phase",
+        "element_count",
+        "warnings",
+        "elapsed",
+        "error",
+        "_start",
+    )
+
+    def __init__(self, name: str, section: Optional[str], input_size: int):
+        self.name = name
+        self.section = section
+        self.input_size = input_size
+        self.phase = "start"
+        self.element_count = 0
+        self.warnings: tuple[str, ...] = ()
+        self.elapsed = 0.0
+        self.error: Optional[BaseException] = None
+        self._start = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"Span({self.name!r}, section={self.section!r}, phase={self.phase!r}, "
+            f"input_size={self.input_size}, element_count={self.element_count}, "
+            f"elapsed={self.elapsed:.6f})"
+        )
+
+
+def add_observer(observer: Observer) -> None:
+    """Register ``observer`` for every parse stage in this process.
+
+    The observer is called with the ``Span`` when a stage starts. If that
+    call returns a context manager, it is entered right away and exited
+    when the stage ends; otherwise the observer is called again with the
+    same, now ended, span.
+    """
+    global _observers
+    with _lock:
+        _observers = _observers + (observer,)
+
+
+def remove_observer(observer: Observer) -> None:
+    global _observers
+    with _lock:
+        remaining = list(_observers)
+        remaining.remove(observer)
+        _observers = tuple(remaining)
+
+
+@contextmanager
+def observing(*observers: Observer) -> Iterator[None]:
+    """Register ``observers`` for the duration of a ``with`` block."""
+    for observer in observers:
+        add_observer(observer)
+    try:
+        yield
+    finally:
+        for observer in observers:
+            remove_observer(observer)
+
+
+def element_count(value: Any) -> int:
+    if isinstance(value, BattleSnapshot):
+        sections = (value.player, value.abilities, value.monsters, value.log)
+        return sum(element_count(v) for v in sections) + element_count(value.items)
+    if isinstance(value, PlayerState):
+        return 1 + len(value.buffs)
+    if isinstance(value, AbilitiesState):
+        return len(value.skills) + len(value.spells)
+    if isinstance(value, CombatLog):
+        return len(value.lines)
+    if isinstance(value, ItemsState):
+        return len(value.items) + len(value.quickbar)
+    if isinstance(value, dict):
+        return len(value)
+    return 0
+
+
+class _Stage:
+    """Runs the observers around one stage; only built when some are registered."""
+
+    __slots__ = ("span", "warnings", "mark", "active")
+
+    def __init__(
+        self,
+        observers: tuple[Observer, ...],
+        name: str,
+        section: Optional[str],
+        input_size: int,
+        warnings: Optional[list[str]] = None,
+    ):
+        self.span = span = Span(name, section, input_size)
+        self.warnings = warnings
+        self.mark = len(warnings) if warnings is not None else 0
+        self.active: list[tuple[Observer, Any]] = []
+        for observer in observers:
+            result = observer(span)
+            if hasattr(result, "__enter__") and hasattr(result, "__exit__"):
+                result.__enter__()
+            else:
+                result = None
+            self.active.append((observer, result))
+        span._start = perf_counter()
+
+    def end(self, value: Any = None, error: Optional[BaseException] = None) -> None:
+        span = self.span
+        span.elapsed = perf_counter() - span._start
+        span.phase = "end"
+        span.error = error
+        span.element_count = element_count(value)
+        if self.warnings is not None:
+            span.warnings = tuple(self.warnings[self.mark :])
+        for observer, context in reversed(self.active):
+            if context is not None:
+                context.__exit__(
+                    type(error) if error is not None else None,
+                    error,
+                    error.__traceback__ if error is not None else None,
+                )
+            else:
+                observer(span)
+
+
+def _stage(
+    name: str,
+    section: Optional[str],
+    input_size: int,
+    warnings: Optional[list[str]] = None,
+) -> Optional[_Stage]:
+    observers = _observers
+    if not observers:
+        return None
+    return _Stage(observers, name, section, input_size, warnings)
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def observed(section: str) -> Callable[[F], F]:
+    """Wrap a ``core`` parser ``fn(soup, warnings, ...)`` in observer spans."""
+
+    def decorate(fn: F) -> F:
+        name = fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            observers = _observers
+            if not observers:
+                return fn(*args, **kwargs)
+            soup = args[0] if args else kwargs.get("soup")
+            warnings = args[1] if len(args) > 1 else kwargs.get("warnings")
+            find_all = getattr(soup, "find_all", None)
+            size = len(find_all(True)) if find_all is not None else 0
+            stage = _Stage(observers, name, section, size, warnings)
+            try:
+                value = fn(*args, **kwargs)
+            except BaseException as exc:
+                stage.end(error=exc)
+                raise
+            stage.end(value)
+            return value
+
+        return cast(F, wrapper)
+
+    return decorate
@@ -1,4 +1,5 @@
 from .core import (
+    LogCursor,
     parse_abilities,
     parse_items,
     parse_log,
@@ -6,8 +7,17 @@ from .core import (
     parse_player_buffs,
     parse_player_vitals,
 )
+from .events import EVENT_KINDS, extract_events
+from .plan import DEFAULT_PLAN, ExtractionPlan, LayoutSpec, compile_plan
 
 __all__ = [
+    "LogCursor",
+    "EVENT_KINDS",
+    "extract_events",
+    "LayoutSpec",
+    "ExtractionPlan",
+    "compile_plan",
+    "DEFAULT_PLAN",
     "parse_player_vitals",
     "parse_player_buffs",
     "parse_abilities",
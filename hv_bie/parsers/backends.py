@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import warnings
+from functools import lru_cache
+from typing import Optional
+
+from bs4.builder import builder_registry
+
+# BeautifulSoup tree builders the parsers are verified against
+BACKENDS: tuple[str, ...] = ("html.parser", "lxml", "html5lib")
+FALLBACK_BACKEND = "html.parser"
+
+
+def _env_backend() -> str:
+    """The ``HV_BIE_BACKEND`` default; an unknown name warns and is ignored."""
+    name = os.environ.get("HV_BIE_BACKEND") or FALLBACK_BACKEND
+    try:
+        _check_known(name)
+    except ValueError as exc:
+        warnings.warn(
+            f"HV_BIE_BACKEND: {exc}; using {FALLBACK_BACKEND!r}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return FALLBACK_BACKEND
+    return name
+
+
+@lru_cache(maxsize=None)
+def _installed(name: str) -> bool:
+    return builder_registry.lookup(name) is not None
+
+
+def available_backends() -> list[str]:
+    """Return the known backends whose tree builder is importable."""
+    return [name for name in BACKENDS if _installed(name)]
+
+
+def get_default_backend() -> str:
+    return _default_backend
+
+
+def set_default_backend(name: str) -> None:
+    """Set the process-wide backend used when ``parse_snapshot`` gets none."""
+    global _default_backend
+    _check_known(name)
+    _default_backend = name
+
+
+def _check_known(name: str) -> None:
+    if name not in BACKENDS:
+        raise ValueError(
+            f"unknown parser backend {name!r}; expected one of {', '.join(BACKENDS)}"
+        )
+
+
+_default_backend: str = _env_backend()
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Map a requested backend to one that can run here.
+
+    ``None`` selects the process-wide default; a known backend that is not
+    installed falls back to the stdlib ``html.parser``.
+    """
+    name = name or _default_backend
+    _check_known(name)
+    return name if _installed(name) else FALLBACK_BACKEND
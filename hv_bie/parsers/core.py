@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Optional
+from collections import deque
+from dataclasses import replace
+from sys import intern
+from typing import Any, Callable, Optional, Sequence
 
 from bs4 import BeautifulSoup
 
+from ..observe import observed
 from ..types.models import (
     AbilitiesState,
     Ability,
@@ -12,16 +16,14 @@ from ..types.models import (
     CombatLog,
     Item,
     ItemsState,
+    LogEvents,
     Monster,
     PlayerState,
     QuickSlot,
 )
 from ..types.system_monsters import get_system_monster_type
-
-# Constants inferred from fixtures
-_PLAYER_BAR_FULL_PX = 414
-_MONSTER_BAR_MAX_PX = 120
-_OC_POINTS_PER_CHARGE = 25
+from .events import classify_line, extract_events
+from .plan import DEFAULT_PLAN, CompiledBar, ExtractionPlan, Pane
 
 # CSS sprite character map (anti-scraping UI variant)
 _SPRITE_MAP: dict[str, str] = {}
@@ -62,143 +64,183 @@ def _safe_int(text: Optional[str]) -> int:
         return 0
 
 
-def parse_player_vitals(soup: BeautifulSoup, warnings: list[str]) -> PlayerState:
-    pane_el = soup.find("div", id="pane_vitals")
-    hp_pct = mp_pct = sp_pct = 0.0
-    hp_val = mp_val = sp_val = 0
-    oc_val = 0
+def _value_text(pane: Any, ids: tuple[str, ...]) -> Optional[str]:
+    # Text of the first value div present, None when there is none
+    for element_id in ids:
+        div = pane.find("div", id=element_id)
+        if div:
+            return div.text
+    return None
+
+
+def _bar_percent(width: Optional[int], full_px: int) -> float:
+    return max(0.0, min(100.0, width / full_px * 100.0)) if width is not None else 0.0
+
+
+def _player_vitals(
+    widths: tuple[Optional[int], Optional[int], Optional[int], Optional[int]],
+    texts: tuple[Optional[str], Optional[str], Optional[str], Optional[str]],
+    warnings: list[str],
+    plan: ExtractionPlan,
+) -> PlayerState:
+    """Build the vitals from bar widths and value texts (hp, mp, sp, oc)."""
+    hp_w, mp_w, sp_w, oc_w = widths
+    for name, width in (("hp", hp_w), ("mp", mp_w), ("sp", sp_w)):
+        if width is None:
+            warnings.append(f"{name} bar width missing")
+    hp_text, mp_text, sp_text, oc_text = texts
+    if oc_text is not None:
+        oc_val = _safe_int(oc_text)
+    elif oc_w is not None:
+        oc_val = int(round(oc_w / plan.oc_bar.full_px * plan.spec.oc_bar_scale))
+    else:
+        oc_val = 0
+    return PlayerState(
+        hp_percent=_bar_percent(hp_w, plan.hp_bar.full_px),
+        hp_value=_safe_int(hp_text),
+        mp_percent=_bar_percent(mp_w, plan.mp_bar.full_px),
+        mp_value=_safe_int(mp_text),
+        sp_percent=_bar_percent(sp_w, plan.sp_bar.full_px),
+        sp_value=_safe_int(sp_text),
+        overcharge_value=oc_val,
+    )
+
+
+@observed("player")
+def parse_player_vitals(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> PlayerState:
+    spec = plan.spec
+    pane_el = soup.find(spec.vitals.tag, id=spec.vitals.element_id)
     if not (pane_el and hasattr(pane_el, "find")):
-        warnings.append("pane_vitals not found")
+        warnings.append(spec.vitals.missing_warning)
         return PlayerState()
     pane: Any = pane_el
 
-    def width_px(selector: str) -> Optional[int]:
-        img = pane.find("img", src=re.compile(selector))
+    def width_px(bar: CompiledBar) -> Optional[int]:
+        img = pane.find("img", src=bar.src)
         if not img:
             return None
-        m = re.search(r"width:(\d+)px", img.get("style", ""))
+        m = plan.bar_width.search(img.get("style", ""))
         return int(m.group(1)) if m else None
 
-    hp_w = width_px(r"bar_[bd]green\.png")
-    mp_w = width_px(r"bar_blue\.png")
-    sp_w = width_px(r"bar_red\.png")
-    oc_w = width_px(r"bar_orange\.png")
+    widths = (
+        width_px(plan.hp_bar),
+        width_px(plan.mp_bar),
+        width_px(plan.sp_bar),
+        width_px(plan.oc_bar),
+    )
+    texts = (
+        _value_text(pane, spec.hp_value_ids),
+        _value_text(pane, spec.mp_value_ids),
+        _value_text(pane, spec.sp_value_ids),
+        _value_text(pane, spec.oc_value_ids),
+    )
+    return _player_vitals(widths, texts, warnings, plan)
 
-    if hp_w is not None:
-        hp_pct = min(100.0, max(0.0, hp_w / _PLAYER_BAR_FULL_PX * 100))
-    else:
-        warnings.append("hp bar width missing")
-    if mp_w is not None:
-        mp_pct = min(100.0, max(0.0, mp_w / _PLAYER_BAR_FULL_PX * 100))
-    else:
-        warnings.append("mp bar width missing")
-    if sp_w is not None:
-        sp_pct = min(100.0, max(0.0, sp_w / _PLAYER_BAR_FULL_PX * 100))
-    else:
-        warnings.append("sp bar width missing")
-    if oc_w is not None:
-        # Fixtures show orange width mapped to 0..250 scale
-        oc_val = int(round(oc_w / _PLAYER_BAR_FULL_PX * 250))
-
-    dvrhd = pane.find("div", id="dvrhd") or pane.find("div", id="dvrhb")
-    dvrm = pane.find("div", id="dvrm")
-    dvrs = pane.find("div", id="dvrs")
-    dvrc = pane.find("div", id="dvrc")
-    hp_val = _safe_int(dvrhd.text if dvrhd and hasattr(dvrhd, "text") else None)
-    mp_val = _safe_int(dvrm.text if dvrm and hasattr(dvrm, "text") else None)
-    sp_val = _safe_int(dvrs.text if dvrs and hasattr(dvrs, "text") else None)
-    if dvrc and hasattr(dvrc, "text"):
-        oc_val = _safe_int(dvrc.text)
-    elif oc_w is not None:
-        oc_val = int(round(oc_w / _PLAYER_BAR_FULL_PX * 250))
 
-    return PlayerState(
-        hp_percent=hp_pct,
-        hp_value=hp_val,
-        mp_percent=mp_pct,
-        mp_value=mp_val,
-        sp_percent=sp_pct,
-        sp_value=sp_val,
-        overcharge_value=oc_val,
-    )
+def _parse_duration(dur_raw: str, plan: ExtractionPlan) -> tuple[float, bool]:
+    # (remaining turns, is permanent); unreadable durations count as 0
+    if dur_raw in plan.spec.permanent_durations:
+        return float("inf"), True
+    try:
+        return float(dur_raw), False
+    except ValueError:
+        return 0.0, False
+
+
+def _effect_buff(om: str, plan: ExtractionPlan, player: bool) -> Optional[Buff]:
+    """Buff from a ``set_infopane_effect`` handler, None if it has none.
+
+    Player effect names go through ``icon_names``; monster names are only
+    lowercased.
+    """
+    m = plan.effect_handler.search(om)
+    if not m:
+        return None
+    name = m.group(1)
+    rem, is_perm = _parse_duration(m.group(2).strip().strip("'\""), plan)
+    # normalize some names and lowercase
+    if player:
+        norm = intern(plan.spec.icon_names.get(name, name.lower()))
+    else:
+        norm = intern(name.lower())
+    # About-to-expire opacity indicates ticking, but we keep numeric seconds as-is
+    return Buff(name=norm, remaining_turns=rem, is_permanent=is_perm)
 
 
-_ICON_MAP = {
-    # direct names from onmouseover examples
-    "Regeneration": "regeneration",
-    "Regen": "regen",
-    "Absorbing Ward": "absorbing ward",
-    "Hastened": "haste",
-    "Shadow Veil": "shadow veil",
-    "Spark of Life": "spark of life",
-    "Spirit Shield": "spirit shield",
-    "Overwhelming Strikes": "overwhelming strikes",
-    "Health Draught": "regeneration",
-    "Heartseeker": "heartseeker",
-}
+def _spirit_buffs(src: Optional[str], plan: ExtractionPlan) -> dict[str, Buff]:
+    # src of the spirit key, None when the key is missing
+    if src is not None and plan.spec.spirit_stance_src in src:
+        return {
+            "spirit stance": Buff(
+                name="spirit stance", remaining_turns=float("inf"), is_permanent=True
+            )
+        }
+    return {}
 
 
-def parse_player_buffs(soup: BeautifulSoup, warnings: list[str]) -> dict[str, Buff]:
-    out: dict[str, Buff] = {}
+def _parse_spirit_stance(
+    soup: BeautifulSoup, plan: ExtractionPlan = DEFAULT_PLAN
+) -> dict[str, Buff]:
     # Spirit stance is indicated by spirit_a.png on ckey_spirit
-    spirit = soup.find("img", id="ckey_spirit")
-    if (
-        spirit
-        and hasattr(spirit, "get")
-        and "spirit_a.png" in (spirit.get("src") or "")
-    ):
-        out["spirit stance"] = Buff(
-            name="spirit stance", remaining_turns=float("inf"), is_permanent=True
-        )
+    spec = plan.spec
+    spirit = soup.find(spec.spirit.tag, id=spec.spirit.element_id)
+    if spirit and hasattr(spirit, "get"):
+        return _spirit_buffs(str(spirit.get("src") or ""), plan)
+    return {}
+
 
-    pane = soup.find("div", id="pane_effects")
+def _parse_effect_buffs(
+    soup: BeautifulSoup, plan: ExtractionPlan = DEFAULT_PLAN
+) -> dict[str, Buff]:
+    out: dict[str, Buff] = {}
+    spec = plan.spec
+    pane = soup.find(spec.effects.tag, id=spec.effects.element_id)
     if not (pane and hasattr(pane, "find_all")):
         return out
 
     for img in pane.find_all("img"):
-        om = img.get("onmouseover", "")
-        m = re.search(
-            r"set_infopane_effect\('([^']+)'\s*,\s*'[^']*'\s*,\s*([^\)]+)\)", str(om)
-        )
-        if not m:
-            continue
-        name = m.group(1)
-        dur_raw = m.group(2).strip().strip("'\"")
-        is_perm = False
-        if dur_raw in ("autocast", "permanent"):
-            is_perm = True
-            rem = float("inf")
-        else:
-            try:
-                rem = float(dur_raw)
-            except ValueError:
-                rem = 0.0
-        # normalize some names and lowercase
-        norm = _ICON_MAP.get(name, name.lower())
-        # About-to-expire opacity indicates ticking, but we keep numeric seconds as-is
-        out[norm] = Buff(
-            name=norm,
-            remaining_turns=rem,
-            is_permanent=is_perm,
-        )
+        buff = _effect_buff(str(img.get("onmouseover", "")), plan, player=True)
+        if buff is not None:
+            out[buff.name] = buff
 
     return out
 
 
-def _parse_ability_div(div) -> Ability:
-    om = div.get("onmouseover", "")
+@observed("player")
+def parse_player_buffs(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> dict[str, Buff]:
+    out = _parse_spirit_stance(soup, plan)
+    out.update(_parse_effect_buffs(soup, plan))
+    return out
+
+
+def _ability_div_name(div) -> str:
+    # Fallback: text or sprite div
+    name_div = div.find("div", class_="fc2 fal fcb")
+    if not name_div:
+        name_div = div.find("div", class_="fl")
+    return _extract_name(name_div) if name_div else ""
+
+
+def _ability(
+    om: str,
+    style: str,
+    element_id: str,
+    fallback_name: Callable[[], str],
+    plan: ExtractionPlan,
+) -> Ability:
+    """Build an ability from its div's handler, style and id.
+
+    ``fallback_name`` is called for the name only when the handler has none.
+    """
     # Extract name from onmouseover (works for both text and sprite UI)
-    name_match = re.search(r"set_infopane_spell\('([^']+)'", str(om))
-    if name_match:
-        name = name_match.group(1)
-    else:
-        # Fallback: text or sprite div
-        name_div = div.find("div", class_="fc2 fal fcb")
-        if not name_div:
-            name_div = div.find("div", class_="fl")
-        name = _extract_name(name_div) if name_div else ""
-    available = "opacity:0.5" not in (div.get("style") or "")
-    nums = [int(n) for n in re.findall(r"\b(\d+)\b", om)]
+    name_match = plan.spell_handler.search(om)
+    name = name_match.group(1) if name_match else fallback_name()
+    available = plan.spec.ability_unavailable_style not in style
+    nums = [int(n) for n in plan.ability_numbers.findall(om)]
     cost = 0
     cd = 0
     cost_type: Optional[str] = None
@@ -211,12 +253,12 @@ def _parse_ability_div(div) -> Ability:
             cost = first
             cost_type = "mp"
         elif second > 0:
-            cost = _OC_POINTS_PER_CHARGE * second
+            cost = plan.spec.oc_points_per_charge * second
             cost_type = "overcharge"
         cd = third
     return Ability(
-        name=name.lower(),
-        element_id=div.get("id", ""),
+        name=intern(name.lower()),
+        element_id=intern(element_id),
         available=available,
         cost=cost,
         cost_type=cost_type,
@@ -224,47 +266,91 @@ def _parse_ability_div(div) -> Ability:
     )
 
 
-def parse_abilities(soup: BeautifulSoup, warnings: list[str]) -> AbilitiesState:
-    skills: dict[str, Ability] = {}
-    spells: dict[str, Ability] = {}
+def _parse_ability_div(div, plan: ExtractionPlan = DEFAULT_PLAN) -> Ability:
+    return _ability(
+        str(div.get("onmouseover", "")),
+        div.get("style") or "",
+        str(div.get("id", "")),
+        lambda: _ability_div_name(div),
+        plan,
+    )
 
-    t_skills = soup.find("table", id="table_skills")
-    if t_skills and hasattr(t_skills, "find_all"):
-        for d in t_skills.find_all("div", class_="btsd"):
-            ab = _parse_ability_div(d)
-            if ab.name:
-                skills[ab.name] = ab
-    else:
-        warnings.append("table_skills not found")
 
-    t_magic = soup.find("table", id="table_magic")
-    if t_magic and hasattr(t_magic, "find_all"):
-        for d in t_magic.find_all("div", class_="btsd"):
-            ab = _parse_ability_div(d)
+def _parse_ability_table(
+    soup: BeautifulSoup,
+    pane: Pane,
+    warnings: list[str],
+    plan: ExtractionPlan = DEFAULT_PLAN,
+) -> dict[str, Ability]:
+    out: dict[str, Ability] = {}
+    table = soup.find(pane.tag, id=pane.element_id)
+    if table and hasattr(table, "find_all"):
+        for d in table.find_all("div", class_=plan.spec.ability_class):
+            ab = _parse_ability_div(d, plan)
             if ab.name:
-                spells[ab.name] = ab
+                out[ab.name] = ab
     else:
-        warnings.append("table_magic not found")
+        warnings.append(pane.missing_warning)
+    return out
+
 
+@observed("abilities")
+def parse_abilities(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> AbilitiesState:
+    skills = _parse_ability_table(soup, plan.spec.skills, warnings, plan)
+    spells = _parse_ability_table(soup, plan.spec.magic, warnings, plan)
     return AbilitiesState(skills=skills, spells=spells)
 
 
-def parse_monsters(soup: BeautifulSoup, warnings: list[str]) -> dict[int, Monster]:
-    pane = soup.find("div", id="pane_monster")
+def _monster(
+    idx: int,
+    name: str,
+    style: str,
+    widths: tuple[Optional[int], ...],
+    buffs: dict[str, Buff],
+    plan: ExtractionPlan,
+) -> Monster:
+    """Build a monster from its slot div's style, bar widths (hp, mp, sp) and buffs."""
+    # System monster typing: prefer name-based mapping; fallback to style heuristic
+    system_type = get_system_monster_type(name)
+    if system_type is None and ("border-color:" in style or "background:" in style):
+        system_type = "Rare"
+    dead = plan.spec.monster_dead_style in style
+    hp, mp, sp = (
+        _bar_percent(width, bar.full_px)
+        for width, bar in zip(widths, plan.monster_bars)
+    )
+    return Monster(
+        slot_index=idx,
+        name=intern(name),
+        alive=not dead,
+        system_monster_type=system_type,
+        hp_percent=0.0 if dead else hp,
+        mp_percent=0.0 if dead else mp,
+        sp_percent=0.0 if dead else sp,
+        buffs=buffs,
+    )
+
+
+@observed("monsters")
+def parse_monsters(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> dict[int, Monster]:
+    spec = plan.spec
+    pane = soup.find(spec.monsters.tag, id=spec.monsters.element_id)
     if not (pane and hasattr(pane, "find_all")):
-        warnings.append("pane_monster not found")
+        warnings.append(spec.monsters.missing_warning)
         return {}
 
     monsters: dict[int, Monster] = {}
 
-    for mdiv in pane.find_all("div", id=re.compile(r"mkey_\d+")):
-        m_id_m = re.search(r"mkey_(\d+)", str(mdiv.get("id", "")))
+    for mdiv in pane.find_all("div", id=plan.monster_slot_id):
+        m_id_m = plan.monster_slot_id.search(str(mdiv.get("id", "")))
         idx = int(m_id_m.group(1)) if m_id_m else -1
-        # System monster typing: prefer name-based mapping; fallback to style heuristic
-        system_type: Optional[str] = None
-        style = mdiv.get("style") or ""
+        style = str(mdiv.get("style") or "")
         # name
-        name_div = mdiv.find("div", class_="btm3")
+        name_div = mdiv.find("div", class_=spec.monster_name_class)
         name = ""
         if name_div:
             # Text version: div.fc2.fal.fcb
@@ -278,98 +364,191 @@ def parse_monsters(soup: BeautifulSoup, warnings: list[str]) -> dict[int, Monste
                 sprite_div = name_div.find("div", class_="fl")
                 if sprite_div:
                     name = _decode_sprite_text(sprite_div).strip().title()
-        # mapping by name (if available)
-        system_type = get_system_monster_type(name)
-        # fallback heuristic by styled border/background
-        if system_type is None and ("border-color:" in style or "background:" in style):
-            system_type = "Rare"
-
-        # vitals: widths up to 120px
-        def bar_pct(src_pat: str, alt: str | None = None) -> float:
-            bars = mdiv.find_all("img", src=re.compile(src_pat))
-            for bar in bars:
-                if alt is None or bar.get("alt") == alt:
-                    m = re.search(r"width:(\d+)px", str(bar.get("style", "")))
-                    if m:
-                        return max(
-                            0.0,
-                            min(100.0, int(m.group(1)) / _MONSTER_BAR_MAX_PX * 100.0),
-                        )
-            return 0.0
 
-        dead = "opacity:0.3" in style
-        hp = -1.0 if dead else bar_pct(r"nbargreen\.png", "health")
-        mp = -1.0 if dead else bar_pct(r"nbarblue\.png", "magic")
-        sp = -1.0 if dead else bar_pct(r"nbarred\.png", "spirit")
+        # vitals: first bar image with a readable width
+        def bar_width(bar: CompiledBar) -> Optional[int]:
+            for img in mdiv.find_all("img", src=bar.src):
+                if bar.alt is None or img.get("alt") == bar.alt:
+                    m = plan.bar_width.search(str(img.get("style", "")))
+                    if m:
+                        return int(m.group(1))
+            return None
 
         # monster buffs
         m_buffs: dict[str, Buff] = {}
-        bc = mdiv.find("div", class_="btm6")
+        bc = mdiv.find("div", class_=spec.monster_buff_class)
         if bc:
             for img in bc.find_all("img"):
-                om = img.get("onmouseover", "")
-                mm = re.search(
-                    r"set_infopane_effect\('([^']+)'\s*,\s*'[^']*'\s*,\s*([^\)]+)\)",
-                    str(om),
-                )
-                if mm:
-                    bname = mm.group(1).lower()
-                    dur_raw = mm.group(2).strip().strip("'\"")
-                    is_perm = False
-                    rem: Optional[float] = (
-                        None  # parsed numeric seconds; inf for permanent
-                    )
-                    if dur_raw in ("autocast", "permanent"):
-                        is_perm = True
-                        rem = float("inf")
-                    else:
-                        try:
-                            rem = float(dur_raw)
-                        except ValueError:
-                            rem = float("inf") if is_perm else 0.0
-                    m_buffs[bname] = Buff(
-                        name=bname,
-                        remaining_turns=rem if rem is not None else 0.0,
-                        is_permanent=is_perm,
-                    )
+                buff = _effect_buff(str(img.get("onmouseover", "")), plan, player=False)
+                if buff is not None:
+                    m_buffs[buff.name] = buff
 
-        monsters[idx] = Monster(
-            slot_index=idx,
-            name=name,
-            alive=(hp != -1.0),
-            system_monster_type=system_type,
-            hp_percent=hp if hp >= 0 else 0.0,
-            mp_percent=mp if mp >= 0 else 0.0,
-            sp_percent=sp if sp >= 0 else 0.0,
-            buffs=m_buffs,
-        )
+        widths = tuple(bar_width(bar) for bar in plan.monster_bars)
+        monsters[idx] = _monster(idx, name, style, widths, m_buffs, plan)
 
     return monsters
 
 
-def parse_log(soup: BeautifulSoup, warnings: list[str]) -> CombatLog:
-    tbl = soup.find("table", id="textlog")
-    lines: list[str] = []
-    current: Optional[int] = None
-    total: Optional[int] = None
-    if tbl and hasattr(tbl, "find_all"):
-        for td in tbl.find_all("td"):
-            t = td.get_text(strip=True)
-            if t:
-                lines.append(t)
-                m = re.search(r"Round\s+(\d+)\s*/\s*(\d+)", t)
+class LogCursor:
+    """Position in a battle's combat log, shared across consecutive snapshots.
+
+    ``parse_log(..., cursor=...)`` only reads the ``textlog`` rows added since
+    the cursor last saw the table and appends them to ``lines``, a ring
+    buffer bounded by ``max_lines`` (``None`` keeps every line). A table that
+    does not continue the previous one (a new round) starts a new segment.
+    """
+
+    def __init__(self, max_lines: Optional[int] = 1000):
+        self.lines: deque[str] = deque(maxlen=max_lines)
+        self.current_round: Optional[int] = None
+        self.total_round: Optional[int] = None
+        # Rows consumed from the current table and the text of its oldest row
+        self.rows = 0
+        self.anchor: Optional[str] = None
+        # Lines appended since the last reset and how many were classified;
+        # events are (line number in that count, *classify_line result)
+        self.appended = 0
+        self._classified = 0
+        self._events: deque[tuple[int, str, str, str, int, str]] = deque()
+
+    def reset(self) -> None:
+        self.lines.clear()
+        self.appended = self._classified = 0
+        self._events.clear()
+        self._start_table()
+
+    def _start_table(self) -> None:
+        self.current_round = self.total_round = None
+        self.rows = 0
+        self.anchor = None
+
+    def snapshot(self) -> CombatLog:
+        return CombatLog(
+            lines=list(self.lines),
+            current_round=self.current_round,
+            total_round=self.total_round,
+        )
+
+    def events(self) -> LogEvents:
+        """Typed events of ``lines``, as ``extract_events(lines)`` gives them.
+
+        Only lines appended since the previous call are classified; events
+        of lines that left the ring buffer are dropped.
+        """
+        lines = self.lines
+        first = self.appended - len(lines)
+        found = self._events
+        for n in range(max(self._classified, first), self.appended):
+            ev = classify_line(lines[n - first])
+            if ev is not None:
+                found.append((n, *ev))
+        self._classified = self.appended
+        while found and found[0][0] < first:
+            found.popleft()
+        return LogEvents(
+            [ev[1] for ev in found],
+            [ev[2] for ev in found],
+            [ev[3] for ev in found],
+            [ev[4] for ev in found],
+            [ev[5] for ev in found],
+            [ev[0] - first for ev in found],
+        )
+
+
+def _append_log_rows(
+    cursor: LogCursor,
+    rows: Sequence[Any],
+    text_of: Callable[[Any], str],
+    round_re: re.Pattern[str],
+) -> None:
+    # rows are in table order (newest first); append oldest first
+    find_round = cursor.current_round is None
+    for row in reversed(rows):
+        t = text_of(row)
+        if t:
+            cursor.lines.append(t)
+            cursor.appended += 1
+            if find_round:
+                m = round_re.search(t)
                 if m:
-                    current = int(m.group(1))
-                    total = int(m.group(2))
-    else:
-        warnings.append("textlog not found")
-    return CombatLog(lines=lines[::-1], current_round=current, total_round=total)
+                    cursor.current_round = int(m.group(1))
+                    cursor.total_round = int(m.group(2))
+                    find_round = False
+
+
+@observed("log")
+def parse_log(
+    soup: BeautifulSoup,
+    warnings: list[str],
+    cursor: Optional[LogCursor] = None,
+    events: bool = False,
+    plan: ExtractionPlan = DEFAULT_PLAN,
+) -> CombatLog:
+    log = _parse_log_lines(soup, warnings, cursor, plan)
+    if events:
+        return _with_events(log, cursor)
+    return log
+
+
+def _with_events(log: CombatLog, cursor: Optional[LogCursor]) -> CombatLog:
+    # A cursor classifies only its new lines; its log is its lines
+    events = cursor.events() if cursor is not None else extract_events(log.lines)
+    return replace(log, events=events)
+
+
+def _parse_log_lines(
+    soup: BeautifulSoup,
+    warnings: list[str],
+    cursor: Optional[LogCursor],
+    plan: ExtractionPlan,
+) -> CombatLog:
+    pane = plan.spec.log
+    tbl = soup.find(pane.tag, id=pane.element_id)
+    if not (tbl and hasattr(tbl, "find_all")):
+        return _log_from_rows(None, _td_text, warnings, cursor, plan)
+    return _log_from_rows(tbl.find_all("td"), _td_text, warnings, cursor, plan)
+
+
+def _td_text(td: Any) -> str:
+    return td.get_text(strip=True)
+
+
+def _log_from_rows(
+    rows: Optional[Sequence[Any]],
+    text_of: Callable[[Any], str],
+    warnings: list[str],
+    cursor: Optional[LogCursor],
+    plan: ExtractionPlan,
+) -> CombatLog:
+    """Build the log from the table's cells, None when the table is missing.
+
+    ``text_of`` gives a cell's stripped text; with a cursor it is only
+    called for the oldest cell and the cells that are new.
+    """
+    if rows is None:
+        warnings.append(plan.spec.log.missing_warning)
+        return cursor.snapshot() if cursor is not None else CombatLog()
+    if cursor is None:
+        # The oldest round marker wins, as the log is read oldest first
+        cursor = LogCursor(max_lines=None)
+        _append_log_rows(cursor, rows, text_of, plan.round_marker)
+        return cursor.snapshot()
+
+    oldest = text_of(rows[-1]) if rows else None
+    if cursor.anchor is None or cursor.anchor != oldest or len(rows) < cursor.rows:
+        cursor._start_table()
+        cursor.anchor = oldest
+    _append_log_rows(
+        cursor, rows[: len(rows) - cursor.rows], text_of, plan.round_marker
+    )
+    cursor.rows = len(rows)
+    return cursor.snapshot()
 
 
-def _extract_name_from_item_div(container) -> str:
+def _extract_name_from_item_div(container, plan: ExtractionPlan = DEFAULT_PLAN) -> str:
     """Extract item name from text-version (fc2 fal fcb/fcg) or sprite-version (fl f2b/f2g)."""
     # Text version
-    for cls in ("fc2 fal fcb", "fc2 fal fcg"):
+    for cls in plan.spec.item_name_classes:
         name_div = container.find("div", class_=cls)
         if name_div:
             inner = name_div.find("div")
@@ -386,16 +565,32 @@ def _extract_name_from_item_div(container) -> str:
     return ""
 
 
-def parse_items(soup: BeautifulSoup, warnings: list[str]) -> ItemsState:
+def _item(
+    slot_text: str, name: str, element_id: str, available: bool
+) -> Optional[Item]:
+    # None for an empty slot
+    if not name:
+        return None
+    return Item(
+        slot=(slot_text if not slot_text.isdigit() else int(slot_text)),
+        name=intern(name),
+        element_id=intern(element_id) if available else "",
+        available=available,
+    )
+
+
+def _parse_item_pane(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> dict[str, Item]:
     items: dict[str, Item] = {}
-    quick: list[QuickSlot] = []
+    spec = plan.spec
 
-    pane_item = soup.find("div", id="pane_item")
+    pane_item = soup.find(spec.items.tag, id=spec.items.element_id)
     if pane_item and hasattr(pane_item, "find_all"):
         # Find all bti1 containers that contain items
-        for bti_container in pane_item.find_all("div", class_="bti1"):
+        for bti_container in pane_item.find_all("div", class_=spec.item_slot_class):
             # Get slot from bti2 div
-            slot_div = bti_container.find("div", class_="bti2")
+            slot_div = bti_container.find("div", class_=spec.item_key_class)
             slot_text = "unknown"
             if slot_div:
                 slot_text = slot_div.get_text(strip=True).lower()
@@ -408,44 +603,52 @@ def parse_items(soup: BeautifulSoup, warnings: list[str]) -> ItemsState:
                         slot_text = _decode_sprite_text(sprite).strip().lower()
 
             # Look for item in bti3 div
-            bti3 = bti_container.find("div", class_="bti3")
+            bti3 = bti_container.find("div", class_=spec.item_body_class)
             if not bti3:
                 continue
 
             # Check for available items (with onclick)
             available_item = bti3.find("div", onclick=True)
             if available_item:
-                name = _extract_name_from_item_div(available_item)
-                if name:
-                    item = Item(
-                        slot=(slot_text if not slot_text.isdigit() else int(slot_text)),
-                        name=name,
-                        element_id=available_item.get("id", ""),
-                        available=True,
-                    )
-                    items[name] = item
+                item = _item(
+                    slot_text,
+                    _extract_name_from_item_div(available_item, plan),
+                    str(available_item.get("id", "")),
+                    True,
+                )
             else:
                 # Check for unavailable items
-                name = _extract_name_from_item_div(bti3)
-                if name:
-                    item = Item(
-                        slot=(slot_text if not slot_text.isdigit() else int(slot_text)),
-                        name=name,
-                        element_id="",
-                        available=False,
-                    )
-                    items[name] = item
+                item = _item(
+                    slot_text, _extract_name_from_item_div(bti3, plan), "", False
+                )
+            if item is not None:
+                items[item.name] = item
     else:
-        warnings.append("pane_item not found")
+        warnings.append(spec.items.missing_warning)
+    return items
+
 
-    quickbar = soup.find("div", id="quickbar")
+def _parse_quickbar(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> list[QuickSlot]:
+    quick: list[QuickSlot] = []
+    spec = plan.spec
+    quickbar = soup.find(spec.quickbar.tag, id=spec.quickbar.element_id)
     if quickbar and hasattr(quickbar, "find_all"):
         # In fixtures, quickbar has empty placeholders only; keep structure to future-fill if names become available
         idx = 1
-        for _ in quickbar.find_all("div", class_="btqs"):
+        for _ in quickbar.find_all("div", class_=spec.quickslot_class):
             quick.append(QuickSlot(slot=idx, name=""))
             idx += 1
     else:
-        warnings.append("quickbar not found")
+        warnings.append(spec.quickbar.missing_warning)
+    return quick
+
 
+@observed("items")
+def parse_items(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> ItemsState:
+    items = _parse_item_pane(soup, warnings, plan)
+    quick = _parse_quickbar(soup, warnings, plan)
     return ItemsState(items=items, quickbar=quick)
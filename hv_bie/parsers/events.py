@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, NamedTuple, Optional
+
+from ..types.models import LogEvents
+
+DAMAGE_DEALT = "damage_dealt"
+DAMAGE_TAKEN = "damage_taken"
+HEAL = "heal"
+BUFF_GAINED = "buff_gained"
+BUFF_EXPIRED = "buff_expired"
+MONSTER_DEFEATED = "monster_defeated"
+ITEM_USED = "item_used"
+SPELL_CAST = "spell_cast"
+
+EVENT_KINDS: tuple[str, ...] = (
+    DAMAGE_DEALT,
+    DAMAGE_TAKEN,
+    HEAL,
+    BUFF_GAINED,
+    BUFF_EXPIRED,
+    MONSTER_DEFEATED,
+    ITEM_USED,
+    SPELL_CAST,
+)
+
+
+class _Rule(NamedTuple):
+    keyword: str
+    pattern: re.Pattern[str]
+    kind: str
+    # Source and target when the line does not name them
+    source: str = ""
+    target: str = ""
+
+
+# Checked in order; the keyword is a cheap substring test before the regex.
+# Named groups: source, target, amount, detail (damage type, resource,
+# effect, item or spell name).
+_RULES: tuple[_Rule, ...] = (
+    _Rule(
+        " defeated",
+        re.compile(r"(?P<target>.+?) has been defeated\.?$"),
+        MONSTER_DEFEATED,
+    ),
+    _Rule(
+        " the effect ",
+        re.compile(r"(?P<target>.+?) gains? the effect (?P<detail>.+?)\.?$"),
+        BUFF_GAINED,
+    ),
+    _Rule(
+        "The effect ",
+        re.compile(
+            r"The effect (?P<detail>.+?)\s+(?:on (?P<target>.+?) )?"
+            r"(?:has expired|has worn off|was dispelled)\.?$"
+        ),
+        BUFF_EXPIRED,
+        target="you",
+    ),
+    _Rule(
+        " restores ",
+        re.compile(
+            r"(?P<source>.+?) restores (?P<amount>\d+) points? of (?P<detail>\w+)"
+        ),
+        HEAL,
+        target="you",
+    ),
+    _Rule(
+        " you",
+        re.compile(
+            r"(?P<source>.+?) (?:hits|crits|glances) you\b.*?"
+            r"(?P<amount>\d+) (?:points of )?(?P<detail>\w+) damage"
+        ),
+        DAMAGE_TAKEN,
+        target="you",
+    ),
+    _Rule(
+        "which hits!",
+        re.compile(
+            r"(?P<source>.+?) (?:uses|casts) .+?, which hits!.*?"
+            r"take (?P<amount>\d+) (?:points of )?(?P<detail>\w+) damage"
+        ),
+        DAMAGE_TAKEN,
+        target="you",
+    ),
+    _Rule(
+        " damage",
+        re.compile(
+            r"(?P<source>.+?) (?:hits?|crits?|\d+x-crit|glances?|counter) "
+            r"(?P<target>.+?)(?:,.*? causing| for) (?P<amount>\d+) "
+            r"(?:points of )?(?:(?P<detail>\w+) )?damage"
+        ),
+        DAMAGE_DEALT,
+    ),
+    _Rule(
+        "You use ",
+        re.compile(r"You use (?P<detail>.+?)\.?$"),
+        ITEM_USED,
+        source="you",
+    ),
+    _Rule(
+        " cast",
+        re.compile(r"(?P<source>.+?) casts? (?P<detail>.+?)(?:,.*|\.)?$"),
+        SPELL_CAST,
+    ),
+)
+
+
+def _actor(name: Optional[str], default: str) -> str:
+    if name is None:
+        return default
+    if name in ("You", "you"):
+        return "you"
+    if name.startswith("Your "):
+        return name[5:]
+    return name
+
+
+def classify_line(line: str) -> Optional[tuple[str, str, str, int, str]]:
+    """Return ``(kind, source, target, amount, detail)`` for one log line."""
+    for rule in _RULES:
+        if rule.keyword not in line:
+            continue
+        m = rule.pattern.match(line)
+        if m is None:
+            continue
+        groups = m.groupdict()
+        amount = groups.get("amount")
+        return (
+            rule.kind,
+            _actor(groups.get("source"), rule.source),
+            _actor(groups.get("target"), rule.target),
+            int(amount) if amount else 0,
+            groups.get("detail") or "",
+        )
+    return None
+
+
+def extract_events(lines: Iterable[str]) -> LogEvents:
+    """Extract typed events from log lines (oldest first) into columns."""
+    events = LogEvents()
+    for i, line in enumerate(lines):
+        ev = classify_line(line)
+        if ev is None:
+            continue
+        kind, source, target, amount, detail = ev
+        events.kinds.append(kind)
+        events.sources.append(source)
+        events.targets.append(target)
+        events.amounts.append(amount)
+        events.details.append(detail)
+        events.line_index.append(i)
+    return events
@@ -0,0 +1,510 @@
+"""DOM-free section parsers working directly on the raw pane HTML.
+
+Each parser scans a section fragment (as cut by ``slice_section``) once
+into a flat list of tags, pairs start and end tags, and reads the pane ids,
+start-tag attributes (``set_infopane_effect`` / ``set_infopane_spell``
+handlers, ``width:Npx`` styles) and text runs from it. Values are built by
+the same constructors the BeautifulSoup parsers in ``core`` use. Whenever
+the markup is not the plain, well-formed shape the scanner understands,
+``FastPathError`` is raised and the caller falls back to the tree parsers.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import replace
+from html import unescape
+from typing import Any, Iterator, Optional
+
+from ..types.models import (
+    AbilitiesState,
+    Ability,
+    Buff,
+    CombatLog,
+    Item,
+    ItemsState,
+    Monster,
+    PlayerState,
+    QuickSlot,
+)
+from .core import (
+    _SPRITE_MAP,
+    LogCursor,
+    _ability,
+    _effect_buff,
+    _item,
+    _log_from_rows,
+    _monster,
+    _player_vitals,
+    _spirit_buffs,
+    _with_events,
+)
+from .plan import DEFAULT_PLAN, CompiledBar, ExtractionPlan, Pane
+
+
+class FastPathError(Exception):
+    """The fragment is outside what the fast path handles; use the tree parsers."""
+
+
+# Any start or end tag, with its attribute text; quoted values may hold '>'
+_TAG_RE = re.compile(r"<(/?)([a-z][\w:-]*)((?:[^>\"']|\"[^\"]*\"|'[^']*')*?)(/?)>")
+_ATTR_RE = re.compile(
+    r"([^\s\"'>/=]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'=<>`]+)))?"
+)
+# The plain ' class="..."' spelling, read without parsing every attribute
+_CLASS_RE = re.compile(
+    r"(?:\s+[^\s\"'>/=]+(?:\s*=\s*(?:\"[^\"]*\"|'[^']*'|[^\s\"'=<>`]+))?)*?"
+    r"\s+class=\"([^\"&]*)\""
+)
+_UPPER_TAG_RE = re.compile(r"</?[A-Z]")
+_QUOTED_RE = re.compile(r"\"[^\"]*\"|'[^']*'")
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta"}
+)
+# Markup html.parser reads as raw text or that the scanner does not model
+_UNSUPPORTED = ("<!", "<?", "<script", "<style", "<textarea", "<title")
+
+
+def _attrs(text: str) -> dict[str, str]:
+    attrs: dict[str, str] = {}
+    for m in _ATTR_RE.finditer(text):
+        name = m.group(1).lower()
+        if name in attrs:
+            # html.parser and lxml disagree on which duplicate wins
+            raise FastPathError(f"duplicate attribute {name}")
+        value = m.group(2)
+        if value is None:
+            value = m.group(3) if m.group(3) is not None else m.group(4) or ""
+        attrs[name] = unescape(value) if "&" in value else value
+    return attrs
+
+
+class _Tags:
+    """The fragment's tags in document order, each start tag paired with its end.
+
+    Elements are referred to by the index of their start tag; ``close[i]``
+    is the index of the matching end tag (``i`` itself for void elements).
+    """
+
+    __slots__ = ("texts", "names", "opening", "attr_text", "close", "_attrs")
+
+    def __init__(self, html: str):
+        lowered = html.lower()
+        for marker in _UNSUPPORTED:
+            if marker in lowered:
+                raise FastPathError(f"fragment contains {marker}")
+        if _UPPER_TAG_RE.search(html):
+            raise FastPathError("fragment has upper-case tags")
+        parts = _TAG_RE.split(html)
+        # texts[i] is the text run before tag i; the last one follows the last tag
+        self.texts: list[str] = parts[0::5]
+        self.names: list[str] = parts[2::5]
+        self.opening: list[bool] = [not slash for slash in parts[1::5]]
+        self.attr_text: list[str] = parts[3::5]
+        self.close: list[int] = list(range(len(self.names)))
+        self._attrs: dict[int, dict[str, str]] = {}
+        names = self.names
+        close = self.close
+        stack: list[int] = []
+        for i, (is_start, name, self_closing) in enumerate(
+            zip(self.opening, names, parts[4::5])
+        ):
+            if is_start:
+                if name not in _VOID_TAGS and not self_closing:
+                    stack.append(i)
+            elif stack and names[stack[-1]] == name:
+                close[stack.pop()] = i
+            else:
+                # Strict pairing: implied or stray end tags are left to the
+                # tree builders, which each repair them in their own way
+                raise FastPathError(f"unbalanced </{name}>")
+        if stack:
+            raise FastPathError(f"unclosed <{names[stack[-1]]}>")
+        # Attribute names are matched as written; tree builders lowercase them
+        bare = _QUOTED_RE.sub("", "".join(self.attr_text))
+        if bare != bare.lower():
+            raise FastPathError("fragment has upper-case attribute names")
+
+    def attrs(self, i: int) -> dict[str, str]:
+        attrs = self._attrs.get(i)
+        if attrs is None:
+            attrs = self._attrs[i] = _attrs(self.attr_text[i])
+        return attrs
+
+    def has_class(self, i: int, cls: str) -> bool:
+        # bs4 class_ matching: any single class, or the whole class list
+        text = self.attr_text[i]
+        if "class" not in text:
+            return False
+        m = _CLASS_RE.match(text) if text.count("class") == 1 else None
+        value = m.group(1) if m else self.attrs(i).get("class", "")
+        if value == cls:
+            return True
+        classes = value.split()
+        return cls in classes or " ".join(classes) == cls
+
+    def descendants(self, i: int, tag: str) -> Iterator[int]:
+        names = self.names
+        opening = self.opening
+        for j in range(i + 1, self.close[i]):
+            if opening[j] and names[j] == tag:
+                yield j
+
+    def find(self, i: int, tag: str, cls: Optional[str] = None) -> Optional[int]:
+        for j in self.descendants(i, tag):
+            if cls is None or self.has_class(j, cls):
+                return j
+        return None
+
+    def _runs(self, i: int) -> Iterator[str]:
+        for t in self.texts[i + 1 : self.close[i] + 1]:
+            if t:
+                yield unescape(t) if "&" in t else t
+
+    def text(self, i: int) -> str:
+        # Tag.get_text(strip=True)
+        return "".join(t for t in (r.strip() for r in self._runs(i)) if t)
+
+    def raw_text(self, i: int) -> str:
+        # Tag.text
+        return "".join(self._runs(i))
+
+    def sprite_text(self, i: int) -> str:
+        # core._decode_sprite_text: classes of the direct child divs
+        chars = []
+        j = i + 1
+        end = self.close[i]
+        while j < end:
+            if self.opening[j]:
+                if self.names[j] == "div" and "class" in self.attr_text[j]:
+                    for cls in self.attrs(j).get("class", "").split():
+                        if cls in _SPRITE_MAP:
+                            chars.append(_SPRITE_MAP[cls])
+                            break
+                j = self.close[j]
+            j += 1
+        return "".join(chars)
+
+    def pane(self, pane: Pane) -> Optional[int]:
+        """Index of the pane's start tag, None when its id does not occur.
+
+        Same rules as ``slicing.find_element``: the id must appear once, as
+        ``id="..."`` in a start tag of the pane's tag name.
+        """
+        needle = f'id="{pane.element_id}"'
+        hits = [i for i, text in enumerate(self.attr_text) if needle in text]
+        if not hits:
+            if any(pane.element_id in text for text in self.attr_text):
+                # Some other quoting or spacing of the id
+                raise FastPathError(f"{pane.element_id} cannot be isolated")
+            return None
+        i = hits[0]
+        if (
+            len(hits) > 1
+            or self.attr_text[i].count(needle) > 1
+            or self.names[i] != pane.tag
+            or not self.opening[i]
+        ):
+            raise FastPathError(f"{pane.element_id} cannot be isolated")
+        return i
+
+
+def _player(tags: _Tags, warnings: list[str], plan: ExtractionPlan) -> PlayerState:
+    spec = plan.spec
+    pane = tags.pane(spec.vitals)
+    if pane is None:
+        warnings.append(spec.vitals.missing_warning)
+        state = PlayerState()
+    else:
+        imgs = [tags.attrs(j) for j in tags.descendants(pane, "img")]
+
+        def width_px(bar: CompiledBar) -> Optional[int]:
+            for img in imgs:
+                src = img.get("src")
+                if src is not None and bar.src.search(src):
+                    m = plan.bar_width.search(img.get("style", ""))
+                    return int(m.group(1)) if m else None
+            return None
+
+        def value_text(ids: tuple[str, ...]) -> Optional[str]:
+            for element_id in ids:
+                for j in tags.descendants(pane, "div"):
+                    if tags.attrs(j).get("id") == element_id:
+                        return tags.raw_text(j)
+            return None
+
+        widths = (
+            width_px(plan.hp_bar),
+            width_px(plan.mp_bar),
+            width_px(plan.sp_bar),
+            width_px(plan.oc_bar),
+        )
+        texts = (
+            value_text(spec.hp_value_ids),
+            value_text(spec.mp_value_ids),
+            value_text(spec.sp_value_ids),
+            value_text(spec.oc_value_ids),
+        )
+        state = _player_vitals(widths, texts, warnings, plan)
+
+    spirit = tags.pane(spec.spirit)
+    buffs = (
+        _spirit_buffs(tags.attrs(spirit).get("src") or "", plan)
+        if spirit is not None
+        else {}
+    )
+    effects = tags.pane(spec.effects)
+    if effects is not None:
+        for j in tags.descendants(effects, "img"):
+            buff = _effect_buff(tags.attrs(j).get("onmouseover", ""), plan, player=True)
+            if buff is not None:
+                buffs[buff.name] = buff
+    return replace(state, buffs=buffs)
+
+
+def _named_text(tags: _Tags, i: int) -> str:
+    # core._extract_name: plain text, else sprite text in title case
+    text = tags.text(i)
+    if text:
+        return text
+    decoded = tags.sprite_text(i).strip()
+    return decoded.title() if decoded else ""
+
+
+def _ability_table(
+    tags: _Tags, pane: Pane, warnings: list[str], plan: ExtractionPlan
+) -> dict[str, Ability]:
+    out: dict[str, Ability] = {}
+    table = tags.pane(pane)
+    if table is None:
+        warnings.append(pane.missing_warning)
+        return out
+    for div in tags.descendants(table, "div"):
+        if not tags.has_class(div, plan.spec.ability_class):
+            continue
+
+        def fallback_name(div: int = div) -> str:
+            found = tags.find(div, "div", "fc2 fal fcb")
+            if found is None:
+                found = tags.find(div, "div", "fl")
+            return _named_text(tags, found) if found is not None else ""
+
+        attrs = tags.attrs(div)
+        ab = _ability(
+            attrs.get("onmouseover", ""),
+            attrs.get("style") or "",
+            attrs.get("id", ""),
+            fallback_name,
+            plan,
+        )
+        if ab.name:
+            out[ab.name] = ab
+    return out
+
+
+def _abilities(
+    tags: _Tags, warnings: list[str], plan: ExtractionPlan
+) -> AbilitiesState:
+    skills = _ability_table(tags, plan.spec.skills, warnings, plan)
+    spells = _ability_table(tags, plan.spec.magic, warnings, plan)
+    return AbilitiesState(skills=skills, spells=spells)
+
+
+def _monster_name(tags: _Tags, mdiv: int, plan: ExtractionPlan) -> str:
+    name_div = tags.find(mdiv, "div", plan.spec.monster_name_class)
+    if name_div is None:
+        return ""
+    name = ""
+    title = tags.find(name_div, "div", "fc2 fal fcb")
+    if title is not None:
+        inner = tags.find(title, "div")
+        if inner is not None:
+            name = tags.text(inner)
+    if not name:
+        sprite = tags.find(name_div, "div", "fl")
+        if sprite is not None:
+            name = tags.sprite_text(sprite).strip().title()
+    return name
+
+
+def _monsters(
+    tags: _Tags, warnings: list[str], plan: ExtractionPlan
+) -> dict[int, Monster]:
+    spec = plan.spec
+    pane = tags.pane(spec.monsters)
+    if pane is None:
+        warnings.append(spec.monsters.missing_warning)
+        return {}
+    monsters: dict[int, Monster] = {}
+    for mdiv in tags.descendants(pane, "div"):
+        if "id" not in tags.attr_text[mdiv]:
+            continue
+        attrs = tags.attrs(mdiv)
+        m_id = (
+            plan.monster_slot_id.search(attrs.get("id", "")) if "id" in attrs else None
+        )
+        if m_id is None:
+            continue
+        idx = int(m_id.group(1))
+        imgs = [tags.attrs(j) for j in tags.descendants(mdiv, "img")]
+
+        def bar_width(bar: CompiledBar) -> Optional[int]:
+            for img in imgs:
+                src = img.get("src")
+                if src is None or not bar.src.search(src):
+                    continue
+                if bar.alt is None or img.get("alt") == bar.alt:
+                    m = plan.bar_width.search(img.get("style", ""))
+                    if m:
+                        return int(m.group(1))
+            return None
+
+        buffs: dict[str, Buff] = {}
+        bc = tags.find(mdiv, "div", spec.monster_buff_class)
+        if bc is not None:
+            for j in tags.descendants(bc, "img"):
+                om = tags.attrs(j).get("onmouseover", "")
+                buff = _effect_buff(om, plan, player=False)
+                if buff is not None:
+                    buffs[buff.name] = buff
+
+        monsters[idx] = _monster(
+            idx,
+            _monster_name(tags, mdiv, plan),
+            attrs.get("style") or "",
+            tuple(bar_width(bar) for bar in plan.monster_bars),
+            buffs,
+            plan,
+        )
+    return monsters
+
+
+def _log(
+    tags: _Tags,
+    warnings: list[str],
+    plan: ExtractionPlan,
+    cursor: Optional[LogCursor],
+    events: bool,
+) -> CombatLog:
+    table = tags.pane(plan.spec.log)
+    cells = list(tags.descendants(table, "td")) if table is not None else None
+    log = _log_from_rows(cells, tags.text, warnings, cursor, plan)
+    if events:
+        return _with_events(log, cursor)
+    return log
+
+
+def _item_name(tags: _Tags, container: int, plan: ExtractionPlan) -> str:
+    # core._extract_name_from_item_div
+    for cls in plan.spec.item_name_classes:
+        name_div = tags.find(container, "div", cls)
+        if name_div is not None:
+            inner = tags.find(name_div, "div")
+            if inner is not None:
+                text = tags.text(inner)
+                if text:
+                    return text.lower()
+    sprite = tags.find(container, "div", "fl")
+    if sprite is not None:
+        decoded = tags.sprite_text(sprite).strip()
+        if decoded:
+            return decoded.lower()
+    return ""
+
+
+def _items(tags: _Tags, warnings: list[str], plan: ExtractionPlan) -> ItemsState:
+    spec = plan.spec
+    items: dict[str, Item] = {}
+    pane = tags.pane(spec.items)
+    if pane is None:
+        warnings.append(spec.items.missing_warning)
+    else:
+        for bti in tags.descendants(pane, "div"):
+            if not tags.has_class(bti, spec.item_slot_class):
+                continue
+            slot_text = "unknown"
+            slot_div = tags.find(bti, "div", spec.item_key_class)
+            if slot_div is not None:
+                slot_text = tags.text(slot_div).lower()
+                if not slot_text:
+                    sprite = tags.find(slot_div, "div", "fc")
+                    if sprite is None:
+                        sprite = tags.find(slot_div, "div", "fl")
+                    if sprite is not None:
+                        slot_text = tags.sprite_text(sprite).strip().lower()
+            body = tags.find(bti, "div", spec.item_body_class)
+            if body is None:
+                continue
+            available = next(
+                (
+                    j
+                    for j in tags.descendants(body, "div")
+                    if "onclick" in tags.attrs(j)
+                ),
+                None,
+            )
+            if available is not None:
+                item = _item(
+                    slot_text,
+                    _item_name(tags, available, plan),
+                    tags.attrs(available).get("id", ""),
+                    True,
+                )
+            else:
+                item = _item(slot_text, _item_name(tags, body, plan), "", False)
+            if item is not None:
+                items[item.name] = item
+
+    quick: list[QuickSlot] = []
+    quickbar = tags.pane(spec.quickbar)
+    if quickbar is None:
+        warnings.append(spec.quickbar.missing_warning)
+    else:
+        slots = sum(
+            1
+            for j in tags.descendants(quickbar, "div")
+            if tags.has_class(j, spec.quickslot_class)
+        )
+        quick = [QuickSlot(slot=i, name="") for i in range(1, slots + 1)]
+    return ItemsState(items=items, quickbar=quick)
+
+
+def _read_section(
+    tags: _Tags,
+    section: str,
+    warnings: list[str],
+    plan: ExtractionPlan,
+    log_cursor: Optional[LogCursor],
+    log_events: bool,
+) -> Any:
+    if section == "player":
+        return _player(tags, warnings, plan)
+    if section == "abilities":
+        return _abilities(tags, warnings, plan)
+    if section == "monsters":
+        return _monsters(tags, warnings, plan)
+    if section == "log":
+        return _log(tags, warnings, plan, log_cursor, log_events)
+    if section == "items":
+        return _items(tags, warnings, plan)
+    raise ValueError(f"unknown snapshot section {section!r}")
+
+
+def parse_section(
+    section: str,
+    fragment: str,
+    warnings: list[str],
+    plan: ExtractionPlan = DEFAULT_PLAN,
+    log_cursor: Optional[LogCursor] = None,
+    log_events: bool = False,
+) -> Any:
+    """Parse one snapshot section from its raw fragment without a tree.
+
+    Raises ``FastPathError`` (before touching ``warnings`` or ``log_cursor``)
+    when the fragment needs the tree parsers.
+    """
+    tags = _Tags(fragment)
+    section_warnings: list[str] = []
+    value = _read_section(tags, section, section_warnings, plan, log_cursor, log_events)
+    warnings.extend(section_warnings)
+    return value
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Pane:
+    """An element the parsers read, located by tag and id."""
+
+    tag: str
+    element_id: str
+
+    @property
+    def missing_warning(self) -> str:
+        return f"{self.element_id} not found"
+
+
+@dataclass(frozen=True)
+class Bar:
+    """A vitals bar image: ``src`` pattern, optional ``alt`` and full width."""
+
+    src: str
+    full_px: int
+    alt: Optional[str] = None
+
+
+def _default_icon_names() -> dict[str, str]:
+    # Player effect names (from onmouseover) that map to a different key
+    return {
+        "Regeneration": "regeneration",
+        "Regen": "regen",
+        "Absorbing Ward": "absorbing ward",
+        "Hastened": "haste",
+        "Shadow Veil": "shadow veil",
+        "Spark of Life": "spark of life",
+        "Spirit Shield": "spirit shield",
+        "Overwhelming Strikes": "overwhelming strikes",
+        "Health Draught": "regeneration",
+        "Heartseeker": "heartseeker",
+    }
+
+
+@dataclass(frozen=True)
+class LayoutSpec:
+    """Declarative description of a HentaiVerse battle page layout.
+
+    Panes, classes, attribute patterns and converter constants used by the
+    section parsers. Variants for other layouts are made with
+    ``dataclasses.replace(DEFAULT_SPEC, ...)`` and compiled with
+    ``compile_plan``.
+    """
+
+    # Panes, grouped by snapshot section below
+    vitals: Pane = Pane("div", "pane_vitals")
+    spirit: Pane = Pane("img", "ckey_spirit")
+    effects: Pane = Pane("div", "pane_effects")
+    skills: Pane = Pane("table", "table_skills")
+    magic: Pane = Pane("table", "table_magic")
+    monsters: Pane = Pane("div", "pane_monster")
+    log: Pane = Pane("table", "textlog")
+    items: Pane = Pane("div", "pane_item")
+    quickbar: Pane = Pane("div", "quickbar")
+
+    # Player vitals: bar images, value divs (first present id wins)
+    hp_bar: Bar = Bar(r"bar_[bd]green\.png", 414)
+    mp_bar: Bar = Bar(r"bar_blue\.png", 414)
+    sp_bar: Bar = Bar(r"bar_red\.png", 414)
+    oc_bar: Bar = Bar(r"bar_orange\.png", 414)
+    # Fixtures show the orange bar mapped to a 0..250 scale
+    oc_bar_scale: int = 250
+    hp_value_ids: tuple[str, ...] = ("dvrhd", "dvrhb")
+    mp_value_ids: tuple[str, ...] = ("dvrm",)
+    sp_value_ids: tuple[str, ...] = ("dvrs",)
+    oc_value_ids: tuple[str, ...] = ("dvrc",)
+    bar_width: str = r"width:(\d+)px"
+
+    # Buffs
+    spirit_stance_src: str = "spirit_a.png"
+    effect_handler: str = (
+        r"set_infopane_effect\('([^']+)'\s*,\s*'[^']*'\s*,\s*([^\)]+)\)"
+    )
+    permanent_durations: tuple[str, ...] = ("autocast", "permanent")
+    icon_names: dict[str, str] = field(default_factory=_default_icon_names)
+
+    # Abilities
+    ability_class: str = "btsd"
+    spell_handler: str = r"set_infopane_spell\('([^']+)'"
+    ability_numbers: str = r"\b(\d+)\b"
+    ability_unavailable_style: str = "opacity:0.5"
+    oc_points_per_charge: int = 25
+
+    # Monsters
+    monster_slot_id: str = r"mkey_(\d+)"
+    monster_name_class: str = "btm3"
+    monster_buff_class: str = "btm6"
+    monster_dead_style: str = "opacity:0.3"
+    monster_hp_bar: Bar = Bar(r"nbargreen\.png", 120, "health")
+    monster_mp_bar: Bar = Bar(r"nbarblue\.png", 120, "magic")
+    monster_sp_bar: Bar = Bar(r"nbarred\.png", 120, "spirit")
+
+    # Combat log
+    round_marker: str = r"Round\s+(\d+)\s*/\s*(\d+)"
+
+    # Items and quickbar
+    item_slot_class: str = "bti1"
+    item_key_class: str = "bti2"
+    item_body_class: str = "bti3"
+    item_name_classes: tuple[str, ...] = ("fc2 fal fcb", "fc2 fal fcg")
+    quickslot_class: str = "btqs"
+
+    def section_panes(self) -> dict[str, tuple[Pane, ...]]:
+        return {
+            "player": (self.vitals, self.spirit, self.effects),
+            "abilities": (self.skills, self.magic),
+            "monsters": (self.monsters,),
+            "log": (self.log,),
+            "items": (self.items, self.quickbar),
+        }
+
+
+class CompiledBar:
+    __slots__ = ("src", "full_px", "alt")
+
+    def __init__(self, bar: Bar):
+        self.src = re.compile(bar.src)
+        self.full_px = bar.full_px
+        self.alt = bar.alt
+
+
+class ExtractionPlan:
+    """A ``LayoutSpec`` with every pattern compiled, built once and reused."""
+
+    def __init__(self, spec: LayoutSpec):
+        self.spec = spec
+        self.section_anchors: dict[str, tuple[tuple[str, str], ...]] = {
+            section: tuple((p.tag, p.element_id) for p in panes)
+            for section, panes in spec.section_panes().items()
+        }
+        # Ids the section parsers look up inside their panes; a raw slice
+        # must hold every occurrence of them on the page
+        value_ids = (
+            spec.hp_value_ids
+            + spec.mp_value_ids
+            + spec.sp_value_ids
+            + spec.oc_value_ids
+        )
+        self.section_ids: dict[str, re.Pattern[str]] = {
+            "player": re.compile(
+                "^(?:" + "|".join(re.escape(i) for i in value_ids) + ")$"
+            ),
+            "monsters": re.compile(spec.monster_slot_id),
+        }
+        self.hp_bar = CompiledBar(spec.hp_bar)
+        self.mp_bar = CompiledBar(spec.mp_bar)
+        self.sp_bar = CompiledBar(spec.sp_bar)
+        self.oc_bar = CompiledBar(spec.oc_bar)
+        self.bar_width = re.compile(spec.bar_width)
+        self.effect_handler = re.compile(spec.effect_handler)
+        self.spell_handler = re.compile(spec.spell_handler)
+        self.ability_numbers = re.compile(spec.ability_numbers)
+        self.monster_slot_id = re.compile(spec.monster_slot_id)
+        self.monster_bars = (
+            CompiledBar(spec.monster_hp_bar),
+            CompiledBar(spec.monster_mp_bar),
+            CompiledBar(spec.monster_sp_bar),
+        )
+        self.round_marker = re.compile(spec.round_marker)
+
+
+def compile_plan(spec: LayoutSpec) -> ExtractionPlan:
+    return ExtractionPlan(spec)
+
+
+DEFAULT_SPEC = LayoutSpec()
+DEFAULT_PLAN = compile_plan(DEFAULT_SPEC)
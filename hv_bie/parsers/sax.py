@@ -0,0 +1,240 @@
+"""Section parsers driven by ``html.parser.HTMLParser`` events.
+
+A single tokenizer pass over the markup records only the elements inside
+the panes a section reads (``pane_vitals``, ``table_skills``, ``textlog``,
+...) into flat per-element lists; everything outside them is skipped as it
+streams past and no tree nodes are built. Start and end tags are paired
+and text is collected with the same rules BeautifulSoup's ``html.parser``
+tree builder applies, so the section readers shared with ``fast`` see the
+elements, attributes and strings the ``core`` parsers would.
+"""
+
+from __future__ import annotations
+
+from html.parser import HTMLParser
+from typing import Any, Iterator, Optional
+
+from .core import LogCursor
+from .fast import _read_section, _Tags
+from .plan import DEFAULT_PLAN, ExtractionPlan, Pane
+
+# bs4's HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    }
+)
+# Strings inside these are not part of an enclosing element's text
+_STRING_CONTAINERS = frozenset({"rt", "rp", "style", "script", "template"})
+_PRESERVE_WHITESPACE = frozenset({"pre", "textarea"})
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+class _PaneElements(_Tags):
+    """The recorded elements in ``_Tags`` layout, with already decoded text.
+
+    ``attr_text[i]`` holds only the attribute names (the readers use it as a
+    cheap presence check); values live in ``attrs(i)``. The text strings
+    inside element ``i`` are ``runs[run_at[i] : run_at[close[i]]]``.
+    """
+
+    __slots__ = ("runs", "run_at", "panes")
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+        self.names: list[str] = []
+        self.opening: list[bool] = []
+        self.attr_text: list[str] = []
+        self.close: list[int] = []
+        self._attrs: dict[int, dict[str, str]] = {}
+        self.runs: list[str] = []
+        self.run_at: list[int] = []
+        self.panes: dict[tuple[str, str], int] = {}
+
+    def has_class(self, i: int, cls: str) -> bool:
+        value = self._attrs[i].get("class")
+        if value is None:
+            return False
+        if value == cls:
+            return True
+        classes = value.split()
+        return cls in classes or " ".join(classes) == cls
+
+    def _runs(self, i: int) -> Iterator[str]:
+        return iter(self.runs[self.run_at[i] : self.run_at[self.close[i]]])
+
+    def pane(self, pane: Pane) -> Optional[int]:
+        return self.panes.get((pane.tag, pane.element_id))
+
+
+class _PaneRecorder(HTMLParser):
+    """Records the first element for each wanted (tag, id) and its contents."""
+
+    def __init__(self, wanted: frozenset[tuple[str, str]]):
+        super().__init__(convert_charrefs=True)
+        self.wanted = wanted
+        self.pane_tags = frozenset(tag for tag, _ in wanted)
+        self.elements = _PaneElements()
+        # Open elements as (name, recorded index or -1), and open counts by name
+        self.stack: list[tuple[str, int]] = []
+        self.open_names: dict[str, int] = {}
+        self.recording = 0
+        self.hidden = 0
+        self.preserve = 0
+        self.pending: list[str] = []
+
+    def _flush(self) -> None:
+        # bs4 BeautifulSoup.endData: one string per run of character data
+        data = "".join(self.pending)
+        self.pending.clear()
+        if not self.recording or self.hidden:
+            return
+        if not self.preserve and not data.strip(_ASCII_SPACES):
+            data = "\n" if "\n" in data else " "
+        self.elements.runs.append(data)
+
+    def _record(self, name: str, opening: bool, attrs: dict[str, str]) -> int:
+        el = self.elements
+        i = len(el.names)
+        el.names.append(name)
+        el.opening.append(opening)
+        el.attr_text.append(" ".join(attrs))
+        el.close.append(i)
+        el.run_at.append(len(el.runs))
+        if opening:
+            el._attrs[i] = attrs
+        return i
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if self.pending:
+            self._flush()
+        index = -1
+        if self.recording or tag in self.pane_tags:
+            values = {k: "" if v is None else v for k, v in attrs}
+            key = (tag, values.get("id", ""))
+            is_pane = key in self.wanted and key not in self.elements.panes
+            if self.recording or is_pane:
+                index = self._record(tag, True, values)
+                if is_pane:
+                    self.elements.panes[key] = index
+        if tag in _VOID_TAGS:
+            return
+        self.stack.append((tag, index))
+        self.open_names[tag] = self.open_names.get(tag, 0) + 1
+        if index >= 0:
+            self.recording += 1
+        if tag in _STRING_CONTAINERS:
+            self.hidden += 1
+        if tag in _PRESERVE_WHITESPACE:
+            self.preserve += 1
+
+    def handle_startendtag(
+        self, tag: str, attrs: list[tuple[str, Optional[str]]]
+    ) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self.pending:
+            self._flush()
+        if not self.open_names.get(tag):
+            # bs4 ignores end tags with no open element of that name
+            return
+        end = -1
+        while True:
+            name, index = self.stack.pop()
+            self.open_names[name] -= 1
+            if index >= 0:
+                if end < 0:
+                    end = self._record(tag, False, {})
+                self.elements.close[index] = end
+                self.recording -= 1
+            if name in _STRING_CONTAINERS:
+                self.hidden -= 1
+            if name in _PRESERVE_WHITESPACE:
+                self.preserve -= 1
+            if name == tag:
+                return
+
+    def handle_comment(self, data: str) -> None:
+        if self.pending:
+            self._flush()
+
+    def handle_decl(self, decl: str) -> None:
+        if self.pending:
+            self._flush()
+
+    def unknown_decl(self, data: str) -> None:
+        if self.pending:
+            self._flush()
+
+    def handle_pi(self, data: str) -> None:
+        if self.pending:
+            self._flush()
+
+    def handle_data(self, data: str) -> None:
+        self.pending.append(data)
+
+    def finish(self) -> _PaneElements:
+        self.close()
+        if self.pending:
+            self._flush()
+        el = self.elements
+        # Elements still open at the end run to the end of the markup
+        end = len(el.names)
+        for _, index in self.stack:
+            if index >= 0:
+                el.close[index] = end
+        el.run_at.append(len(el.runs))
+        return el
+
+
+def _wanted(section: str, plan: ExtractionPlan) -> frozenset[tuple[str, str]]:
+    panes = plan.spec.section_panes().get(section)
+    if panes is None:
+        raise ValueError(f"unknown snapshot section {section!r}")
+    return frozenset((p.tag, p.element_id) for p in panes)
+
+
+def parse_section(
+    section: str,
+    markup: str,
+    warnings: list[str],
+    plan: ExtractionPlan = DEFAULT_PLAN,
+    log_cursor: Optional[LogCursor] = None,
+    log_events: bool = False,
+) -> Any:
+    """Parse one snapshot section from a page, or any fragment holding its panes.
+
+    Produces the same value and warnings as the ``core`` parsers run on a
+    BeautifulSoup ``html.parser`` tree of ``markup``.
+    """
+    recorder = _PaneRecorder(_wanted(section, plan))
+    recorder.feed(markup)
+    return _read_section(
+        recorder.finish(), section, warnings, plan, log_cursor, log_events
+    )
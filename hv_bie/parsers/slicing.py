@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from .plan import DEFAULT_PLAN, ExtractionPlan
+
+# Raw-string anchors read by each snapshot section, as (tag, id) pairs.
+SECTION_ANCHORS: dict[str, tuple[tuple[str, str], ...]] = DEFAULT_PLAN.section_anchors
+
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# Any start/end tag; quoted attribute values may contain '>' or other markup
+_TAG_RE = re.compile(
+    r"<(/?)([a-zA-Z][\w:-]*)(?=[\s/>])"
+    r"[^>\"'/]*(?:(?:\"[^\"]*\"|'[^']*'|/(?!>))[^>\"'/]*)*(/?)>"
+)
+_ID_ATTR_RE = re.compile(r'id="([^"]*)"')
+
+# Markup as an HTML parser tokenizes it: text, comments, declarations,
+# script and style blocks, and tags whose quoted attribute values are
+# closed. A match that stops exactly at an anchor's "<" shows the anchor
+# starts a tag, not text inside an attribute value or comment.
+_ATTRS = r"[^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*"
+_SYNC_RE = re.compile(
+    r"(?:[^<]*<(?:(?!script\b|style\b)/?[a-zA-Z][\w:-]*(?:[\s/]"
+    + _ATTRS
+    + r")?>|!--.*?-->|![^>]*>|\?[^>]*>|(script|style)\b"
+    + _ATTRS
+    + r">.*?</\1\s*>|(?![a-zA-Z/!?])))*[^<]*",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def _matching_ids(html: str, pattern: re.Pattern[str]) -> list[str]:
+    return [i for i in _ID_ATTR_RE.findall(html) if pattern.search(i)]
+
+
+def _start_tag_offset(html: str, element_id: str) -> int:
+    """Offset of the "<" before the first ``id="element_id"``, or -1."""
+    pos = html.find(f'id="{element_id}"')
+    return html.rfind("<", 0, pos) if pos >= 0 else -1
+
+
+def anchor_starts(html: str, plan: ExtractionPlan = DEFAULT_PLAN) -> frozenset[int]:
+    """Offsets of the plan's anchor start tags that the page reaches in step.
+
+    The markup is tokenized once, from one anchor to the next in page
+    order; anchors after the first one it cannot reach are left out.
+    """
+    starts = {
+        _start_tag_offset(html, element_id)
+        for anchors in plan.section_anchors.values()
+        for _, element_id in anchors
+    }
+    synced: set[int] = set()
+    pos = 0
+    for start in sorted(starts - {-1}):
+        m = _SYNC_RE.match(html, pos, start)
+        if m is None or m.end() != start:
+            break
+        synced.add(start)
+        pos = start
+    return frozenset(synced)
+
+
+def find_element(html: str, tag: str, element_id: str) -> Optional[tuple[int, int]]:
+    """Locate the outer HTML span of the unique ``<tag id="element_id">``.
+
+    Returns ``(0, 0)`` when the id does not occur in the string at all and
+    ``None`` when it occurs but cannot be isolated cleanly (duplicate ids,
+    other quoting, unbalanced tags, comments or scripts inside the element).
+    """
+    needle = f'id="{element_id}"'
+    pos = html.find(needle)
+    if pos < 0:
+        return (0, 0) if element_id not in html else None
+    if html.find(needle, pos + len(needle)) >= 0:
+        return None
+    start = html.rfind("<", 0, pos)
+    if start < 0:
+        return None
+    m = _TAG_RE.match(html, start)
+    if not m or m.group(1) or m.group(2).lower() != tag or m.end() <= pos:
+        return None
+    end = element_end(html, start, tag)
+    if end is None:
+        return None
+    if end > m.end():
+        body = html[start:end]
+        if "<!--" in body or "<script" in body.lower():
+            return None
+    return (start, end)
+
+
+def element_end(html: str, start: int, tag: str) -> Optional[int]:
+    """End offset of the ``tag`` element whose start tag begins at ``start``.
+
+    Void and self-closing elements end with their start tag. Otherwise every
+    element inside must be closed, in order, before the ``tag`` end tag.
+    Returns ``None`` when the end tag is missing or the markup is not
+    strictly nested, or when text between tags holds markup the tag scan
+    could not read (stray quotes, broken tags). An HTML parser may nest
+    such markup differently from the raw text.
+    """
+    m = _TAG_RE.match(html, start)
+    if not m:
+        return None
+    if tag in _VOID_TAGS or m.group(3):
+        return m.end()
+    open_tags: list[str] = []
+    count = 0
+    for t in _TAG_RE.finditer(html, start):
+        count += 1
+        closing, name, self_closing = t.groups()
+        if closing:
+            if not open_tags or open_tags.pop() != name.lower():
+                return None
+            if t.group()[len(name) + 2 : -1].strip():
+                # Junk in an end tag; parsers disagree on what it closes
+                return None
+            if not open_tags:
+                # Any "<" the scan skipped is markup it could not read
+                end = t.end()
+                return end if html.count("<", start, end) == count else None
+        elif not self_closing:
+            name = name.lower()
+            if name not in _VOID_TAGS:
+                open_tags.append(name)
+    return None
+
+
+def slice_section(
+    html: str,
+    section: str,
+    plan: ExtractionPlan = DEFAULT_PLAN,
+    synced: Optional[frozenset[int]] = None,
+) -> Optional[str]:
+    """Concatenate the raw fragments read by ``section``.
+
+    Returns ``None`` when any anchor cannot be isolated or does not start
+    at a tag the page reaches in step (``synced``, from ``anchor_starts``,
+    computed here when not given), or when the ids the section's parsers
+    look for (``plan.section_ids``, such as the monster slots) occur
+    differently in the slice than on the whole page, so the caller can fall
+    back to the full-document tree.
+    """
+    spans: list[tuple[int, int]] = []
+    for tag, element_id in plan.section_anchors[section]:
+        span = find_element(html, tag, element_id)
+        if span is None:
+            return None
+        if span[1] > span[0]:
+            spans.append(span)
+    if spans:
+        if synced is None:
+            synced = anchor_starts(html, plan)
+        if any(start not in synced for start, _ in spans):
+            return None
+    spans.sort()
+    parts: list[str] = []
+    last_end = -1
+    for start, end in spans:
+        # An anchor nested inside an earlier one is already covered by it
+        if end <= last_end:
+            continue
+        if start < last_end:
+            return None
+        parts.append(html[start:end])
+        last_end = end
+    fragment = "".join(parts)
+    ids = plan.section_ids.get(section)
+    if ids is not None and _matching_ids(fragment, ids) != _matching_ids(html, ids):
+        return None
+    return fragment
+
+
+def slice_monster_slots(
+    fragment: str, plan: ExtractionPlan = DEFAULT_PLAN
+) -> Optional[list[tuple[int, str]]]:
+    """Split a monsters pane fragment into ``(slot_index, raw slot div)`` pairs.
+
+    Slot divs are the ids matching ``plan.monster_slot_id``, as in
+    ``parse_monsters``. Returns ``None`` when any slot cannot be isolated
+    cleanly.
+    """
+    slots: list[tuple[int, str]] = []
+    seen: set[int] = set()
+    for m in _ID_ATTR_RE.finditer(fragment):
+        slot = plan.monster_slot_id.search(m.group(1))
+        if slot is None:
+            continue
+        idx = int(slot.group(1))
+        span = find_element(fragment, "div", m.group(1))
+        if span is None or span[1] == 0 or idx in seen:
+            return None
+        seen.add(idx)
+        slots.append((idx, fragment[span[0] : span[1]]))
+    return slots
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import fields, is_dataclass
+from json.encoder import encode_basestring
+from typing import Any, Callable, TextIO
+
+# Short keys used by compact output; unique across every model field
+SHORT_KEYS: dict[str, str] = {
+    # BattleSnapshot
+    "player": "p",
+    "abilities": "a",
+    "monsters": "m",
+    "log": "l",
+    "items": "i",
+    "warnings": "w",
+    # PlayerState
+    "hp_percent": "hp",
+    "hp_value": "hv",
+    "mp_percent": "mp",
+    "mp_value": "mv",
+    "sp_percent": "sp",
+    "sp_value": "sv",
+    "overcharge_value": "oc",
+    "buffs": "b",
+    # Buff
+    "name": "n",
+    "remaining_turns": "t",
+    "is_permanent": "pm",
+    # AbilitiesState / Ability
+    "skills": "sk",
+    "spells": "mg",
+    "element_id": "id",
+    "available": "av",
+    "cost": "c",
+    "cost_type": "ct",
+    "cooldown_turns": "cd",
+    # Monster
+    "slot_index": "x",
+    "alive": "al",
+    "system_monster_type": "st",
+    # CombatLog / LogEvents
+    "lines": "ln",
+    "current_round": "cr",
+    "total_round": "tr",
+    "events": "ev",
+    "kinds": "k",
+    "sources": "src",
+    "targets": "tg",
+    "amounts": "am",
+    "details": "dt",
+    "line_index": "li",
+    # ItemsState / Item / QuickSlot
+    "quickbar": "q",
+    "slot": "s",
+}
+
+_ATOMIC = (str, int, bool, type(None))
+
+# Per dataclass type: (field name, output key) pairs, in declaration order
+_LAYOUTS: dict[tuple[type, bool], tuple[tuple[str, str], ...]] = {}
+
+
+def _layout(cls: type, compact: bool) -> tuple[tuple[str, str], ...]:
+    layout = _LAYOUTS.get((cls, compact))
+    if layout is None:
+        names = [f.name for f in fields(cls)]
+        layout = tuple((n, SHORT_KEYS.get(n, n) if compact else n) for n in names)
+        _LAYOUTS[cls, compact] = layout
+    return layout
+
+
+def _encoder(json_safe: bool, compact: bool) -> Callable[[Any], Any]:
+    def enc(obj: Any) -> Any:
+        if isinstance(obj, _ATOMIC):
+            return obj
+        if isinstance(obj, float):
+            if json_safe and not math.isfinite(obj):
+                return None
+            return obj
+        if isinstance(obj, dict):
+            if json_safe:
+                return {str(k): enc(v) for k, v in obj.items()}
+            return {k: enc(v) for k, v in obj.items()}
+        if isinstance(obj, (list, tuple)):
+            return [enc(v) for v in obj]
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return {
+                key: enc(getattr(obj, name))
+                for name, key in _layout(type(obj), compact)
+            }
+        return obj
+
+    return enc
+
+
+_TO_DICT = _encoder(json_safe=False, compact=False)
+_TO_JSON = {c: _encoder(json_safe=True, compact=c) for c in (False, True)}
+
+
+def to_dict(obj: Any) -> Any:
+    """Convert a model (or container of models) to plain dicts and lists.
+
+    Like ``dataclasses.asdict`` but without deep-copying leaf values; floats
+    (including ``inf``) and integer dict keys are kept as they are.
+    """
+    return _TO_DICT(obj)
+
+
+def to_json_obj(obj: Any, *, compact: bool = False) -> Any:
+    """Convert a model to JSON-ready values.
+
+    Non-finite floats become ``None`` (so permanent buffs have
+    ``remaining_turns: null``; ``is_permanent`` carries the meaning), dict
+    keys become strings, and ``compact=True`` renames fields to
+    ``SHORT_KEYS``.
+    """
+    return _TO_JSON[compact](obj)
+
+
+def _separators(compact: bool) -> tuple[str, str]:
+    return (",", ":") if compact else (", ", ": ")
+
+
+# Per dataclass type: (field name, '"key": ' prefix) pairs for the writer
+_KEY_PREFIXES: dict[tuple[type, bool], tuple[tuple[str, str], ...]] = {}
+
+
+def _prefixes(cls: type, compact: bool) -> tuple[tuple[str, str], ...]:
+    prefixes = _KEY_PREFIXES.get((cls, compact))
+    if prefixes is None:
+        colon = _separators(compact)[1]
+        prefixes = tuple(
+            (name, encode_basestring(key) + colon)
+            for name, key in _layout(cls, compact)
+        )
+        _KEY_PREFIXES[cls, compact] = prefixes
+    return prefixes
+
+
+def _write(obj: Any, out: Callable[[str], Any], compact: bool) -> None:
+    """Write the JSON of ``to_json_obj(obj)`` to ``out`` piece by piece."""
+    if isinstance(obj, str):
+        out(encode_basestring(obj))
+    elif obj is None:
+        out("null")
+    elif obj is True:
+        out("true")
+    elif obj is False:
+        out("false")
+    elif isinstance(obj, int):
+        out(int.__repr__(obj))
+    elif isinstance(obj, float):
+        out(float.__repr__(obj) if math.isfinite(obj) else "null")
+    elif isinstance(obj, dict):
+        comma, colon = _separators(compact)
+        out("{")
+        sep = ""
+        for k, v in obj.items():
+            out(sep)
+            # Non-string keys (monster slots) become strings as in json.dumps
+            out(encode_basestring(k if isinstance(k, str) else json.dumps(k)))
+            out(colon)
+            _write(v, out, compact)
+            sep = comma
+        out("}")
+    elif isinstance(obj, (list, tuple)):
+        comma = _separators(compact)[0]
+        out("[")
+        sep = ""
+        for v in obj:
+            out(sep)
+            _write(v, out, compact)
+            sep = comma
+        out("]")
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        comma = _separators(compact)[0]
+        out("{")
+        sep = ""
+        for name, prefix in _prefixes(type(obj), compact):
+            out(sep)
+            out(prefix)
+            _write(getattr(obj, name), out, compact)
+            sep = comma
+        out("}")
+    else:
+        # Anything else goes through the json module (and fails like it)
+        out(json.dumps(obj, ensure_ascii=False, allow_nan=False))
+
+
+def dumps(obj: Any, *, compact: bool = False) -> str:
+    """Serialize a model to a standards-compliant JSON string.
+
+    The output never contains ``NaN``/``Infinity``; ``compact=True`` uses
+    short keys and no whitespace. The text is written straight from the
+    model objects, without building ``to_json_obj()`` first.
+    """
+    parts: list[str] = []
+    _write(obj, parts.append, compact)
+    return "".join(parts)
+
+
+# Pieces gathered before each write to the file object in ``dump``
+_DUMP_BATCH = 4096
+
+
+def dump(obj: Any, fp: TextIO, *, compact: bool = False) -> None:
+    """Stream the JSON of ``dumps(obj)`` to a text file object in chunks.
+
+    Pieces are written as they are produced, a batch at a time, so neither
+    an intermediate tree nor the whole text is held in memory. For a
+    socket, pass ``sock.makefile("w", encoding="utf-8")``.
+    """
+    parts: list[str] = []
+
+    def out(piece: str) -> None:
+        parts.append(piece)
+        if len(parts) >= _DUMP_BATCH:
+            fp.write("".join(parts))
+            parts.clear()
+
+    _write(obj, out, compact)
+    if parts:
+        fp.write("".join(parts))
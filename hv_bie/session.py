@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import Any, Iterator, Mapping, Optional
+
+from .cache import _deep_size, snapshot_nbytes
+from .diff import SnapshotDelta, apply_delta, diff
+from .fragments import parse_fragments
+from .parsers import DEFAULT_PLAN, LogCursor
+from .snapshot import _check_engine, _select_sections, parse_snapshot
+from .types.models import (
+    AbilitiesState,
+    BattleSnapshot,
+    CombatLog,
+    ItemsState,
+    PlayerState,
+)
+
+# parse_snapshot options with no parse_fragments counterpart, and defaults
+_PAGE_ONLY_OPTIONS: dict[str, Any] = {"engine": "soup", "collect_stats": False}
+
+
+class _Segment:
+    """A keyframe snapshot and the deltas of the turns that follow it."""
+
+    __slots__ = ("start", "keyframe", "deltas", "nbytes")
+
+    def __init__(self, start: int, keyframe: BattleSnapshot, nbytes: int):
+        self.start = start
+        self.keyframe = keyframe
+        self.deltas: list[SnapshotDelta] = []
+        self.nbytes = nbytes
+
+    def __len__(self) -> int:
+        return 1 + len(self.deltas)
+
+
+class BattleSession:
+    """Current snapshot and recent history of one battle.
+
+    Each page passed to ``feed(html)`` (parsed with ``previous=`` the
+    current snapshot) or ``feed_fragments(fragments)`` is one turn,
+    numbered from 0. History is kept as a full keyframe snapshot every
+    ``keyframe_interval`` turns and a ``diff`` delta for each turn in
+    between, so ``at_turn()`` and ``at_round()`` replay at most
+    ``keyframe_interval - 1`` deltas while ``current`` is always at hand.
+
+    Whole keyframe segments are dropped, oldest first, once at least
+    ``max_turns`` newer turns remain or the estimated history size exceeds
+    ``max_bytes`` (sizes, and ``nbytes``, are only measured when there is a
+    byte budget); the newest segment is always kept and ``None`` disables
+    either limit. ``options`` go to ``parse_snapshot``, and ``backend``,
+    ``log_events``, ``plan`` and ``sections`` also to ``parse_fragments``;
+    ``feed_fragments`` raises ``ValueError`` for a session that sets the
+    page-only ``engine`` or ``collect_stats``. With a ``log_cursor`` every
+    turn reads only the new log rows and the log held by each snapshot is
+    bounded by the cursor's ``max_lines``.
+    """
+
+    def __init__(
+        self,
+        *,
+        keyframe_interval: int = 64,
+        max_turns: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        log_cursor: Optional[LogCursor] = None,
+        **options: Any,
+    ):
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        if max_turns is not None and max_turns < 1:
+            raise ValueError("max_turns must be at least 1")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative")
+        if "previous" in options or options.get("lazy"):
+            raise ValueError("a session parses every page with previous=current")
+        _check_engine(options.get("engine", "soup"))
+        _select_sections(options.get("sections"))
+        self.keyframe_interval = keyframe_interval
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.log_cursor = log_cursor
+        self.options = options
+        self._current: Optional[BattleSnapshot] = None
+        self._turns = 0
+        self._segments: deque[_Segment] = deque()
+        self._nbytes = 0
+        # Round -> [first, last] retained turn seen with that current_round
+        self._rounds: dict[int, list[int]] = {}
+        self._turn_rounds: deque[Optional[int]] = deque()
+
+    @property
+    def current(self) -> Optional[BattleSnapshot]:
+        """Snapshot of the latest turn, or ``None`` before the first page."""
+        return self._current
+
+    @property
+    def turns(self) -> int:
+        """Number of turns fed so far, including dropped ones."""
+        return self._turns
+
+    @property
+    def first_turn(self) -> int:
+        """Oldest turn still in the history."""
+        return self._segments[0].start if self._segments else 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return self._turns - self.first_turn
+
+    def feed(self, html: str) -> BattleSnapshot:
+        snap = parse_snapshot(
+            html, previous=self._current, log_cursor=self.log_cursor, **self.options
+        )
+        self._record(snap)
+        return snap
+
+    def feed_fragments(self, fragments: Mapping[str, str]) -> BattleSnapshot:
+        options = self.options
+        page_only = [
+            name
+            for name, default in _PAGE_ONLY_OPTIONS.items()
+            if options.get(name, default) != default
+        ]
+        if page_only:
+            raise ValueError(
+                f"parse_fragments does not support {', '.join(page_only)}; "
+                "use feed() for this session"
+            )
+        previous = self._current
+        if previous is None:
+            previous = BattleSnapshot(
+                player=PlayerState(),
+                abilities=AbilitiesState(),
+                monsters={},
+                log=CombatLog(),
+                items=ItemsState(),
+            )
+        snap = parse_fragments(
+            fragments,
+            previous,
+            backend=options.get("backend"),
+            log_cursor=self.log_cursor,
+            log_events=options.get("log_events", False),
+            plan=options.get("plan") or DEFAULT_PLAN,
+            sections=options.get("sections"),
+        )
+        self._record(snap)
+        return snap
+
+    def _record(self, snap: BattleSnapshot) -> None:
+        prev = self._current
+        turn = self._turns
+        measure = self.max_bytes is not None
+        segments = self._segments
+        if prev is None or len(segments[-1]) >= self.keyframe_interval:
+            segment = _Segment(turn, snap, snapshot_nbytes(snap) if measure else 0)
+            segments.append(segment)
+            self._nbytes += segment.nbytes
+        else:
+            delta = diff(prev, snap)
+            segment = segments[-1]
+            segment.deltas.append(delta)
+            if measure:
+                nbytes = _deep_size(delta, set())
+                segment.nbytes += nbytes
+                self._nbytes += nbytes
+        self._current = snap
+        self._turns = turn + 1
+
+        round_ = snap.log.current_round
+        self._turn_rounds.append(round_)
+        if round_ is not None:
+            span = self._rounds.get(round_)
+            if span is None:
+                self._rounds[round_] = [turn, turn]
+            else:
+                span[1] = turn
+        self._evict()
+
+    def _evict(self) -> None:
+        segments = self._segments
+        while len(segments) > 1:
+            oldest = segments[0]
+            if not (
+                (
+                    self.max_turns is not None
+                    and len(self) - len(oldest) >= self.max_turns
+                )
+                or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+            ):
+                break
+            segments.popleft()
+            self._nbytes -= oldest.nbytes
+            first = self.first_turn
+            for _ in range(len(oldest)):
+                round_ = self._turn_rounds.popleft()
+                if round_ is None:
+                    continue
+                span = self._rounds.get(round_)
+                if span is None:
+                    continue
+                if span[1] < first:
+                    del self._rounds[round_]
+                else:
+                    span[0] = max(span[0], first)
+
+    def at_turn(self, turn: int) -> BattleSnapshot:
+        """Snapshot after ``turn``; negative turns count back from the latest."""
+        if turn < 0:
+            turn += self._turns
+        if not self.first_turn <= turn < self._turns:
+            raise IndexError(f"turn {turn} is not in the session history")
+        if turn == self._turns - 1:
+            assert self._current is not None
+            return self._current
+        segments = self._segments
+        # Segments after the first start every keyframe_interval turns
+        if len(segments) == 1 or turn < segments[1].start:
+            index = 0
+        else:
+            index = 1 + (turn - segments[1].start) // self.keyframe_interval
+        segment = segments[index]
+        snap = segment.keyframe
+        for delta in islice(segment.deltas, turn - segment.start):
+            snap = apply_delta(snap, delta)
+        return snap
+
+    def round_turns(self, round_: int) -> Optional[range]:
+        """Retained turns whose log showed ``round_`` as the current round."""
+        span = self._rounds.get(round_)
+        return range(span[0], span[1] + 1) if span is not None else None
+
+    def at_round(self, round_: int) -> Optional[BattleSnapshot]:
+        """Snapshot at the last retained turn of ``round_``, if any."""
+        span = self._rounds.get(round_)
+        return self.at_turn(span[1]) if span is not None else None
+
+    def history(self, start: Optional[int] = None) -> Iterator[BattleSnapshot]:
+        """Yield the retained snapshots from ``start`` (default the oldest) on."""
+        first = self.first_turn if start is None else max(start, self.first_turn)
+        for segment in list(self._segments):
+            end = segment.start + len(segment)
+            if end <= first:
+                continue
+            snap = segment.keyframe
+            for turn in range(segment.start, end):
+                if turn > segment.start:
+                    snap = apply_delta(snap, segment.deltas[turn - segment.start - 1])
+                if turn >= first:
+                    yield snap
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import replace
+from dataclasses import fields, replace
+from hashlib import blake2b
+from time import perf_counter
+from typing import Any, Callable, Iterable, NamedTuple, Optional
 
 from bs4 import BeautifulSoup
 
+from .observe import _stage
+from .parsers.backends import resolve_backend
 from .parsers.core import (
+    LogCursor,
     parse_abilities,
     parse_items,
     parse_log,
@@ -12,31 +18,476 @@ from .parsers.core import (
     parse_player_buffs,
     parse_player_vitals,
 )
-from .types.models import BattleSnapshot
+from .parsers.fast import FastPathError
+from .parsers.fast import parse_section as fast_parse_section
+from .parsers.plan import DEFAULT_PLAN, ExtractionPlan
+from .parsers.sax import parse_section as sax_parse_section
+from .parsers.slicing import anchor_starts, slice_monster_slots, slice_section
+from .stats import ParseStats, _StatsRecorder
+from .types.models import (
+    AbilitiesState,
+    BattleSnapshot,
+    CombatLog,
+    ItemsState,
+    Monster,
+    PlayerState,
+)
+
+
+def _parse_player(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> PlayerState:
+    return replace(
+        parse_player_vitals(soup, warnings, plan),
+        buffs=parse_player_buffs(soup, warnings, plan),
+    )
+
+
+def _parse_log(
+    soup: BeautifulSoup, warnings: list[str], plan: ExtractionPlan = DEFAULT_PLAN
+) -> CombatLog:
+    return parse_log(soup, warnings, plan=plan)
+
+
+_SECTION_PARSERS: dict[
+    str, Callable[[BeautifulSoup, list[str], ExtractionPlan], Any]
+] = {
+    "player": _parse_player,
+    "abilities": parse_abilities,
+    "monsters": parse_monsters,
+    "log": _parse_log,
+    "items": parse_items,
+}
+
+SECTIONS: tuple[str, ...] = tuple(_SECTION_PARSERS)
+
+# "soup": BeautifulSoup trees; "fast": raw-string scanners, falling back to
+# trees for any fragment they do not understand; "sax": one html.parser event
+# pass per fragment, recording only the panes the section reads
+ENGINES: tuple[str, ...] = ("soup", "fast", "sax")
+
+# Typed empty values for sections that were not requested
+_SECTION_DEFAULTS: dict[str, Callable[[], Any]] = {
+    "player": PlayerState,
+    "abilities": AbilitiesState,
+    "monsters": dict,
+    "log": CombatLog,
+    "items": ItemsState,
+}
+
+
+def _check_engine(engine: str) -> str:
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {list(ENGINES)}")
+    return engine
+
+
+def _select_sections(sections: Optional[Iterable[str]]) -> frozenset[str]:
+    if sections is None:
+        return frozenset(SECTIONS)
+    if isinstance(sections, str):
+        sections = (sections,)
+    selected = frozenset(sections)
+    unknown = selected.difference(SECTIONS)
+    if unknown:
+        raise ValueError(
+            f"unknown snapshot sections {sorted(unknown)}; expected {list(SECTIONS)}"
+        )
+    return selected
+
+
+class _SectionPrint(NamedTuple):
+    """Digest of a section's raw fragment and the warnings it produced."""
+
+    digest: bytes
+    warnings: tuple[str, ...]
+    # Per-slot digests of the mkey divs, for the monsters section
+    slots: Optional[dict[int, bytes]] = None
+
+
+def _digest(fragment: str) -> bytes:
+    return blake2b(fragment.encode("utf-8"), digest_size=16).digest()
+
+
+def _section_prints(snap: BattleSnapshot) -> dict[str, _SectionPrint]:
+    return vars(snap).get("_section_prints", {})
+
+
+class _PageParser:
+    """Parse snapshot sections from one page, one small tree per section.
+
+    Sections whose anchors cannot be sliced cleanly share a single
+    full-document tree, built at most once. Sections (and monster slots)
+    whose raw fragment hashes like the previous snapshot's are reused
+    instead of re-parsed.
+    """
+
+    def __init__(
+        self,
+        html: str,
+        backend: str,
+        selected: frozenset[str],
+        previous: Optional[BattleSnapshot] = None,
+        log_cursor: Optional[LogCursor] = None,
+        log_events: bool = False,
+        plan: ExtractionPlan = DEFAULT_PLAN,
+        engine: str = "soup",
+        stats: Optional[_StatsRecorder] = None,
+    ):
+        self.html = html
+        self.backend = backend
+        self.selected = selected
+        # Keep only the reusable section values, not the previous snapshot
+        self.reusable: dict[str, tuple[_SectionPrint, Any]] = (
+            {
+                section: (sp, getattr(previous, section))
+                for section, sp in _section_prints(previous).items()
+            }
+            if previous is not None
+            else {}
+        )
+        self.log_cursor = log_cursor
+        self.log_events = log_events
+        self.plan = plan
+        self.engine = engine
+        self.stats = stats
+        self.prints: dict[str, _SectionPrint] = {}
+        self._full: Optional[BeautifulSoup] = None
+        self._synced: Optional[frozenset[int]] = None
+
+    def soup(self, markup: str) -> BeautifulSoup:
+        if self.stats is None:
+            return BeautifulSoup(markup, self.backend)
+        start = perf_counter()
+        tree = BeautifulSoup(markup, self.backend)
+        self.stats.build_seconds += perf_counter() - start
+        self.stats.node_count += len(tree.find_all(True))
+        return tree
 
+    def full(self) -> BeautifulSoup:
+        if self._full is None:
+            self._full = self.soup(self.html)
+        return self._full
 
-def parse_snapshot(html: str) -> BattleSnapshot:
+    def _run(self, section: str, soup: BeautifulSoup, warnings: list[str]) -> Any:
+        if self.stats is not None:
+            return self._run_timed(section, soup, warnings, self.stats)
+        if section == "log":
+            return parse_log(
+                soup,
+                warnings,
+                cursor=self.log_cursor,
+                events=self.log_events,
+                plan=self.plan,
+            )
+        return _SECTION_PARSERS[section](soup, warnings, self.plan)
+
+    def _run_timed(
+        self,
+        section: str,
+        soup: BeautifulSoup,
+        warnings: list[str],
+        stats: _StatsRecorder,
+    ) -> Any:
+        if section == "player":
+            vitals = stats.call(
+                "parse_player_vitals", parse_player_vitals, soup, warnings, self.plan
+            )
+            buffs = stats.call(
+                "parse_player_buffs", parse_player_buffs, soup, warnings, self.plan
+            )
+            return replace(vitals, buffs=buffs)
+        if section == "log":
+            return stats.call(
+                "parse_log",
+                parse_log,
+                soup,
+                warnings,
+                cursor=self.log_cursor,
+                events=self.log_events,
+                plan=self.plan,
+            )
+        parser = _SECTION_PARSERS[section]
+        return stats.call(parser.__name__, parser, soup, warnings, self.plan)
+
+    def _run_fragment(self, section: str, fragment: str, warnings: list[str]) -> Any:
+        if self.engine == "sax":
+            return sax_parse_section(
+                section,
+                fragment,
+                warnings,
+                self.plan,
+                log_cursor=self.log_cursor,
+                log_events=self.log_events,
+            )
+        if self.engine == "fast":
+            try:
+                return fast_parse_section(
+                    section,
+                    fragment,
+                    warnings,
+                    self.plan,
+                    log_cursor=self.log_cursor,
+                    log_events=self.log_events,
+                )
+            except FastPathError:
+                pass
+        return self._run(section, self.soup(fragment), warnings)
+
+    def parse(self, section: str, warnings: list[str]) -> Any:
+        if section not in self.selected:
+            return _SECTION_DEFAULTS[section]()
+        start = perf_counter() if self.stats is not None else 0.0
+        if self._synced is None:
+            self._synced = anchor_starts(self.html, self.plan)
+        fragment = slice_section(self.html, section, self.plan, self._synced)
+        stage = _stage(
+            "parse_section",
+            section,
+            len(fragment if fragment is not None else self.html),
+            warnings,
+        )
+        try:
+            value = self._parse(section, fragment, warnings)
+        except BaseException as exc:
+            if stage is not None:
+                stage.end(error=exc)
+            raise
+        finally:
+            if self.stats is not None:
+                self.stats.section_seconds[section] = perf_counter() - start
+        if stage is not None:
+            stage.end(value)
+        return value
+
+    def _parse(self, section: str, fragment: Optional[str], warnings: list[str]) -> Any:
+        if fragment is None:
+            if self.engine == "sax":
+                return self._run_fragment(section, self.html, warnings)
+            return self._run(section, self.full(), warnings)
+
+        digest = _digest(fragment)
+        prev_print, prev_value = self.reusable.get(section, (None, None))
+        if (
+            prev_print is not None
+            and prev_print.digest == digest
+            # A log parsed without events cannot stand in for one with them
+            and (
+                section != "log"
+                or (getattr(prev_value, "events", None) is not None) == self.log_events
+            )
+        ):
+            warnings.extend(prev_print.warnings)
+            self.prints[section] = prev_print
+            if self.stats is not None:
+                self.stats.reused.append(section)
+            return prev_value
+
+        section_warnings: list[str] = []
+        slots: Optional[dict[int, bytes]] = None
+        if section == "monsters":
+            value, slots = self._parse_monsters(
+                fragment, prev_print, prev_value, section_warnings
+            )
+        else:
+            value = self._run_fragment(section, fragment, section_warnings)
+        warnings.extend(section_warnings)
+        self.prints[section] = _SectionPrint(digest, tuple(section_warnings), slots)
+        return value
+
+    def _parse_monsters(
+        self,
+        fragment: str,
+        prev_print: Optional[_SectionPrint],
+        prev_monsters: Optional[dict[int, Monster]],
+        warnings: list[str],
+    ) -> tuple[dict[int, Monster], Optional[dict[int, bytes]]]:
+        slots = slice_monster_slots(fragment, self.plan)
+        if not slots:
+            return self._run_fragment("monsters", fragment, warnings), None
+
+        digests = {idx: _digest(raw) for idx, raw in slots}
+        prev_slots = (prev_print.slots if prev_print else None) or {}
+        reused = prev_monsters or {}
+        changed = [
+            raw
+            for idx, raw in slots
+            if idx not in reused or prev_slots.get(idx) != digests[idx]
+        ]
+        parsed: dict[int, Monster] = {}
+        if changed:
+            m = self.plan.spec.monsters
+            pane = f'<{m.tag} id="{m.element_id}">' + "".join(changed) + f"</{m.tag}>"
+            parsed = self._run_fragment("monsters", pane, warnings)
+        monsters: dict[int, Monster] = {}
+        for idx, _ in slots:
+            monster = parsed.get(idx) or reused.get(idx)
+            if monster is not None:
+                monsters[idx] = monster
+        return monsters, digests
+
+
+class LazyBattleSnapshot(BattleSnapshot):
+    """BattleSnapshot whose sections are parsed on first attribute access.
+
+    Each section is parsed once and cached; ``warnings`` lists the warnings
+    of the sections filled in so far, in the same order as an eager parse.
+    Like pickling and copying, ``dataclasses.replace`` (and ``copy.replace``)
+    gives a plain, fully parsed ``BattleSnapshot``.
+    """
+
+    def __new__(cls, parser: Optional[_PageParser] = None, **fields: Any) -> Any:
+        if parser is None:
+            # dataclasses.replace() rebuilds through the class with field
+            # values; those make a plain BattleSnapshot (so __init__ is skipped)
+            return BattleSnapshot(**fields)
+        return super().__new__(cls)
+
+    def __init__(self, parser: _PageParser):
+        object.__setattr__(self, "_parser", parser)
+        object.__setattr__(self, "_section_prints", parser.prints)
+        object.__setattr__(self, "_section_warnings", {})
+        object.__setattr__(self, "_stats_recorder", parser.stats)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _SECTION_PARSERS:
+            section_warnings: dict[str, list[str]] = self._section_warnings
+            warnings: list[str] = []
+            value = self._parser.parse(name, warnings)
+            object.__setattr__(self, name, value)
+            section_warnings[name] = warnings
+            if len(section_warnings) == len(SECTIONS):
+                # Every section is filled in; the source is no longer needed
+                object.__setattr__(self, "_parser", None)
+                object.__setattr__(self, "warnings", self._collected_warnings())
+            return value
+        if name == "warnings":
+            return self._collected_warnings()
+        raise AttributeError(name)
+
+    def _collected_warnings(self) -> list[str]:
+        section_warnings: dict[str, list[str]] = self._section_warnings
+        return [w for s in SECTIONS for w in section_warnings.get(s, ())]
+
+    @property
+    def stats(self) -> Optional[ParseStats]:
+        """Stats for the sections parsed so far; ``elapsed_seconds`` sums them."""
+        recorder: Optional[_StatsRecorder] = self._stats_recorder
+        if recorder is None:
+            return None
+        return recorder.finish(len(self._collected_warnings()))
+
+    @property
+    def loaded_sections(self) -> frozenset[str]:
+        return frozenset(self._section_warnings)
+
+    def materialize(self) -> BattleSnapshot:
+        """Parse any remaining sections and return a plain BattleSnapshot."""
+        return BattleSnapshot(**{f.name: getattr(self, f.name) for f in fields(self)})
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BattleSnapshot):
+            return NotImplemented
+        return all(
+            getattr(self, f.name) == getattr(other, f.name) for f in fields(self)
+        )
+
+    def __reduce__(self):
+        # Pickles (and copies) as a plain, fully parsed BattleSnapshot
+        return (BattleSnapshot, tuple(getattr(self, f.name) for f in fields(self)))
+
+    def __replace__(self, **changes: Any) -> BattleSnapshot:
+        return replace(self.materialize(), **changes)
+
+
+def parse_snapshot(
+    html: str,
+    *,
+    backend: Optional[str] = None,
+    lazy: bool = False,
+    sections: Optional[Iterable[str]] = None,
+    previous: Optional[BattleSnapshot] = None,
+    log_cursor: Optional[LogCursor] = None,
+    log_events: bool = False,
+    plan: Optional[ExtractionPlan] = None,
+    engine: str = "soup",
+    collect_stats: bool = False,
+) -> BattleSnapshot:
     """Parse a HentaiVerse battle HTML string into a BattleSnapshot.
     This function never raises on missing sections; it fills defaults and records warnings.
-    """
-    soup = BeautifulSoup(html, "html.parser")
-    warnings: list[str] = []
 
-    player = replace(
-        parse_player_vitals(soup, warnings),
-        buffs=parse_player_buffs(soup, warnings),
+    ``backend`` names the BeautifulSoup tree builder (``"html.parser"``,
+    ``"lxml"`` or ``"html5lib"``); ``None`` uses the process-wide default
+    and an uninstalled builder falls back to ``"html.parser"``.
+    With ``lazy=True`` a ``LazyBattleSnapshot`` is returned and each section
+    is parsed when first read.
+    ``sections`` limits parsing to a subset of ``SECTIONS`` (e.g.
+    ``{"monsters", "player"}``); the others keep their typed empty defaults
+    and their part of the page is never parsed.
+    ``previous`` is the snapshot of an earlier page from the same battle:
+    sections whose raw pane HTML is unchanged (and unchanged monster slots)
+    reuse its already-built objects instead of being parsed again.
+    ``log_cursor`` makes the log incremental: only the ``textlog`` rows that
+    are new since the cursor's last page are read, and ``log.lines`` holds
+    the battle log the cursor has accumulated.
+    ``log_events=True`` also fills ``log.events`` with the typed events
+    (damage, heals, effects, defeats, item use, casts) found in the log.
+    ``plan`` is a compiled ``ExtractionPlan`` for a different page layout
+    (see ``LayoutSpec``/``compile_plan``); ``None`` uses ``DEFAULT_PLAN``.
+    ``engine="fast"`` reads each section straight from its raw HTML with
+    string scanners instead of building trees, falling back to the
+    BeautifulSoup parsers for any pane whose markup it does not recognise;
+    the snapshot is the same as with the default ``"soup"`` engine.
+    ``engine="sax"`` streams each fragment through ``html.parser`` events,
+    keeping only the elements inside the panes it reads, and never builds a
+    tree; it gives the same snapshot as ``"soup"`` with ``html.parser``.
+    ``collect_stats=True`` attaches a ``ParseStats`` summary (source length
+    and hash, elapsed time, warning count, tree build time and node count,
+    per-section and per-parser times) as ``snap.stats``; otherwise
+    ``snap.stats`` is ``None``.
+    """
+    start = perf_counter() if collect_stats else 0.0
+    engine = _check_engine(engine)
+    stats = _StatsRecorder(html, engine) if collect_stats else None
+    parser = _PageParser(
+        html,
+        resolve_backend(backend),
+        _select_sections(sections),
+        previous,
+        log_cursor,
+        log_events,
+        plan if plan is not None else DEFAULT_PLAN,
+        engine,
+        stats,
     )
+    warnings: list[str] = []
+    stage = _stage("parse_snapshot", None, len(html), warnings)
+    if lazy:
+        lazy_snap = LazyBattleSnapshot(parser)
+        if stage is not None:
+            # Sections report their own spans as they are read
+            stage.end()
+        return lazy_snap
+    try:
+        parsed = {section: parser.parse(section, warnings) for section in SECTIONS}
+    except BaseException as exc:
+        if stage is not None:
+            stage.end(error=exc)
+        raise
 
-    abilities = parse_abilities(soup, warnings)
-    monsters = parse_monsters(soup, warnings)
-    clog = parse_log(soup, warnings)
-    items = parse_items(soup, warnings)
-
-    return BattleSnapshot(
-        player=player,
-        abilities=abilities,
-        monsters=monsters,
-        log=clog,
-        items=items,
+    snap = BattleSnapshot(
+        player=parsed["player"],
+        abilities=parsed["abilities"],
+        monsters=parsed["monsters"],
+        log=parsed["log"],
+        items=parsed["items"],
         warnings=warnings,
     )
+    object.__setattr__(snap, "_section_prints", parser.prints)
+    if stats is not None:
+        object.__setattr__(
+            snap, "_stats", stats.finish(len(warnings), perf_counter() - start)
+        )
+    if stage is not None:
+        stage.end(snap)
+    return snap
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class ParseStats:
+    """Parse summary attached by ``parse_snapshot(html, collect_stats=True)``.
+
+    Times are in seconds. ``section_seconds`` is the wall time of each
+    parsed snapshot section (slicing, tree building and extraction);
+    ``parser_seconds`` the time spent inside each BeautifulSoup section
+    parser (``parse_player_vitals`` ... ``parse_items``) and
+    ``build_seconds`` building their trees. Sections read by the ``"fast"``
+    or ``"sax"`` engines only show up in ``section_seconds``.
+    """
+
+    source_length: int
+    source_hash: str
+    engine: str
+    elapsed_seconds: float
+    warning_count: int
+    build_seconds: float = 0.0
+    # Elements in the BeautifulSoup trees built for this page
+    node_count: int = 0
+    section_seconds: dict[str, float] = field(default_factory=dict)
+    parser_seconds: dict[str, float] = field(default_factory=dict)
+    # Sections carried over from ``previous`` without parsing
+    reused_sections: tuple[str, ...] = ()
+
+    @property
+    def slowest_section(self) -> Optional[str]:
+        if not self.section_seconds:
+            return None
+        return max(self.section_seconds, key=self.section_seconds.__getitem__)
+
+
+def _source_hash(html: str) -> str:
+    return blake2b(html.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _StatsRecorder:
+    """Mutable timings gathered while one page is parsed."""
+
+    __slots__ = (
+        "html",
+        "engine",
+        "build_seconds",
+        "node_count",
+        "section_seconds",
+        "parser_seconds",
+        "reused",
+        "_hash",
+    )
+
+    def __init__(self, html: str, engine: str):
+        self.html = html
+        self.engine = engine
+        self.build_seconds = 0.0
+        self.node_count = 0
+        self.section_seconds: dict[str, float] = {}
+        self.parser_seconds: dict[str, float] = {}
+        self.reused: list[str] = []
+        self._hash: Optional[str] = None
+
+    def call(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.parser_seconds[name] = (
+                self.parser_seconds.get(name, 0.0) + perf_counter() - start
+            )
+
+    def finish(self, warning_count: int, elapsed: Optional[float] = None) -> ParseStats:
+        if self._hash is None:
+            self._hash = _source_hash(self.html)
+        return ParseStats(
+            source_length=len(self.html),
+            source_hash=self._hash,
+            engine=self.engine,
+            elapsed_seconds=(
+                elapsed if elapsed is not None else sum(self.section_seconds.values())
+            ),
+            warning_count=warning_count,
+            build_seconds=self.build_seconds,
+            node_count=self.node_count,
+            section_seconds=dict(self.section_seconds),
+            parser_seconds=dict(self.parser_seconds),
+            reused_sections=tuple(self.reused),
+        )
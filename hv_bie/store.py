@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import IO, Iterator, NamedTuple, Optional, Union
+
+from . import codec
+from .codec import CodecError, SnapshotDecoder, SnapshotEncoder
+from .types.models import BattleSnapshot
+
+# Data file: MAGIC, version byte, then records of (body length, CRC-32 of
+# body, body); a body is the battle id, the round and one SnapshotEncoder
+# chunk. Index file (path + ".idx"): MAGIC, version byte, then one entry per
+# record. Records of a battle are grouped into blocks sharing a codec string
+# table; the first record of a block starts a new codec stream.
+MAGIC = b"HVBH"
+INDEX_MAGIC = b"HVBI"
+VERSION = 1
+
+_HEADER = len(MAGIC) + 1
+_RECORD = struct.Struct("<II")
+_BODY = struct.Struct("<qH")
+# offset, record length, round, block start flag, battle id length
+_ENTRY = struct.Struct("<QIqBH")
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+class StoreError(ValueError):
+    """Raised for a file that is not an hv_bie history store."""
+
+
+class IndexEntry(NamedTuple):
+    battle_id: str
+    round: int
+    offset: int
+    length: int
+    block_start: bool
+
+
+class _Battle:
+    __slots__ = ("entries", "rounds", "blocks", "encoder", "block_count")
+
+    def __init__(self) -> None:
+        self.entries: list[IndexEntry] = []
+        # Parallel to entries: round numbers (non-decreasing) and the
+        # position of the entry that starts each record's block
+        self.rounds: list[int] = []
+        self.blocks: list[int] = []
+        # Open block of this writer; reopened stores start a new one
+        self.encoder: Optional[SnapshotEncoder] = None
+        self.block_count = 0
+
+    def add(self, entry: IndexEntry) -> None:
+        position = len(self.entries)
+        self.blocks.append(
+            position if entry.block_start or not self.blocks else self.blocks[-1]
+        )
+        self.entries.append(entry)
+        self.rounds.append(entry.round)
+
+
+def _pack_entry(entry: IndexEntry) -> bytes:
+    raw = entry.battle_id.encode("utf-8")
+    return (
+        _ENTRY.pack(
+            entry.offset, entry.length, entry.round, entry.block_start, len(raw)
+        )
+        + raw
+    )
+
+
+def _unpack_body(data: Union[bytes, mmap.mmap], pos: int) -> tuple[str, int, int]:
+    """Battle id, round and codec chunk position of the body at ``pos``."""
+    round_, size = _BODY.unpack_from(data, pos)
+    start = pos + _BODY.size
+    return bytes(data[start : start + size]).decode("utf-8"), round_, start + size
+
+
+class HistoryStore:
+    """Append-only file of battle snapshots with a (battle, round) index.
+
+    ``append(battle_id, snap)`` writes one encoded snapshot under the
+    battle's current round (``snap.log.current_round``, or ``round=``);
+    rounds may repeat, one record per turn, but must not go backwards.
+    Records of a battle share a codec string table in blocks of up to
+    ``block_size``, so ``get()`` decodes at most one block and ``scan()``
+    streams the requested rounds, both reading the data file through
+    ``mmap`` and the in-memory index instead of loading the file. Larger
+    blocks write smaller files; ``block_size=1`` makes every record
+    self-contained and lookups fastest.
+
+    The index is kept in ``path + ".idx"`` and rebuilt from the data file
+    when missing or behind. Opening a store after an unclean exit truncates
+    a torn or corrupt final record (and any index entries past it).
+    ``sync=True`` fsyncs both files after every append.
+    """
+
+    def __init__(self, path: PathLike, *, block_size: int = 16, sync: bool = False):
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.path = os.fspath(path)
+        self.index_path = self.path + ".idx"
+        self.block_size = block_size
+        self.sync = sync
+        self._battles: dict[str, _Battle] = {}
+        self._count = 0
+        self._map: Optional[mmap.mmap] = None
+        self._size = self._recover()
+        # Held open for appends for the store's lifetime; closed in close()
+        self._data: IO[bytes] = open(self.path, "ab")  # noqa: SIM115
+        self._index: IO[bytes] = open(self.index_path, "ab")  # noqa: SIM115
+
+    # -- opening and recovery ------------------------------------------------
+
+    def _recover(self) -> int:
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as f:
+                f.write(MAGIC + bytes([VERSION]))
+            with open(self.index_path, "wb") as f:
+                f.write(INDEX_MAGIC + bytes([VERSION]))
+            return _HEADER
+
+        with open(self.path, "rb") as f:
+            header = f.read(_HEADER)
+            if header[: len(MAGIC)] != MAGIC:
+                raise StoreError(f"{self.path} is not an hv_bie history store")
+            if header[len(MAGIC) :] != bytes([VERSION]):
+                raise StoreError(
+                    f"unsupported history store version {header[len(MAGIC) :]!r}"
+                )
+            size = os.fstat(f.fileno()).st_size
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            indexed = self._read_index(size)
+            # The last indexed record may have reached the index but not
+            # the disk; check it before trusting the index
+            while indexed and not self._valid(data, indexed[-1][0].offset, size):
+                indexed.pop()
+            last = indexed[-1][0] if indexed else None
+            end = last.offset + last.length if last is not None else _HEADER
+            rebuilt = []
+            while end < size and self._valid(data, end, size):
+                length = _RECORD.unpack_from(data, end)[0] + _RECORD.size
+                battle_id, round_, chunk = _unpack_body(data, end + _RECORD.size)
+                block_start = data[chunk : chunk + len(codec.MAGIC)] == codec.MAGIC
+                rebuilt.append(IndexEntry(battle_id, round_, end, length, block_start))
+                end += length
+        finally:
+            data.close()
+
+        if end < size:
+            # Torn or corrupt tail left by an unclean exit
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+        with open(self.index_path, "r+b" if indexed else "wb") as f:
+            if indexed:
+                f.truncate(indexed[-1][1])
+                f.seek(0, os.SEEK_END)
+            else:
+                f.write(INDEX_MAGIC + bytes([VERSION]))
+            for entry in rebuilt:
+                f.write(_pack_entry(entry))
+        for entry, _ in indexed:
+            self._add(entry)
+        for entry in rebuilt:
+            self._add(entry)
+        return end
+
+    def _read_index(self, size: int) -> list[tuple[IndexEntry, int]]:
+        """Entries (and their end in the index file) for records within ``size``."""
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+        if raw[:_HEADER] != INDEX_MAGIC + bytes([VERSION]):
+            # Unreadable index: rebuild it from the data file
+            return []
+        indexed: list[tuple[IndexEntry, int]] = []
+        pos = _HEADER
+        while pos + _ENTRY.size <= len(raw):
+            offset, length, round_, block, id_len = _ENTRY.unpack_from(raw, pos)
+            end = pos + _ENTRY.size + id_len
+            if end > len(raw) or offset + length > size:
+                break
+            battle_id = raw[pos + _ENTRY.size : end].decode("utf-8")
+            entry = IndexEntry(battle_id, round_, offset, length, bool(block))
+            indexed.append((entry, end))
+            pos = end
+        return indexed
+
+    @staticmethod
+    def _valid(data: mmap.mmap, offset: int, size: int) -> bool:
+        if offset + _RECORD.size > size:
+            return False
+        length, crc = _RECORD.unpack_from(data, offset)
+        start = offset + _RECORD.size
+        if start + length > size:
+            return False
+        return zlib.crc32(data[start : start + length]) == crc
+
+    def _add(self, entry: IndexEntry) -> None:
+        battle = self._battles.get(entry.battle_id)
+        if battle is None:
+            battle = self._battles[entry.battle_id] = _Battle()
+        battle.add(entry)
+        self._count += 1
+
+    # -- writing -------------------------------------------------------------
+
+    def append(
+        self, battle_id: str, snap: BattleSnapshot, round: Optional[int] = None
+    ) -> IndexEntry:
+        """Append ``snap``; without a round in its log it joins the latest one."""
+        battle = self._battles.get(battle_id)
+        if round is None:
+            round = snap.log.current_round
+        if round is None:
+            round = battle.rounds[-1] if battle is not None and battle.rounds else 0
+        if battle is not None and battle.rounds and round < battle.rounds[-1]:
+            raise ValueError(
+                f"round {round} is before round {battle.rounds[-1]} of {battle_id!r}"
+            )
+        if battle is None:
+            battle = self._battles[battle_id] = _Battle()
+        block_start = battle.encoder is None or battle.block_count >= self.block_size
+        if block_start:
+            battle.encoder = SnapshotEncoder()
+            battle.block_count = 0
+        assert battle.encoder is not None
+        chunk = battle.encoder.encode(snap)
+        raw_id = battle_id.encode("utf-8")
+        body = _BODY.pack(round, len(raw_id)) + raw_id + chunk
+        record = _RECORD.pack(len(body), zlib.crc32(body)) + body
+
+        entry = IndexEntry(battle_id, round, self._size, len(record), block_start)
+        # Data before index, so a crash never leaves an entry without a record
+        self._data.write(record)
+        self._data.flush()
+        self._index.write(_pack_entry(entry))
+        self._index.flush()
+        if self.sync:
+            os.fsync(self._data.fileno())
+            os.fsync(self._index.fileno())
+        self._size += len(record)
+        battle.block_count += 1
+        battle.add(entry)
+        self._count += 1
+        return entry
+
+    # -- reading -------------------------------------------------------------
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None or len(self._map) < self._size:
+            if self._map is not None:
+                self._map.close()
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def _decode(
+        self, data: mmap.mmap, decoder: SnapshotDecoder, entry: IndexEntry
+    ) -> BattleSnapshot:
+        _, _, chunk = _unpack_body(data, entry.offset + _RECORD.size)
+        snaps = list(decoder.decode(data[chunk : entry.offset + entry.length]))
+        if len(snaps) != 1:
+            raise CodecError(f"expected one snapshot at offset {entry.offset}")
+        return snaps[0]
+
+    def _records(
+        self, battle: _Battle, first: int, stop: int
+    ) -> Iterator[tuple[IndexEntry, BattleSnapshot]]:
+        """Decode ``battle.entries[first:stop]``, starting at ``first``'s block."""
+        data = self._mapped()
+        decoder = SnapshotDecoder()
+        for position in range(battle.blocks[first], stop):
+            entry = battle.entries[position]
+            if entry.block_start:
+                decoder = SnapshotDecoder()
+            snap = self._decode(data, decoder, entry)
+            if position >= first:
+                yield entry, snap
+
+    def get(self, battle_id: str, round: int) -> Optional[BattleSnapshot]:
+        """Last snapshot stored for ``round`` of the battle, if any."""
+        battle = self._battles.get(battle_id)
+        if battle is None:
+            return None
+        stop = bisect_right(battle.rounds, round)
+        if stop == 0 or battle.rounds[stop - 1] != round:
+            return None
+        snap = None
+        for _, snap in self._records(battle, stop - 1, stop):
+            pass
+        return snap
+
+    def scan(
+        self,
+        battle_id: str,
+        start: Optional[int] = None,
+        stop: Optional[int] = None,
+    ) -> Iterator[tuple[int, BattleSnapshot]]:
+        """Yield ``(round, snapshot)`` for every record with ``start <= round < stop``."""
+        battle = self._battles.get(battle_id)
+        if battle is None:
+            return
+        first = bisect_left(battle.rounds, start) if start is not None else 0
+        end = (
+            bisect_left(battle.rounds, stop) if stop is not None else len(battle.rounds)
+        )
+        if first >= end:
+            return
+        for entry, snap in self._records(battle, first, end):
+            yield entry.round, snap
+
+    def battles(self) -> list[str]:
+        return list(self._battles)
+
+    def rounds(self, battle_id: str) -> list[int]:
+        """Distinct rounds stored for the battle, in order."""
+        battle = self._battles.get(battle_id)
+        return sorted(set(battle.rounds)) if battle is not None else []
+
+    def entries(self, battle_id: str) -> list[IndexEntry]:
+        battle = self._battles.get(battle_id)
+        return list(battle.entries) if battle is not None else []
+
+    def __len__(self) -> int:
+        return self._count
+
+    # -- lifetime ------------------------------------------------------------
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self) -> HistoryStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
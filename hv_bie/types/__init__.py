@@ -6,6 +6,7 @@ from .models import (
     CombatLog,
     Item,
     ItemsState,
+    LogEvents,
     Monster,
     PlayerState,
     QuickSlot,
@@ -17,6 +18,7 @@ __all__ = [
     "AbilitiesState",
     "PlayerState",
     "Monster",
+    "LogEvents",
     "CombatLog",
     "Item",
     "QuickSlot",
@@ -1,19 +1,58 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass, field
-from typing import Optional
+import math
+from dataclasses import dataclass, field
+from typing import Any, Optional
 
+from ..serialization import SHORT_KEYS, dumps, to_dict
+from ..stats import ParseStats
 
-@dataclass(frozen=True)
-class Buff:
+
+class _FromJson:
+    """``from_json`` for models that define ``from_dict``."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_json(cls, text: str | bytes) -> Any:
+        return cls.from_dict(json.loads(text))  # type: ignore[attr-defined]
+
+
+_LONG_KEYS: dict[str, str] = {short: name for name, short in SHORT_KEYS.items()}
+
+
+def _long_keys(d: dict[str, Any], probe: str) -> dict[str, Any]:
+    # Compact output (to_json(compact=True)) names fields by SHORT_KEYS; only
+    # a model's own keys are renamed, never buff, ability or item names
+    if probe in d:
+        return d
+    return {_LONG_KEYS.get(k, k): v for k, v in d.items()}
+
+
+def _turns(value: Optional[float]) -> float:
+    # to_json writes infinite (permanent) durations as null
+    return math.inf if value is None else float(value)
+
+
+@dataclass(frozen=True, slots=True)
+class Buff(_FromJson):
     name: str
     remaining_turns: float
     is_permanent: bool
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Buff:
+        d = _long_keys(d, "name")
+        return Buff(d["name"], _turns(d["remaining_turns"]), d["is_permanent"])
 
-@dataclass(frozen=True)
-class Ability:
+
+def _buffs(d: dict[str, Any]) -> dict[str, Buff]:
+    return {k: Buff.from_dict(v) for k, v in d.items()}
+
+
+@dataclass(frozen=True, slots=True)
+class Ability(_FromJson):
     name: str
     element_id: str
     available: bool
@@ -21,15 +60,35 @@ class Ability:
     cost_type: Optional[str]
     cooldown_turns: int
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Ability:
+        d = _long_keys(d, "name")
+        return Ability(
+            d["name"],
+            d["element_id"],
+            d["available"],
+            d["cost"],
+            d["cost_type"],
+            d["cooldown_turns"],
+        )
 
-@dataclass(frozen=True)
-class AbilitiesState:
+
+@dataclass(frozen=True, slots=True)
+class AbilitiesState(_FromJson):
     skills: dict[str, Ability] = field(default_factory=dict)
     spells: dict[str, Ability] = field(default_factory=dict)
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> AbilitiesState:
+        d = _long_keys(d, "skills")
+        return AbilitiesState(
+            {k: Ability.from_dict(v) for k, v in d["skills"].items()},
+            {k: Ability.from_dict(v) for k, v in d["spells"].items()},
+        )
 
-@dataclass(frozen=True)
-class PlayerState:
+
+@dataclass(frozen=True, slots=True)
+class PlayerState(_FromJson):
     hp_percent: float = 0.0
     hp_value: int = 0
     mp_percent: float = 0.0
@@ -39,9 +98,23 @@ class PlayerState:
     overcharge_value: int = 0
     buffs: dict[str, Buff] = field(default_factory=dict)
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> PlayerState:
+        d = _long_keys(d, "hp_percent")
+        return PlayerState(
+            d["hp_percent"],
+            d["hp_value"],
+            d["mp_percent"],
+            d["mp_value"],
+            d["sp_percent"],
+            d["sp_value"],
+            d["overcharge_value"],
+            _buffs(d["buffs"]),
+        )
 
-@dataclass(frozen=True)
-class Monster:
+
+@dataclass(frozen=True, slots=True)
+class Monster(_FromJson):
     slot_index: int
     name: str
     alive: bool
@@ -51,36 +124,115 @@ class Monster:
     sp_percent: float
     buffs: dict[str, Buff] = field(default_factory=dict)
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Monster:
+        d = _long_keys(d, "slot_index")
+        return Monster(
+            d["slot_index"],
+            d["name"],
+            d["alive"],
+            d["system_monster_type"],
+            d["hp_percent"],
+            d["mp_percent"],
+            d["sp_percent"],
+            _buffs(d["buffs"]),
+        )
 
-@dataclass(frozen=True)
-class CombatLog:
+
+@dataclass(frozen=True, slots=True)
+class LogEvents(_FromJson):
+    """Typed combat-log events as parallel columns, one entry per event.
+
+    ``source``/``target`` are ``"you"`` for the player and empty when the
+    line names neither; ``amount`` is 0 for events without a number;
+    ``detail`` holds the damage type, restored resource, effect, item or
+    spell name; ``line_index`` points into ``CombatLog.lines``.
+    """
+
+    kinds: list[str] = field(default_factory=list)
+    sources: list[str] = field(default_factory=list)
+    targets: list[str] = field(default_factory=list)
+    amounts: list[int] = field(default_factory=list)
+    details: list[str] = field(default_factory=list)
+    line_index: list[int] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> LogEvents:
+        d = _long_keys(d, "kinds")
+        return LogEvents(
+            list(d["kinds"]),
+            list(d["sources"]),
+            list(d["targets"]),
+            list(d["amounts"]),
+            list(d["details"]),
+            list(d["line_index"]),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CombatLog(_FromJson):
     lines: list[str] = field(default_factory=list)
     current_round: Optional[int] = None
     total_round: Optional[int] = None
+    events: Optional[LogEvents] = None
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> CombatLog:
+        d = _long_keys(d, "lines")
+        events = d.get("events")
+        return CombatLog(
+            list(d["lines"]),
+            d["current_round"],
+            d["total_round"],
+            LogEvents.from_dict(events) if events is not None else None,
+        )
 
-@dataclass(frozen=True)
-class Item:
+
+@dataclass(frozen=True, slots=True)
+class Item(_FromJson):
     slot: str | int
     name: str
     element_id: str
     available: bool
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> Item:
+        d = _long_keys(d, "slot")
+        return Item(d["slot"], d["name"], d["element_id"], d["available"])
 
-@dataclass(frozen=True)
-class QuickSlot:
+
+@dataclass(frozen=True, slots=True)
+class QuickSlot(_FromJson):
     slot: str | int
     name: str
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> QuickSlot:
+        d = _long_keys(d, "slot")
+        return QuickSlot(d["slot"], d["name"])
 
-@dataclass(frozen=True)
-class ItemsState:
+
+@dataclass(frozen=True, slots=True)
+class ItemsState(_FromJson):
     items: dict[str, Item] = field(default_factory=dict)
     quickbar: list[QuickSlot] = field(default_factory=list)
 
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> ItemsState:
+        d = _long_keys(d, "items")
+        return ItemsState(
+            {k: Item.from_dict(v) for k, v in d["items"].items()},
+            [QuickSlot.from_dict(q) for q in d["quickbar"]],
+        )
+
 
+# Not slotted: snapshots carry hidden per-instance parse state (section
+# digests) and LazyBattleSnapshot fills its fields in after construction
 @dataclass(frozen=True)
-class BattleSnapshot:
+class BattleSnapshot(_FromJson):
     player: PlayerState
     abilities: AbilitiesState
     monsters: dict[int, Monster]
@@ -89,7 +241,30 @@ class BattleSnapshot:
     warnings: list[str] = field(default_factory=list)
 
     def as_dict(self) -> dict:
-        return asdict(self)
+        return to_dict(self)
+
+    def to_json(self, *, compact: bool = False) -> str:
+        return dumps(self, compact=compact)
+
+    @property
+    def stats(self) -> Optional[ParseStats]:
+        """Parse summary, when parsed with ``collect_stats=True``."""
+        return vars(self).get("_stats")
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> BattleSnapshot:
+        """Rebuild a snapshot from ``as_dict()`` or parsed ``to_json()`` output.
 
-    def to_json(self) -> str:
-        return json.dumps(self.as_dict(), ensure_ascii=False)
+        Monster slot keys may be strings (as in JSON), ``null`` buff
+        durations are restored to ``inf`` and ``to_json(compact=True)``
+        short keys are mapped back to field names.
+        """
+        d = _long_keys(d, "player")
+        return BattleSnapshot(
+            PlayerState.from_dict(d["player"]),
+            AbilitiesState.from_dict(d["abilities"]),
+            {int(k): Monster.from_dict(v) for k, v in d["monsters"].items()},
+            CombatLog.from_dict(d["log"]),
+            ItemsState.from_dict(d["items"]),
+            list(d["warnings"]),
+        )
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import gc
+import os
+import tracemalloc
+from pathlib import Path
+
+from hv_bie import parse_snapshot
+
+FIX = Path(__file__).resolve().parents[1] / "fixtures" / "hv"
+
+
+def _retained_bytes_per_snapshot(htmls: list[str], copies: int) -> float:
+    parse_snapshot(htmls[0])  # warm caches and lazy imports outside the trace
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        kept = [parse_snapshot(html) for _ in range(copies) for html in htmls]
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - base
+    finally:
+        tracemalloc.stop()
+    return retained / len(kept)
+
+
+def test_snapshot_memory_footprint():
+    # Config: allow overriding via env var; ~22.7 KB before slots + interning
+    copies = int(os.getenv("NFR_MEM_COPIES", "3"))
+    threshold = float(os.getenv("NFR_MEM_BYTES", "16384"))
+
+    htmls = [p.read_text(encoding="utf-8") for p in sorted(FIX.glob("*.htm*"))]
+    per_snapshot = _retained_bytes_per_snapshot(htmls, copies)
+    print(f"retained {per_snapshot:.0f} bytes per snapshot")
+
+    message = f"snapshot footprint {per_snapshot:.0f} B > {threshold:.0f} B"
+    assert per_snapshot <= threshold, f"{message} (copies={copies})"
+
+
+def test_session_memory_stays_flat():
+    from hv_bie import BattleSession
+    from hv_bie.parsers.slicing import find_element
+
+    html = (FIX / "The HentaiVerse4.htm").read_text(encoding="utf-8")
+    health = 'nbargreen.png" style="width:106px" alt="health"'
+    panes = []
+    for i in range(100):
+        page = html.replace(health, health.replace("106px", f"{106 - i}px"), 1)
+        start, end = find_element(page, "div", "pane_monster")
+        panes.append({"pane_monster": page[start:end]})
+
+    session = BattleSession(keyframe_interval=32, max_turns=64)
+    session.feed(html)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        usage = []
+        for _ in range(4):
+            for fragments in panes:
+                session.feed_fragments(fragments)
+            gc.collect()
+            usage.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+    print(f"session memory after each 100 turns: {usage}")
+
+    assert len(session) < 64 + 32
+    # Only the retention window (64 to 95 turns) is held, whatever the total
+    assert max(usage) < 1.5 * min(usage)
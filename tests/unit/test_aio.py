@@ -0,0 +1,62 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from hv_bie import AsyncParser, LogCursor, parse_snapshot, parse_snapshot_async
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def pages() -> list[str]:
+    return [(FIX / name).read_text(encoding="utf-8") for name in FIXTURES]
+
+
+def test_parse_snapshot_async_matches_sync():
+    html = pages()[0]
+    assert asyncio.run(parse_snapshot_async(html)) == parse_snapshot(html)
+
+
+def test_async_parser_bounds_concurrency_and_keeps_loop_responsive():
+    html = pages()
+
+    async def main():
+        ticks = 0
+        done = False
+
+        async def heartbeat():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async with AsyncParser(max_concurrency=2) as parser:
+            beat = asyncio.create_task(heartbeat())
+            snaps = await asyncio.gather(
+                *(parser.parse(h, sections={"monsters"}) for h in html)
+            )
+            done = True
+            await beat
+        return snaps, ticks
+
+    snaps, ticks = asyncio.run(main())
+    assert snaps == [parse_snapshot(h, sections={"monsters"}) for h in html]
+    assert ticks > len(html)
+
+
+def test_async_parser_process_executor():
+    html = pages()[:2]
+
+    async def main():
+        async with AsyncParser("process", max_workers=2) as parser:
+            with pytest.raises(ValueError):
+                await parser.parse(html[0], log_cursor=LogCursor())
+            return await asyncio.gather(*(parser.parse(h) for h in html))
+
+    assert asyncio.run(main()) == [parse_snapshot(h) for h in html]
+
+
+def test_unknown_executor():
+    with pytest.raises(ValueError):
+        AsyncParser("fiber")
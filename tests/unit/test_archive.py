@@ -0,0 +1,68 @@
+import gzip
+import json
+import tarfile
+import zipfile
+from pathlib import Path
+
+from hv_bie import iter_pages, iter_snapshots, parse_snapshot
+from hv_bie.archive import UnreadablePage
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def read_fixture(name: str) -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def test_directory_pages_are_read_in_order():
+    pages = list(iter_pages(FIX))
+    assert [Path(sid).name for sid, _ in pages] == FIXTURES
+    assert all(html == read_fixture(Path(sid).name) for sid, html in pages)
+
+
+def test_zip_and_tar_archives(tmp_path):
+    zpath = tmp_path / "pages.zip"
+    with zipfile.ZipFile(zpath, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name in FIXTURES[:3]:
+            zf.write(FIX / name, f"battle/{name}")
+        zf.writestr("battle/notes.txt", "not a page")
+    tpath = tmp_path / "pages.tar.gz"
+    with tarfile.open(tpath, "w:gz") as tf:
+        for name in FIXTURES[:3]:
+            tf.add(FIX / name, f"battle/{name}")
+
+    for archive in (zpath, tpath):
+        got = list(iter_snapshots(archive, workers=1))
+        assert [sid for sid, _ in got] == [
+            f"{archive}!battle/{name}" for name in FIXTURES[:3]
+        ]
+        assert [snap for _, snap in got] == [
+            parse_snapshot(read_fixture(name)) for name in FIXTURES[:3]
+        ]
+
+
+def test_jsonl_dump(tmp_path):
+    path = tmp_path / "dump.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(json.dumps({"id": "b1-r3", "html": read_fixture(FIXTURES[0])}) + "\n")
+        f.write("\n")
+        f.write(json.dumps({"html": "<div></div>"}) + "\n")
+        f.write("{broken\n")
+        f.write(json.dumps({"id": "b1-r4", "page": "<div></div>"}) + "\n")
+
+    got = dict(iter_snapshots(path, workers=1, sections={"monsters"}))
+    assert list(got) == ["b1-r3", f"{path}:3", f"{path}:4", "b1-r4"]
+    assert got["b1-r3"] == parse_snapshot(
+        read_fixture(FIXTURES[0]), sections={"monsters"}
+    )
+    # A readable page with nothing on it only has the parser's warnings
+    assert "pane_monster not found" in got[f"{path}:3"].warnings
+    # Unreadable records say so instead of looking like empty pages
+    (broken,) = got[f"{path}:4"].warnings
+    assert broken.startswith("unreadable record: invalid JSON")
+    assert got["b1-r4"].warnings == ["unreadable record: no 'html' field"]
+
+    pages = dict(iter_pages(path))
+    assert isinstance(pages[f"{path}:4"], UnreadablePage)
+    assert pages[f"{path}:4"] == ""
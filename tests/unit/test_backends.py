@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+import hv_bie
+from hv_bie import parse_snapshot
+from hv_bie.parsers import backends
+from hv_bie.parsers.backends import BACKENDS, available_backends, resolve_backend
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("name", FIXTURES)
+def test_backend_conformance(backend, name):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} not installed")
+    html = (FIX / name).read_text(encoding="utf-8")
+    assert parse_snapshot(html, backend=backend) == parse_snapshot(
+        html, backend="html.parser"
+    )
+
+
+def test_default_backend_is_process_wide(monkeypatch):
+    monkeypatch.setattr(backends, "_default_backend", "html.parser")
+    hv_bie.set_default_backend("html5lib")
+    assert hv_bie.get_default_backend() == "html5lib"
+    assert resolve_backend() in {"html5lib", "html.parser"}
+    with pytest.raises(ValueError):
+        hv_bie.set_default_backend("selectolax")
+    assert hv_bie.get_default_backend() == "html5lib"
+
+
+def test_missing_backend_falls_back(monkeypatch):
+    monkeypatch.setattr(backends, "_installed", lambda name: name == "html.parser")
+    assert resolve_backend("lxml") == "html.parser"
+    html = (FIX / "The HentaiVerse.htm").read_text(encoding="utf-8")
+    assert parse_snapshot(html, backend="lxml").warnings == []
+
+
+def test_unknown_env_backend_warns_and_falls_back(monkeypatch):
+    monkeypatch.setenv("HV_BIE_BACKEND", "lxm")
+    with pytest.warns(RuntimeWarning, match="HV_BIE_BACKEND.*'lxm'"):
+        assert backends._env_backend() == "html.parser"
+    monkeypatch.setenv("HV_BIE_BACKEND", "html5lib")
+    assert backends._env_backend() == "html5lib"
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from hv_bie import parse_many, parse_many_keyed, parse_snapshot
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def pages() -> list[str]:
+    return [(FIX / name).read_text(encoding="utf-8") for name in FIXTURES]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parse_many_matches_parse_snapshot_in_order(workers):
+    html = pages()
+    snaps = list(parse_many(iter(html), workers=workers, chunksize=2))
+    assert snaps == [parse_snapshot(h) for h in html]
+
+
+def test_parse_many_keyed_unordered_and_options():
+    html = pages()
+    pairs = [(name, h) for name, h in zip(FIXTURES, html)]
+    got = dict(
+        parse_many_keyed(
+            pairs, workers=2, chunksize=1, ordered=False, sections="monsters"
+        )
+    )
+    assert got.keys() == set(FIXTURES)
+    for name, h in pairs:
+        assert got[name] == parse_snapshot(h, sections={"monsters"})
+
+
+def test_failed_page_becomes_warning():
+    snaps = list(parse_many(["<div></div>", None], workers=2))  # type: ignore[list-item]
+    assert len(snaps) == 2
+    assert "pane_monster not found" in snaps[0].warnings
+    assert snaps[1].monsters == {}
+    assert snaps[1].warnings[0].startswith("parse failed: ")
+
+
+def test_chunksize_must_be_positive():
+    with pytest.raises(ValueError):
+        list(parse_many([], chunksize=0))
@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import pytest
+
+from hv_bie import LogCursor, SnapshotCache, parse_snapshot
+from hv_bie.cache import snapshot_nbytes
+from hv_bie.parsers import DEFAULT_PLAN, backends
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def pages() -> list[str]:
+    return [(FIX / name).read_text(encoding="utf-8") for name in FIXTURES]
+
+
+def test_hit_returns_the_same_snapshot():
+    html = pages()[0]
+    cache = SnapshotCache()
+    first = cache.parse(html)
+    # An equal but distinct string hits too
+    again = cache.parse("".join(list(html)))
+    assert again is first
+    assert first == parse_snapshot(html)
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+
+def test_options_are_part_of_the_key():
+    html = pages()[0]
+    cache = SnapshotCache()
+    full = cache.parse(html)
+    only = cache.parse(html, sections={"monsters"})
+    assert only is not full
+    assert only == parse_snapshot(html, sections={"monsters"})
+    assert cache.parse(html, sections=["monsters"]) is only
+    assert cache.info().misses == 2
+
+
+def test_explicit_default_options_hit_the_same_entry():
+    html = pages()[0]
+    cache = SnapshotCache()
+    first = cache.parse(html)
+    defaults = dict(
+        backend=None,
+        lazy=False,
+        sections=None,
+        previous=None,
+        log_cursor=None,
+        log_events=False,
+        plan=None,
+        engine="soup",
+        collect_stats=False,
+    )
+    assert cache.parse(html, **defaults) is first
+    assert cache.parse(html, plan=DEFAULT_PLAN) is first
+    assert cache.info().hits == 2
+
+
+def test_key_uses_the_resolved_backend(monkeypatch):
+    html = pages()[0]
+    cache = SnapshotCache()
+    monkeypatch.setattr(backends, "_default_backend", "html.parser")
+    default = cache.parse(html)
+    assert cache.parse(html, backend="html.parser") is default
+    # A new process-wide default is a different parse, not a stale hit
+    monkeypatch.setattr(backends, "_default_backend", "html5lib")
+    monkeypatch.setattr(backends, "_installed", lambda name: True)
+    assert cache.parse(html) is not default
+    assert cache.info().misses == 2
+
+
+def test_lru_eviction_by_count():
+    html = pages()
+    cache = SnapshotCache(maxsize=2)
+    a = cache.parse(html[0])
+    cache.parse(html[1])
+    assert cache.parse(html[0]) is a  # html[0] is now most recent
+    cache.parse(html[2])  # evicts html[1]
+    assert len(cache) == 2
+    assert cache.parse(html[0]) is a
+    cache.parse(html[1])
+    assert cache.info().misses == 4
+
+
+def test_byte_budget():
+    html = pages()
+    # Slack for instance dict sizes, which depend on key sharing
+    size = snapshot_nbytes(parse_snapshot(html[0])) + 64
+    cache = SnapshotCache(maxsize=None, max_bytes=size)
+    first = cache.parse(html[0])
+    assert cache.info().nbytes == snapshot_nbytes(first)
+    cache.parse(html[1])
+    assert len(cache) <= 1
+    assert cache.info().nbytes <= size
+
+    assert len(SnapshotCache(max_bytes=1).parse(html[0]).monsters) > 0
+
+
+def test_clear_resets_entries_and_counters():
+    cache = SnapshotCache()
+    html = pages()[0]
+    cache.parse(html)
+    cache.parse(html)
+    cache.clear()
+    assert cache.info() == (0, 0, 256, 0, 0, None)
+    assert cache.parse(html) == parse_snapshot(html)
+
+
+def test_stateful_parses_bypass_the_cache():
+    html = pages()[0]
+    cache = SnapshotCache()
+    cursor = LogCursor()
+    a = cache.parse(html, log_cursor=cursor)
+    b = cache.parse(html, log_cursor=cursor)
+    assert a is not b
+    assert cache.parse(html, lazy=True) == parse_snapshot(html)
+    assert cache.info().currsize == 0
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        SnapshotCache(maxsize=-1)
+    with pytest.raises(ValueError, match="unknown engine"):
+        SnapshotCache().parse("<html></html>", engine="dom")
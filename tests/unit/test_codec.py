@@ -0,0 +1,72 @@
+import pickle
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hv_bie import parse_snapshot
+from hv_bie.codec import (
+    CodecError,
+    SnapshotDecoder,
+    SnapshotEncoder,
+    decode,
+    decode_many,
+    encode,
+    encode_many,
+)
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+@pytest.fixture(scope="module")
+def snaps():
+    return [
+        parse_snapshot((FIX / name).read_text(encoding="utf-8"), log_events=True)
+        for name in FIXTURES
+    ]
+
+
+def test_round_trip_every_fixture(snaps):
+    for snap in snaps:
+        assert decode(encode(snap)) == snap
+    assert decode_many(encode_many(snaps)) == snaps
+
+
+def test_stream_shares_string_table_across_records(snaps):
+    enc, dec = SnapshotEncoder(), SnapshotDecoder()
+    first = enc.encode(snaps[3])
+    again = enc.encode(snaps[3])
+    # The repeated snapshot only references strings defined by the first one
+    assert len(again) < len(first) // 2
+    assert list(dec.decode(first)) == [snaps[3]]
+    assert list(dec.decode(again)) == [snaps[3]]
+    assert len(encode_many(snaps)) < len(pickle.dumps(snaps)) * 0.6
+
+
+def test_log_lines_stay_out_of_the_string_table(snaps):
+    enc, dec = SnapshotEncoder(), SnapshotDecoder()
+    base = snaps[3]
+    stream = []
+    for turn in range(40):
+        # A scrolling log: one line kept from the previous turn, one new
+        lines = [f"turn {turn + 99}", f"turn {turn + 100}"]
+        stream.append(replace(base, log=replace(base.log, lines=lines, events=None)))
+    chunks = [enc.encode(snap) for snap in stream]
+    # Names are interned by the first snapshot; new log lines add nothing
+    table = len(enc._ids)
+    assert not any(line.startswith("turn") for line in enc._ids)
+    # Every later record is the same size: one line referenced, one inline
+    assert len({len(chunk) for chunk in chunks[1:]}) == 1
+    assert [s for chunk in chunks for s in dec.decode(chunk)] == stream
+    assert len(dec._strings) == table
+
+
+def test_invalid_streams_raise_codec_error(snaps):
+    data = encode(snaps[0])
+    with pytest.raises(CodecError):
+        decode(b"JSON" + data[4:])
+    with pytest.raises(CodecError):
+        decode(data[:4] + b"\x63" + data[5:])
+    with pytest.raises(CodecError):
+        decode(data[:-3])
@@ -0,0 +1,37 @@
+import math
+from pathlib import Path
+
+import pytest
+
+from hv_bie import parse_snapshot
+from hv_bie.serialization import dumps, to_dict
+from hv_bie.types.models import BattleSnapshot, Buff, Monster
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_round_trip_every_fixture(name):
+    snap = parse_snapshot((FIX / name).read_text(encoding="utf-8"), log_events=True)
+    assert BattleSnapshot.from_json(snap.to_json()) == snap
+    assert BattleSnapshot.from_dict(snap.as_dict()) == snap
+    rebuilt = BattleSnapshot.from_json(snap.to_json())
+    assert all(isinstance(k, int) for k in rebuilt.monsters)
+    assert BattleSnapshot.from_json(snap.to_json(compact=True)) == snap
+
+
+def test_nested_models_and_infinite_durations():
+    buff = Buff.from_json(
+        '{"name": "regen", "remaining_turns": null, "is_permanent": true}'
+    )
+    assert buff == Buff("regen", math.inf, True)
+    monster = Monster(1, "A", True, None, 50.0, 0.0, 0.0, {"regen": buff})
+    assert Monster.from_dict(to_dict(monster)) == monster
+
+
+def test_compact_keys_do_not_rename_names():
+    # Buff names that collide with short keys stay as they are
+    buff = Buff("n", math.inf, True)
+    monster = Monster(1, "p", True, None, 50.0, 0.0, 0.0, {"n": buff, "hp": buff})
+    assert Monster.from_json(dumps(monster, compact=True)) == monster
@@ -0,0 +1,87 @@
+import itertools
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hv_bie import apply_delta, diff, parse_snapshot
+from hv_bie.diff import MonsterDelta, SnapshotDelta
+from hv_bie.types.models import Buff, CombatLog
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def read_fixture(name: str = "The HentaiVerse4.htm") -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="module")
+def snaps():
+    return [parse_snapshot(read_fixture(n), log_events=True) for n in FIXTURES]
+
+
+def test_apply_round_trips_every_fixture_pair(snaps):
+    for a, b in itertools.product(snaps, repeat=2):
+        delta = diff(a, b)
+        assert apply_delta(a, delta) == b
+        assert delta.empty == (a == b)
+
+
+def test_identical_and_shared_sections_are_skipped():
+    html = read_fixture()
+    prev = parse_snapshot(html)
+    assert diff(prev, prev) == SnapshotDelta()
+    assert diff(prev, parse_snapshot(html)).empty
+
+    # Arya Stark (slot 2) takes damage; the other sections are shared objects
+    changed = html.replace(
+        'nbargreen.png" style="width:106px" alt="health"',
+        'nbargreen.png" style="width:60px" alt="health"',
+        1,
+    )
+    curr = parse_snapshot(changed, previous=prev)
+    delta = diff(prev, curr)
+    assert delta.player is None and delta.items is None and delta.log is None
+    assert delta.monsters is not None
+    assert list(delta.monsters.changed) == [2]
+    assert delta.monsters.changed[2] == MonsterDelta(
+        hp_percent=curr.monsters[2].hp_percent
+    )
+    assert apply_delta(prev, delta) == curr
+    # Unchanged objects are shared by the rebuilt snapshot
+    rebuilt = apply_delta(prev, delta)
+    assert rebuilt.items is prev.items
+    assert rebuilt.monsters[1] is prev.monsters[1]
+
+
+def test_deaths_buff_ticks_and_log_lines():
+    prev = parse_snapshot(read_fixture())
+    slot, monster = next(iter(prev.monsters.items()))
+    buffs = dict(prev.player.buffs)
+    ticked = Buff("test buff", 3.0, False)
+    curr = replace(
+        prev,
+        player=replace(
+            prev.player,
+            hp_value=prev.player.hp_value - 1,
+            buffs={**buffs, "test buff": ticked},
+        ),
+        monsters={**prev.monsters, slot: replace(monster, alive=False, hp_percent=0.0)},
+        log=CombatLog(
+            prev.log.lines[1:] + ["new line"],
+            prev.log.current_round,
+            prev.log.total_round,
+        ),
+    )
+    delta = diff(prev, curr)
+    assert delta.deaths == [slot]
+    assert delta.player is not None
+    assert delta.player.hp_value == curr.player.hp_value
+    assert delta.player.buffs is not None and delta.player.buffs.added == {
+        "test buff": ticked
+    }
+    assert delta.log is not None
+    assert (delta.log.dropped, delta.log.appended) == (1, ("new line",))
+    assert apply_delta(prev, delta) == curr
+    assert delta.as_dict()["log"]["appended"] == ["new line"]
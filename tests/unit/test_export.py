@@ -0,0 +1,76 @@
+import csv
+import math
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from hv_bie import parse_snapshot
+from hv_bie.export import read_binary, to_columns, write_columns
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+@pytest.fixture(scope="module")
+def snaps():
+    return [
+        parse_snapshot((FIX / name).read_text(encoding="utf-8")) for name in FIXTURES
+    ]
+
+
+def test_to_columns_shapes(snaps):
+    cols = to_columns(snaps)
+    assert cols.player["index"] == list(range(len(snaps)))
+    assert cols.player["hp_percent"] == [s.player.hp_percent for s in snaps]
+    assert len(cols.monsters["slot"]) == sum(len(s.monsters) for s in snaps)
+    n_buffs = sum(
+        len(s.player.buffs) + sum(len(m.buffs) for m in s.monsters.values())
+        for s in snaps
+    )
+    assert len(cols.buffs["name"]) == n_buffs
+    for table in cols.tables().values():
+        assert len({len(column) for column in table.values()}) == 1
+    first = snaps[0].monsters[1]
+    assert cols.monsters["name"][0] == first.name
+    assert cols.monsters["alive"][0] is first.alive
+
+
+def test_binary_and_csv_round_trip(snaps, tmp_path):
+    cols = to_columns(snaps)
+    paths = write_columns(cols, tmp_path / "bin", format="binary")
+    assert [p.name for p in paths] == ["player.hvc", "monsters.hvc", "buffs.hvc"]
+    for path, table in zip(paths, cols.tables().values()):
+        assert read_binary(path) == table
+    assert any(math.isinf(t) for t in read_binary(paths[2])["remaining_turns"])
+
+    player_csv, *_ = write_columns(snaps, tmp_path / "csv", format="csv")
+    with open(player_csv, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(cols.player)
+    assert len(rows) == len(snaps) + 1
+
+
+def test_numpy_structured_arrays(snaps, tmp_path):
+    np = pytest.importorskip("numpy")
+    cols = to_columns(snaps)
+    arrays = cols.to_numpy()
+    assert arrays["monsters"]["hp_percent"].tolist() == cols.monsters["hp_percent"]
+    assert arrays["buffs"]["name"].tolist() == cols.buffs["name"]
+    (path,) = write_columns(cols, tmp_path)
+    with np.load(path) as npz:
+        assert npz["player"].tolist() == arrays["player"].tolist()
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        write_columns([], tmp_path, format="parquet")
+
+
+def test_import_does_not_load_numpy():
+    code = "import sys, hv_bie; print(sorted(m for m in sys.modules if 'numpy' in m))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import pytest
+
+from hv_bie import LogCursor, parse_snapshot
+from hv_bie.parsers.fast import FastPathError, parse_section
+from hv_bie.parsers.slicing import slice_section
+from hv_bie.snapshot import SECTIONS
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def read_fixture(name: str) -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_fast_engine_matches_soup(name):
+    html = read_fixture(name)
+    expected = parse_snapshot(html, log_events=True)
+    snap = parse_snapshot(html, log_events=True, engine="fast")
+    assert snap == expected
+    assert snap.warnings == expected.warnings
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_fixture_sections_take_the_fast_path(name):
+    html = read_fixture(name)
+    for section in SECTIONS:
+        fragment = slice_section(html, section)
+        if fragment is not None:
+            # Raises FastPathError if the section would fall back
+            parse_section(section, fragment, [])
+
+
+def test_fast_engine_with_previous_and_sections():
+    html = read_fixture("The HentaiVerse4.htm")
+    changed = html.replace(
+        'nbargreen.png" style="width:106px" alt="health"',
+        'nbargreen.png" style="width:60px" alt="health"',
+        1,
+    )
+    prev = parse_snapshot(html, engine="fast")
+    snap = parse_snapshot(changed, previous=prev, engine="fast")
+    assert snap == parse_snapshot(changed)
+    assert snap.items is prev.items
+
+    only = parse_snapshot(html, sections={"monsters", "player"}, engine="fast")
+    assert only == parse_snapshot(html, sections={"monsters", "player"})
+
+
+def test_fast_engine_log_cursor_matches_soup():
+    pages = [read_fixture(n) for n in ("The HentaiVerse3.htm", "The HentaiVerse4.htm")]
+    soup_cursor, fast_cursor = LogCursor(), LogCursor()
+    for html in pages:
+        expected = parse_snapshot(html, log_cursor=soup_cursor)
+        snap = parse_snapshot(html, log_cursor=fast_cursor, engine="fast")
+        assert snap.log == expected.log
+
+
+@pytest.mark.parametrize(
+    "fragment",
+    [
+        '<div id="pane_item"><!-- note --><div class="bti1"></div></div>',
+        '<DIV id="pane_item"></DIV>',
+        '<div id="pane_item"><div class="bti1"></div>',
+        '<div id="pane_item" ID="other"></div>',
+    ],
+)
+def test_unrecognised_markup_raises_without_warnings(fragment):
+    warnings: list[str] = []
+    with pytest.raises(FastPathError):
+        parse_section("items", fragment, warnings)
+    assert warnings == []
+
+
+def test_unrecognised_pane_falls_back_to_soup():
+    html = read_fixture("The HentaiVerse.htm")
+    marker = ">"
+    start = html.index('id="pane_item"')
+    end = html.index(marker, start) + len(marker)
+    shouting = html[:end] + "<SPAN></SPAN>" + html[end:]
+    fragment = slice_section(shouting, "items")
+    assert fragment is not None
+    with pytest.raises(FastPathError):
+        parse_section("items", fragment, [])
+    assert parse_snapshot(shouting, engine="fast") == parse_snapshot(shouting)
+
+
+def test_missing_panes_warn_like_soup():
+    html = "<html><body><div>nothing here</div></body></html>"
+    expected = parse_snapshot(html)
+    snap = parse_snapshot(html, engine="fast")
+    assert snap == expected
+    assert snap.warnings == expected.warnings
+
+
+def test_unknown_engine_is_rejected():
+    with pytest.raises(ValueError, match="unknown engine"):
+        parse_snapshot("<html></html>", engine="regex")
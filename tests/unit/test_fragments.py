@@ -0,0 +1,103 @@
+from dataclasses import replace
+from pathlib import Path
+
+from hv_bie import parse_fragments, parse_snapshot
+from hv_bie.parsers import LayoutSpec, compile_plan
+from hv_bie.parsers.plan import Pane
+from hv_bie.parsers.slicing import find_element
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+
+def read_fixture(name: str) -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def pane(html: str, tag: str, pane_id: str) -> str:
+    start, end = find_element(html, tag, pane_id)
+    return html[start:end]
+
+
+def test_fragments_merge_matches_full_page():
+    html = read_fixture("The HentaiVerse4.htm")
+    prev = parse_snapshot(html)
+    after = html.replace(
+        'nbargreen.png" style="width:106px" alt="health"',
+        'nbargreen.png" style="width:60px" alt="health"',
+        1,
+    )
+    fragments = {
+        "pane_monster": pane(after, "div", "pane_monster"),
+        "pane_vitals": pane(after, "div", "pane_vitals"),
+        "textlog": pane(after, "table", "textlog"),
+    }
+    snap = parse_fragments(fragments, prev)
+
+    assert snap == parse_snapshot(after)
+    assert snap.monsters[2].hp_percent == 50.0
+    assert snap.abilities is prev.abilities
+    assert snap.items is prev.items
+    assert snap.player.buffs is prev.player.buffs
+
+
+def test_fragment_inner_html_and_partial_panes():
+    # Page 1 has Spirit Stance active; page 0 has a different effects pane
+    prev = parse_snapshot(read_fixture("The HentaiVerse1.htm"))
+    other = read_fixture("The HentaiVerse.htm")
+    effects = pane(other, "div", "pane_effects")
+    inner = effects[effects.index(">") + 1 : -len("</div>")]
+
+    snap = parse_fragments({"pane_effects": inner}, prev)
+    expected = parse_snapshot(other).player.buffs
+    assert "spirit stance" in snap.player.buffs
+    assert {k: b for k, b in snap.player.buffs.items() if k != "spirit stance"} == (
+        expected
+    )
+    assert snap.player.hp_value == prev.player.hp_value
+
+
+def test_fragment_warnings_replace_stale_ones():
+    html = read_fixture("The HentaiVerse.htm")
+    prev = parse_snapshot(html.replace('id="table_magic"', 'id="x"'))
+    assert prev.warnings == ["table_magic not found"]
+
+    magic = pane(html, "table", "table_magic")
+    snap = parse_fragments({"table_magic": magic, "pane_action": "<div></div>"}, prev)
+    assert snap.abilities == parse_snapshot(html).abilities
+    assert snap.warnings == ["unknown fragment pane_action"]
+
+
+def test_merged_snapshot_chains_into_incremental_parse():
+    html = read_fixture("The HentaiVerse3.htm")
+    prev = parse_snapshot(html)
+    merged = parse_fragments({"textlog": pane(html, "table", "textlog")}, prev)
+    snap = parse_snapshot(html, previous=merged)
+    assert snap.items is prev.items
+    assert snap.monsters is prev.monsters
+    assert snap == prev
+
+
+def test_fragments_follow_the_plan_layout():
+    html = read_fixture("The HentaiVerse4.htm")
+    renamed = html.replace('id="pane_monster"', 'id="pane_foes"').replace(
+        'id="mkey_', 'id="foe_'
+    )
+    spec = replace(
+        LayoutSpec(), monsters=Pane("div", "pane_foes"), monster_slot_id=r"foe_(\d+)"
+    )
+    plan = compile_plan(spec)
+    prev = parse_snapshot(renamed, plan=plan)
+    assert "pane_foes not found" not in prev.warnings
+
+    after = renamed.replace(
+        'nbargreen.png" style="width:106px" alt="health"',
+        'nbargreen.png" style="width:60px" alt="health"',
+        1,
+    )
+    fragments = {"pane_foes": pane(after, "div", "pane_foes")}
+    snap = parse_fragments(fragments, prev, plan=plan)
+    assert snap == parse_snapshot(after, plan=plan)
+    assert snap.monsters[2].hp_percent == 50.0
+
+    # Under the default layout the renamed pane is not a known fragment
+    assert parse_fragments(fragments, prev).warnings[-1] == "unknown fragment pane_foes"
@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from hv_bie import parse_snapshot
+from hv_bie.snapshot import SECTIONS
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+
+def read_fixture(name: str) -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def next_turn(html: str) -> str:
+    # Arya Stark (slot 2) takes damage; every other pane stays byte-identical
+    return html.replace(
+        'nbargreen.png" style="width:106px" alt="health"',
+        'nbargreen.png" style="width:60px" alt="health"',
+        1,
+    )
+
+
+def test_unchanged_page_reuses_every_section():
+    html = read_fixture("The HentaiVerse4.htm")
+    prev = parse_snapshot(html)
+    snap = parse_snapshot(html, previous=prev)
+    assert snap == prev
+    for section in SECTIONS:
+        assert getattr(snap, section) is getattr(prev, section)
+
+
+def test_changed_monster_slot_is_reparsed_alone():
+    html = read_fixture("The HentaiVerse4.htm")
+    prev = parse_snapshot(html)
+    changed = next_turn(html)
+    snap = parse_snapshot(changed, previous=prev)
+
+    assert snap == parse_snapshot(changed)
+    assert snap.monsters[2] is not prev.monsters[2]
+    assert snap.monsters[2].hp_percent == 50.0
+    for idx in (1, 3, 4, 5):
+        assert snap.monsters[idx] is prev.monsters[idx]
+    assert list(snap.monsters) == list(prev.monsters)
+    assert snap.abilities is prev.abilities
+    assert snap.items is prev.items
+
+
+def test_previous_from_other_battle_parses_normally():
+    prev = parse_snapshot(read_fixture("The HentaiVerse.htm"))
+    html = read_fixture("The HentaiVerse5.htm")
+    assert parse_snapshot(html, previous=prev) == parse_snapshot(html)
+
+
+def test_reused_sections_keep_their_warnings():
+    html = '<div id="pane_monster"></div>'
+    prev = parse_snapshot(html)
+    snap = parse_snapshot(html, previous=prev)
+    assert snap.items is prev.items
+    assert snap.warnings == prev.warnings
+    assert "quickbar not found" in snap.warnings
+
+
+def test_lazy_and_partial_snapshots_chain():
+    html = read_fixture("The HentaiVerse3.htm")
+    prev = parse_snapshot(html, lazy=True)
+    _ = prev.monsters
+    snap = parse_snapshot(html, previous=prev, sections={"monsters", "items"})
+    assert snap.monsters is prev.monsters
+    assert snap.items == prev.items
+    follow = parse_snapshot(html, previous=snap)
+    assert follow.monsters is prev.monsters and follow.items is snap.items
@@ -0,0 +1,71 @@
+import copy
+import json
+import pickle
+from dataclasses import replace
+from pathlib import Path
+
+from hv_bie import LazyBattleSnapshot, parse_snapshot
+from hv_bie.types.models import BattleSnapshot
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+
+def read_fixture(name: str) -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def test_sections_parse_on_first_access():
+    snap = parse_snapshot(read_fixture("The HentaiVerse3.htm"), lazy=True)
+    assert isinstance(snap, LazyBattleSnapshot)
+    assert snap.loaded_sections == frozenset()
+
+    monsters = snap.monsters
+    assert snap.loaded_sections == {"monsters"}
+    assert snap.monsters is monsters
+    assert snap.player.hp_value == 23421
+    assert snap.loaded_sections == {"monsters", "player"}
+
+
+def test_lazy_matches_eager():
+    html = read_fixture("The HentaiVerse5.htm")
+    eager = parse_snapshot(html)
+    lazy = parse_snapshot(html, lazy=True)
+    assert lazy == eager and eager == lazy
+    assert lazy.as_dict() == eager.as_dict()
+    assert json.loads(lazy.to_json()) == json.loads(eager.to_json())
+    assert type(lazy.materialize()) is BattleSnapshot
+
+
+def test_warnings_collected_per_section():
+    html = "<div id='pane_monster'></div>"
+    snap = parse_snapshot(html, lazy=True)
+    assert snap.warnings == []
+    _ = snap.items
+    assert snap.warnings == ["pane_item not found", "quickbar not found"]
+    _ = snap.abilities
+    # Ordered as an eager parse would report them, whatever the access order
+    assert snap.warnings == [
+        "table_skills not found",
+        "table_magic not found",
+        "pane_item not found",
+        "quickbar not found",
+    ]
+    assert snap.materialize().warnings == parse_snapshot(html).warnings
+
+
+def test_lazy_pickles_as_plain_snapshot():
+    html = read_fixture("The HentaiVerse.htm")
+    restored = pickle.loads(pickle.dumps(parse_snapshot(html, lazy=True)))
+    assert type(restored) is BattleSnapshot
+    assert restored == parse_snapshot(html)
+
+
+def test_lazy_replace_gives_plain_snapshot():
+    html = read_fixture("The HentaiVerse.htm")
+    eager = parse_snapshot(html)
+    changed = replace(parse_snapshot(html, lazy=True), warnings=["x"])
+    assert type(changed) is BattleSnapshot
+    assert changed == replace(eager, warnings=["x"])
+    if hasattr(copy, "replace"):
+        snap = copy.replace(parse_snapshot(html, lazy=True), warnings=[])
+        assert type(snap) is BattleSnapshot and snap.player == eager.player
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from hv_bie import LogCursor, parse_snapshot
+from hv_bie.parsers import parse_log
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+
+def textlog(*rows: str) -> str:
+    # rows are given oldest first; the page lists the newest row first
+    cells = "".join(f'<tr><td class="tl">{r}</td></tr>' for r in reversed(rows))
+    return f'<table id="textlog"><tbody>{cells}</tbody></table>'
+
+
+def soup_of(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html, "html.parser")
+
+
+def test_cursor_matches_full_parse_on_fixtures():
+    for path in sorted(FIX.glob("*.htm*")):
+        soup = soup_of(path.read_text(encoding="utf-8"))
+        assert parse_log(soup, [], cursor=LogCursor()) == parse_log(soup, [])
+
+
+def test_cursor_appends_only_new_rows():
+    cursor = LogCursor()
+    turn1 = ["Initializing Grindfest (Round 3 / 50) ...", "You hit A for 5 damage."]
+    log = parse_log(soup_of(textlog(*turn1)), [], cursor=cursor)
+    assert log.lines == turn1 and (log.current_round, log.total_round) == (3, 50)
+
+    turn2 = turn1 + ["You hit A for 7 damage.", "A has been defeated."]
+    log2 = parse_log(soup_of(textlog(*turn2)), [], cursor=cursor)
+    assert log2.lines == turn2
+    assert cursor.rows == 4
+    # Earlier snapshots keep their own copy of the lines
+    assert log.lines == turn1
+
+
+def test_new_round_starts_new_segment_in_shared_log():
+    cursor = LogCursor(max_lines=3)
+    parse_log(
+        soup_of(textlog("Initializing Grindfest (Round 3 / 50) ...", "x")),
+        [],
+        cursor=cursor,
+    )
+    log = parse_log(
+        soup_of(textlog("Initializing Grindfest (Round 4 / 50) ...", "y")),
+        [],
+        cursor=cursor,
+    )
+    assert log.current_round == 4
+    # Bounded ring buffer keeps only the newest lines of the battle
+    assert log.lines == ["x", "Initializing Grindfest (Round 4 / 50) ...", "y"]
+
+
+def test_parse_snapshot_with_log_cursor():
+    html = (FIX / "The HentaiVerse6.html").read_text(encoding="utf-8")
+    cursor = LogCursor()
+    snap = parse_snapshot(html, log_cursor=cursor)
+    assert snap.log == parse_snapshot(html).log
+    # Blank separator rows count towards the cursor but yield no lines
+    assert cursor.rows >= len(snap.log.lines)
+
+    missing = parse_snapshot("<div></div>", log_cursor=cursor)
+    assert "textlog not found" in missing.warnings
+    assert missing.log == snap.log
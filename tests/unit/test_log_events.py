@@ -0,0 +1,153 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from hv_bie import LogCursor, parse_snapshot
+from hv_bie.parsers import EVENT_KINDS, extract_events, parse_log
+from hv_bie.parsers.events import classify_line
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+
+def test_classify_line_kinds():
+    cases = {
+        "You hit Ryouko Asakura for 17057 void damage.": (
+            "damage_dealt",
+            "you",
+            "Ryouko Asakura",
+            17057,
+            "void",
+        ),
+        "Your spike shield hits Thundaga for 5 points of elec damage.": (
+            "damage_dealt",
+            "spike shield",
+            "Thundaga",
+            5,
+            "elec",
+        ),
+        "You crit Pa115, which partially parries, causing 1177 points of Slashing damage.": (
+            "damage_dealt",
+            "you",
+            "Pa115",
+            1177,
+            "Slashing",
+        ),
+        "Pa115 hits you; you partially block the attack, and take 34 points of Crushing damage.": (
+            "damage_taken",
+            "Pa115",
+            "you",
+            34,
+            "Crushing",
+        ),
+        "Sleeping Dragon uses Nightmare, which hits! You take 209 Piercing damage.": (
+            "damage_taken",
+            "Sleeping Dragon",
+            "you",
+            209,
+            "Piercing",
+        ),
+        "Regen restores 142 points of health.": ("heal", "Regen", "you", 142, "health"),
+        "Pa115 gains the effect Stunned.": ("buff_gained", "", "Pa115", 0, "Stunned"),
+        "The effect Overwhelming Strikes  has worn off.": (
+            "buff_expired",
+            "",
+            "you",
+            0,
+            "Overwhelming Strikes",
+        ),
+        "The effect Stunned on Pa115 has worn off.": (
+            "buff_expired",
+            "",
+            "Pa115",
+            0,
+            "Stunned",
+        ),
+        "Blue Slime has been defeated.": ("monster_defeated", "", "Blue Slime", 0, ""),
+        "You use Scroll of Protection.": (
+            "item_used",
+            "you",
+            "",
+            0,
+            "Scroll of Protection",
+        ),
+        "You cast Absorb.": ("spell_cast", "you", "", 0, "Absorb"),
+    }
+    for line, expected in cases.items():
+        assert classify_line(line) == expected, line
+    assert classify_line("You evade the attack from Arya Stark.") is None
+    assert classify_line("Initializing Grindfest (Round 12 / 1000) ...") is None
+
+
+def test_events_are_parallel_columns():
+    lines = ["Spirit Stance Engaged", "You cast Absorb.", "A has been defeated."]
+    events = extract_events(lines)
+    assert len(events) == 2
+    assert events.kinds == ["spell_cast", "monster_defeated"]
+    assert events.line_index == [1, 2]
+    assert set(events.kinds) <= set(EVENT_KINDS)
+
+
+def test_snapshot_log_events_opt_in():
+    html = (FIX / "The HentaiVerse7.html").read_text(encoding="utf-8")
+    assert parse_snapshot(html).log.events is None
+
+    snap = parse_snapshot(html, log_events=True)
+    events = snap.log.events
+    assert events is not None and len(events) > 0
+    assert events == extract_events(snap.log.lines)
+    columns = (events.sources, events.targets, events.amounts, events.details)
+    assert all(len(col) == len(events) for col in columns)
+    # A previous snapshot without events is not reused for the log
+    assert parse_snapshot(html, previous=parse_snapshot(html), log_events=True) == snap
+
+
+def test_log_events_with_cursor():
+    html = (FIX / "The HentaiVerse6.html").read_text(encoding="utf-8")
+    soup = BeautifulSoup(html, "html.parser")
+    log = parse_log(soup, [], cursor=LogCursor(), events=True)
+    assert log.events == parse_log(soup, [], events=True).events
+
+
+def test_cursor_classifies_only_new_lines(monkeypatch):
+    from hv_bie.parsers import core
+
+    seen: list[str] = []
+
+    def counting(line):
+        seen.append(line)
+        return classify_line(line)
+
+    monkeypatch.setattr(core, "classify_line", counting)
+
+    def page(*rows: str) -> BeautifulSoup:
+        cells = "".join(f"<tr><td>{r}</td></tr>" for r in reversed(rows))
+        return BeautifulSoup(f'<table id="textlog">{cells}</table>', "html.parser")
+
+    cursor = LogCursor(max_lines=4)
+    rows = ["Initializing Grindfest (Round 1 / 50) ...", "You hit A for 5 damage."]
+    log = parse_log(page(*rows), [], cursor=cursor, events=True)
+    assert log.events == extract_events(log.lines)
+    assert seen == rows
+
+    # Lines added without events are classified on the next page with them
+    rows += ["A hits you for 9 crushing damage.", "Nothing happens."]
+    parse_log(page(*rows), [], cursor=cursor)
+    rows += ["You hit B for 7 damage.", "A has been defeated."]
+    seen.clear()
+    log = parse_log(page(*rows), [], cursor=cursor, events=True)
+    assert seen == rows[2:]
+    # The ring buffer dropped the first two lines and their events
+    assert log.lines == rows[2:]
+    assert log.events == extract_events(log.lines)
+    assert log.events.line_index == [0, 2, 3]
+
+    # A new round appends to the shared log
+    rows = ["Initializing Grindfest (Round 2 / 50) ...", "You hit C for 3 damage."]
+    seen.clear()
+    log = parse_log(page(*rows), [], cursor=cursor, events=True)
+    assert seen == rows
+    assert log.events == extract_events(log.lines)
+
+    cursor.reset()
+    log = parse_log(page(*rows), [], cursor=cursor, events=True)
+    assert log.lines == rows and log.events == extract_events(rows)
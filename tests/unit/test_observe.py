@@ -0,0 +1,87 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from hv_bie import add_observer, observing, parse_snapshot, remove_observer
+from hv_bie.parsers import parse_monsters
+from hv_bie.snapshot import SECTIONS
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+
+def read_fixture(name: str = "The HentaiVerse4.htm") -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def test_callable_observer_sees_every_stage_start_and_end():
+    html = read_fixture()
+    events = []
+
+    def record(span):
+        events.append((span.phase, span.name, span.section))
+
+    with observing(record):
+        snap = parse_snapshot(html)
+    assert snap == parse_snapshot(html)
+
+    starts = [e[1:] for e in events if e[0] == "start"]
+    ends = [e[1:] for e in events if e[0] == "end"]
+    assert sorted(starts) == sorted(ends)
+    assert starts[0] == ("parse_snapshot", None)
+    assert ends[-1] == ("parse_snapshot", None)
+    assert [s for n, s in starts if n == "parse_section"] == list(SECTIONS)
+    assert {n for n, _ in starts} >= {
+        "parse_player_vitals",
+        "parse_player_buffs",
+        "parse_abilities",
+        "parse_monsters",
+        "parse_log",
+        "parse_items",
+    }
+
+
+def test_context_manager_factory_wraps_each_stage():
+    html = read_fixture()
+    finished = {}
+
+    @contextmanager
+    def timer(span):
+        yield
+        finished[span.name, span.section] = span
+
+    with observing(timer):
+        snap = parse_snapshot(html)
+    top = finished["parse_snapshot", None]
+    assert top.phase == "end"
+    assert top.input_size == len(html)
+    assert top.elapsed > 0
+    monsters = finished["parse_monsters", "monsters"]
+    assert monsters.element_count == len(snap.monsters)
+    assert monsters.input_size > 0
+    assert finished["parse_section", "log"].element_count == len(snap.log.lines)
+
+
+def test_span_warnings_and_errors():
+    spans = []
+    add_observer(spans.append)
+    try:
+        parse_snapshot("<html><body></body></html>", sections={"monsters"})
+        with pytest.raises(AttributeError):
+            parse_monsters(None, [])  # type: ignore[arg-type]
+    finally:
+        remove_observer(spans.append)
+
+    ended = [s for s in spans if s.phase == "end"]
+    section = next(s for s in ended if s.name == "parse_section")
+    assert section.warnings == ("pane_monster not found",)
+    assert ended[-1].name == "parse_monsters"
+    assert isinstance(ended[-1].error, AttributeError)
+
+
+def test_removed_observer_is_not_called():
+    calls = []
+    with observing(calls.append):
+        pass
+    parse_snapshot(read_fixture(), engine="fast")
+    assert calls == []
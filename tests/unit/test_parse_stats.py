@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from hv_bie import ParseStats, parse_many, parse_snapshot
+from hv_bie.snapshot import SECTIONS
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+
+PARSERS = {
+    "parse_player_vitals",
+    "parse_player_buffs",
+    "parse_abilities",
+    "parse_monsters",
+    "parse_log",
+    "parse_items",
+}
+
+
+def read_fixture(name: str = "The HentaiVerse4.htm") -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def test_stats_are_off_by_default():
+    assert parse_snapshot(read_fixture()).stats is None
+
+
+def test_stats_summary_and_per_parser_times():
+    html = read_fixture()
+    snap = parse_snapshot(html, collect_stats=True)
+    stats = snap.stats
+    assert isinstance(stats, ParseStats)
+    assert snap == parse_snapshot(html)
+    assert stats.source_length == len(html)
+    assert len(stats.source_hash) == 32
+    assert stats.engine == "soup"
+    assert stats.warning_count == len(snap.warnings)
+    assert stats.node_count > 0
+    assert set(stats.section_seconds) == set(SECTIONS)
+    assert set(stats.parser_seconds) == PARSERS
+    assert 0 < stats.build_seconds < stats.elapsed_seconds
+    assert sum(stats.section_seconds.values()) <= stats.elapsed_seconds
+    assert stats.slowest_section in SECTIONS
+
+
+def test_stats_reflect_sections_engine_and_reuse():
+    html = read_fixture()
+    only = parse_snapshot(html, sections={"monsters"}, collect_stats=True).stats
+    assert only is not None
+    assert set(only.section_seconds) == {"monsters"}
+    assert set(only.parser_seconds) == {"parse_monsters"}
+
+    fast = parse_snapshot(html, engine="fast", collect_stats=True).stats
+    assert fast is not None
+    assert fast.engine == "fast"
+    assert fast.parser_seconds == {} and fast.node_count == 0
+
+    prev = parse_snapshot(html)
+    again = parse_snapshot(html, previous=prev, collect_stats=True).stats
+    assert again is not None
+    assert again.reused_sections == SECTIONS
+    assert again.build_seconds == 0.0
+
+
+def test_lazy_stats_grow_with_loaded_sections():
+    snap = parse_snapshot(read_fixture(), lazy=True, collect_stats=True)
+    assert snap.stats is not None and snap.stats.section_seconds == {}
+    player = snap.player
+    assert player == parse_snapshot(read_fixture()).player
+    stats = snap.stats
+    assert stats is not None
+    assert set(stats.section_seconds) == {"player"}
+    assert set(stats.parser_seconds) == {"parse_player_vitals", "parse_player_buffs"}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_stats_travel_with_batch_results(workers):
+    html = read_fixture()
+    (snap,) = parse_many([html], workers=workers, collect_stats=True)
+    assert snap.stats is not None
+    assert snap.stats.source_length == len(html)
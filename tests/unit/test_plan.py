@@ -0,0 +1,74 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hv_bie import parse_snapshot
+from hv_bie.parsers import DEFAULT_PLAN, LayoutSpec, compile_plan
+from hv_bie.parsers.plan import Pane
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_default_plan_matches_implicit_default(name):
+    html = (FIX / name).read_text(encoding="utf-8")
+    assert parse_snapshot(html, plan=compile_plan(LayoutSpec())) == parse_snapshot(html)
+
+
+def test_default_plan_anchors_match_sections():
+    assert set(DEFAULT_PLAN.section_anchors) == {
+        "player",
+        "abilities",
+        "monsters",
+        "log",
+        "items",
+    }
+    assert ("div", "pane_monster") in DEFAULT_PLAN.section_anchors["monsters"]
+
+
+def test_variant_spec_reads_renamed_panes():
+    html = (FIX / "The HentaiVerse.htm").read_text(encoding="utf-8")
+    expected = parse_snapshot(html)
+    renamed = html.replace('id="pane_monster"', 'id="pane_foes"').replace(
+        "bar_blue.png", "bar_mana.png"
+    )
+
+    # The default layout no longer finds the renamed panes
+    stale = parse_snapshot(renamed)
+    assert "pane_monster not found" in stale.warnings
+    assert stale.monsters == {}
+
+    spec = replace(
+        LayoutSpec(),
+        monsters=Pane("div", "pane_foes"),
+        mp_bar=replace(LayoutSpec().mp_bar, src=r"bar_mana\.png"),
+    )
+    snap = parse_snapshot(renamed, plan=compile_plan(spec))
+    assert snap == expected
+
+
+def test_variant_missing_pane_warning_uses_spec_id():
+    spec = replace(LayoutSpec(), quickbar=Pane("div", "quick_actions"))
+    snap = parse_snapshot("<html></html>", plan=compile_plan(spec))
+    assert "quick_actions not found" in snap.warnings
+    assert "quickbar not found" not in snap.warnings
+
+
+def test_variant_monster_slot_ids_are_sliced_per_slot():
+    html = (FIX / "The HentaiVerse4.htm").read_text(encoding="utf-8")
+    expected = parse_snapshot(html)
+    renamed = html.replace('id="mkey_', 'id="foe_')
+    plan = compile_plan(replace(LayoutSpec(), monster_slot_id=r"foe_(\d+)"))
+    first = parse_snapshot(renamed, plan=plan)
+    assert first.monsters == expected.monsters
+
+    # One slot changed: the others are reused from the previous snapshot
+    after = renamed.replace(
+        'style="width:106px" alt="health"', 'style="width:60px" alt="health"', 1
+    )
+    snap = parse_snapshot(after, plan=plan, previous=first)
+    assert snap.monsters == parse_snapshot(after, plan=plan).monsters
+    assert snap.monsters[1] is first.monsters[1]
+    assert snap.monsters[2] is not first.monsters[2]
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from hv_bie import LogCursor, parse_snapshot
+from hv_bie.parsers import sax
+from hv_bie.parsers.plan import DEFAULT_PLAN
+from hv_bie.snapshot import _SECTION_PARSERS, SECTIONS
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def read_fixture(name: str) -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_sax_engine_matches_soup(name):
+    html = read_fixture(name)
+    expected = parse_snapshot(html, log_events=True, backend="html.parser")
+    snap = parse_snapshot(html, log_events=True, engine="sax")
+    assert snap == expected
+    assert snap.warnings == expected.warnings
+
+
+def _variants(html: str) -> dict[str, str]:
+    return {
+        "comment in text": html.replace(
+            '<div id="dvrhd">', '<div id="dvrhd"> <!-- hp --> ', 1
+        ),
+        "stray end tags": html.replace(
+            '<div id="pane_item"', '</span></div><div id="pane_item"', 1
+        ),
+        "unclosed table": html.replace("</table>", "", 1),
+        "upper-case markup": html.replace(
+            '<div id="pane_monster"', '<DIV ID="pane_monster"', 1
+        ),
+        "script in pane": html.replace(
+            '<div id="mkey_1"', '<script>var a = "<div>";</script><div id="mkey_1"', 1
+        ),
+        "entities": html.replace('<div id="dvrm">', '<div id="dvrm">&#32;&amp;', 1),
+        "self-closing div": html.replace(
+            '<div id="mkey_2"', '<div/><div id="mkey_2"', 1
+        ),
+        "duplicate pane id": html.replace(
+            '<div id="pane_vitals"',
+            '<div id="pane_vitals"></div><div id="pane_vitals"',
+            1,
+        ),
+        "truncated": html[: len(html) // 2],
+    }
+
+
+@pytest.mark.parametrize("variant", sorted(_variants("")))
+def test_sax_sections_match_core_on_irregular_markup(variant):
+    html = _variants(read_fixture("The HentaiVerse4.htm"))[variant]
+    soup = BeautifulSoup(html, "html.parser")
+    for section in SECTIONS:
+        expected_warnings: list[str] = []
+        warnings: list[str] = []
+        expected = _SECTION_PARSERS[section](soup, expected_warnings, DEFAULT_PLAN)
+        assert sax.parse_section(section, html, warnings) == expected
+        assert warnings == expected_warnings
+
+
+def test_sax_engine_with_previous_lazy_and_cursor():
+    pages = [read_fixture(n) for n in ("The HentaiVerse3.htm", "The HentaiVerse4.htm")]
+    soup_cursor, sax_cursor = LogCursor(), LogCursor()
+    prev = None
+    for html in pages:
+        expected = parse_snapshot(html, log_cursor=soup_cursor)
+        snap = parse_snapshot(html, previous=prev, log_cursor=sax_cursor, engine="sax")
+        assert snap == expected
+        prev = snap
+
+    lazy = parse_snapshot(pages[0], lazy=True, engine="sax")
+    assert lazy.monsters == parse_snapshot(pages[0]).monsters
+    assert lazy.loaded_sections == {"monsters"}
+
+
+def test_missing_panes_warn_like_soup():
+    html = "<html><body><div>nothing here</div></body></html>"
+    expected = parse_snapshot(html)
+    snap = parse_snapshot(html, engine="sax")
+    assert snap == expected
+    assert snap.warnings == expected.warnings
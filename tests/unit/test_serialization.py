@@ -0,0 +1,68 @@
+import io
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from hv_bie import parse_snapshot, serialization
+from hv_bie.serialization import SHORT_KEYS, _separators, dump, dumps, to_json_obj
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def strict_loads(text: str):
+    def reject(name):
+        raise ValueError(f"non-standard JSON constant {name}")
+
+    return json.loads(text, parse_constant=reject)
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_json_is_standard_and_matches_asdict(name):
+    snap = parse_snapshot((FIX / name).read_text(encoding="utf-8"), log_events=True)
+    assert snap.as_dict() == asdict(snap)
+
+    obj = strict_loads(snap.to_json())
+    assert obj["monsters"].keys() == {str(k) for k in snap.monsters}
+    for key, buff in snap.player.buffs.items():
+        expected = None if buff.is_permanent else buff.remaining_turns
+        assert obj["player"]["buffs"][key]["remaining_turns"] == expected
+
+    # The direct writer produces exactly what json.dumps makes of the tree
+    for compact in (False, True):
+        assert dumps(snap, compact=compact) == json.dumps(
+            to_json_obj(snap, compact=compact),
+            ensure_ascii=False,
+            allow_nan=False,
+            separators=_separators(compact),
+        )
+
+
+def test_compact_mode_and_streaming():
+    snap = parse_snapshot((FIX / "The HentaiVerse4.htm").read_text(encoding="utf-8"))
+    compact = snap.to_json(compact=True)
+    assert ", " not in compact.replace('", "', "")
+    obj = strict_loads(compact)
+    assert set(obj) == {"p", "a", "m", "l", "i", "w"}
+    assert obj["p"]["hp"] == snap.player.hp_percent
+    assert len(set(SHORT_KEYS.values())) == len(SHORT_KEYS)
+
+    buf = io.StringIO()
+    dump(snap, buf, compact=True)
+    assert buf.getvalue() == dumps(snap, compact=True) == compact
+
+
+def test_dump_writes_as_it_goes(monkeypatch):
+    snap = parse_snapshot((FIX / "The HentaiVerse4.htm").read_text(encoding="utf-8"))
+    monkeypatch.setattr(serialization, "_DUMP_BATCH", 64)
+    writes: list[str] = []
+
+    class Sink:
+        def write(self, text: str) -> None:
+            writes.append(text)
+
+    dump(snap, Sink())
+    assert len(writes) > 10
+    assert "".join(writes) == snap.to_json()
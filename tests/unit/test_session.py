@@ -0,0 +1,134 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hv_bie import BattleSession, LogCursor, parse_snapshot
+from hv_bie.parsers import LayoutSpec, compile_plan
+from hv_bie.parsers.plan import Pane
+from hv_bie.parsers.slicing import find_element
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+HEALTH = 'nbargreen.png" style="width:106px" alt="health"'
+
+
+def read_fixture(name: str = "The HentaiVerse4.htm") -> str:
+    return (FIX / name).read_text(encoding="utf-8")
+
+
+def turn_pages(count: int) -> list[str]:
+    # Arya Stark (slot 2) loses health every turn
+    html = read_fixture()
+    return [
+        html.replace(HEALTH, HEALTH.replace("106px", f"{106 - i % 100}px"), 1)
+        for i in range(count)
+    ]
+
+
+def textlog(*rows: str) -> str:
+    cells = "".join(f'<tr><td class="tl">{r}</td></tr>' for r in reversed(rows))
+    return f'<table id="textlog"><tbody>{cells}</tbody></table>'
+
+
+def test_history_replays_every_turn():
+    pages = turn_pages(40)
+    session = BattleSession(keyframe_interval=8)
+    assert session.current is None and len(session) == 0
+    fed = [session.feed(page) for page in pages]
+
+    assert session.current is fed[-1]
+    assert session.at_turn(-1) is fed[-1]
+    assert (session.turns, session.first_turn, len(session)) == (40, 0, 40)
+    assert [session.at_turn(t) for t in range(40)] == fed
+    assert list(session.history()) == fed
+    assert list(session.history(start=35)) == fed[35:]
+    assert fed == [parse_snapshot(page) for page in pages]
+    with pytest.raises(IndexError):
+        session.at_turn(40)
+
+
+def test_max_turns_drops_whole_keyframe_segments():
+    pages = turn_pages(100)
+    session = BattleSession(keyframe_interval=8, max_turns=20)
+    fed = []
+    for page in pages:
+        fed.append(session.feed(page))
+        assert len(session) < 20 + 8
+    assert session.first_turn % 8 == 0 and len(session) >= 20
+    assert list(session.history()) == fed[session.first_turn :]
+    assert session.at_turn(session.first_turn + 3) == fed[session.first_turn + 3]
+    with pytest.raises(IndexError):
+        session.at_turn(session.first_turn - 1)
+
+
+def test_max_bytes_bounds_history():
+    session = BattleSession(keyframe_interval=4, max_bytes=150_000)
+    for page in turn_pages(60):
+        session.feed(page)
+        # Over budget only while the newest segment is all that is left
+        newest = (session.turns - 1) // 4 * 4
+        assert session.nbytes <= 150_000 or session.first_turn == newest
+    assert session.first_turn > 0
+    assert session.at_turn(session.first_turn) is not None
+
+
+def test_fragments_and_round_queries():
+    session = BattleSession(keyframe_interval=2, max_turns=3, log_cursor=LogCursor())
+    session.feed(read_fixture())
+    rows = ["Initializing Grindfest (Round 1 / 50) ...", "You hit A for 5 damage."]
+    session.feed_fragments({"textlog": textlog(*rows)})
+    rows.append("You hit A for 7 damage.")
+    mid = session.feed_fragments({"textlog": textlog(*rows)})
+    rows = ["Initializing Grindfest (Round 2 / 50) ...", "You hit B for 9 damage."]
+    last = session.feed_fragments({"textlog": textlog(*rows)})
+
+    assert session.round_turns(1) == range(1, 3)
+    assert session.round_turns(2) == range(3, 4)
+    assert session.at_round(1) == mid
+    assert session.at_round(2) is last
+    assert last.log.lines[-2:] == rows
+    assert session.at_round(3) is None
+
+    for _ in range(4):
+        session.feed_fragments({"textlog": textlog(*rows)})
+    # Turns 0-3 fell out of the window; round 1 went with them
+    assert session.first_turn == 4
+    assert session.round_turns(1) is None
+    assert session.round_turns(2) == range(4, 8)
+
+
+def test_rejects_conflicting_options():
+    with pytest.raises(ValueError):
+        BattleSession(keyframe_interval=0)
+    with pytest.raises(ValueError):
+        BattleSession(lazy=True)
+    with pytest.raises(ValueError):
+        BattleSession(engine="regex")
+    with pytest.raises(ValueError):
+        BattleSession(sections={"monster"})
+
+
+def test_fragments_use_the_session_options():
+    html = read_fixture().replace('id="pane_monster"', 'id="pane_foes"')
+    plan = compile_plan(replace(LayoutSpec(), monsters=Pane("div", "pane_foes")))
+    session = BattleSession(plan=plan, sections={"monsters"})
+    first = session.feed(html)
+    foes = html[html.index('<div id="pane_foes"') :]
+    foes = foes[: find_element(foes, "div", "pane_foes")[1]]
+    after = foes.replace(HEALTH, HEALTH.replace("106px", "60px"), 1)
+    snap = session.feed_fragments({"pane_foes": after, "textlog": textlog("x")})
+
+    assert snap.warnings == first.warnings == []
+    assert snap.monsters[2].hp_percent == 50.0
+    # The log is not a selected section, so its fragment is skipped
+    assert snap.log is first.log
+
+
+def test_fragments_reject_page_only_options():
+    for options in ({"engine": "fast"}, {"collect_stats": True}):
+        session = BattleSession(**options)
+        session.feed(read_fixture())
+        with pytest.raises(ValueError, match="feed()"):
+            session.feed_fragments({"textlog": textlog("x")})
+    session = BattleSession(engine="soup")
+    session.feed_fragments({"textlog": textlog("x")})
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from hv_bie import parse_snapshot
+from hv_bie.parsers.slicing import SECTION_ANCHORS, find_element, slice_section
+from hv_bie.snapshot import _SECTION_PARSERS
+from hv_bie.types.models import BattleSnapshot
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+def full_document_snapshot(html: str) -> BattleSnapshot:
+    soup = BeautifulSoup(html, "html.parser")
+    warnings: list[str] = []
+    parsed = {k: fn(soup, warnings) for k, fn in _SECTION_PARSERS.items()}
+    return BattleSnapshot(warnings=warnings, **parsed)
+
+
+@pytest.mark.parametrize("name", FIXTURES)
+def test_sliced_matches_full_document(name):
+    html = (FIX / name).read_text(encoding="utf-8")
+    for section in SECTION_ANCHORS:
+        assert slice_section(html, section), section
+    assert parse_snapshot(html) == full_document_snapshot(html)
+
+
+def test_find_element_balances_nested_tags():
+    html = '<div id="a"><div><div id="b">x</div></div></div><div>tail</div>'
+    start, end = find_element(html, "div", "a")
+    assert html[start:end] == '<div id="a"><div><div id="b">x</div></div></div>'
+    assert find_element(html, "div", "missing") == (0, 0)
+
+
+def test_unclean_anchor_falls_back_to_full_document():
+    html = (FIX / "The HentaiVerse.htm").read_text(encoding="utf-8")
+    # A second pane_monster id makes the slice ambiguous
+    doubled = html.replace("</body>", '<div id="pane_monster"></div></body>')
+    assert slice_section(doubled, "monsters") is None
+    assert parse_snapshot(doubled) == full_document_snapshot(doubled)
+
+    # Unterminated pane: the tag scan never returns to depth zero
+    assert find_element('<div id="pane_item"><div>', "div", "pane_item") is None
+
+
+# Malformed markup that a balanced-tag scan alone would slice differently
+# from the tree an HTML parser builds for the whole page
+MALFORMED = {
+    # A stray quote inside mkey_2 swallows the rest of the monster pane
+    "monsters": (
+        'id="mkey_2" class="btm1" onclick="battle',
+        'id="mkey_2" class="btm1" o',
+    ),
+    # pane_vitals ends up inside an attribute value of the focus button
+    "player": ('focus_n.png"></div>\n', ""),
+    # An end tag with junk after its name closes nothing
+    "items": ('</div><div id="qb5"', '</div"qb5"'),
+    # An unknown tag left open inside table_magic
+    "abilities": ("<div>Imperil</div>", "<d>Imperil</div>"),
+}
+
+
+@pytest.mark.parametrize("section", sorted(MALFORMED))
+@pytest.mark.parametrize("engine", ["soup", "fast", "sax"])
+def test_malformed_page_falls_back_to_full_document(section, engine):
+    old, new = MALFORMED[section]
+    html = (FIX / "The HentaiVerse4.htm").read_text(encoding="utf-8")
+    assert html.count(old) == 1
+    html = html.replace(old, new)
+
+    assert slice_section(html, section) is None
+    expected = full_document_snapshot(html)
+    snap = parse_snapshot(html, backend="html.parser", engine=engine)
+    assert getattr(snap, section) == getattr(expected, section)
+    assert snap == expected
+
+
+def test_absent_panes_still_warn():
+    snap = parse_snapshot("<html><body></body></html>")
+    assert "pane_vitals not found" in snap.warnings
+    assert "pane_monster not found" in snap.warnings
@@ -1,6 +1,9 @@
 from pathlib import Path
 
+import pytest
+
 from hv_bie import parse_snapshot
+from hv_bie.types.models import AbilitiesState, CombatLog, ItemsState
 
 FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
 
@@ -535,3 +538,26 @@ def test_parse_fixture_sprite():
     assert snap.warnings == []
     _ = snap.as_dict()
     _ = snap.to_json()
+
+
+def test_parse_selected_sections():
+    html = read_fixture("The HentaiVerse4.htm")
+    full = parse_snapshot(html)
+    snap = parse_snapshot(html, sections={"monsters", "player"})
+
+    assert snap.monsters == full.monsters
+    assert snap.player == full.player
+    assert snap.abilities == AbilitiesState()
+    assert snap.log == CombatLog()
+    assert snap.items == ItemsState()
+    assert snap.warnings == []
+
+    # Skipped sections never report missing panes
+    partial = parse_snapshot(html.replace('id="pane_item"', ""), sections=["log"])
+    assert partial.warnings == [] and partial.log == full.log
+
+    lazy = parse_snapshot(html, lazy=True, sections={"items"})
+    assert lazy.monsters == {} and lazy.items == full.items
+
+    with pytest.raises(ValueError):
+        parse_snapshot(html, sections={"monster"})
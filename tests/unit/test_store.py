@@ -0,0 +1,103 @@
+import os
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from hv_bie import HistoryStore, parse_snapshot
+from hv_bie.store import StoreError
+
+FIX = Path(__file__).resolve().parents[2] / "tests" / "fixtures" / "hv"
+FIXTURES = sorted(p.name for p in FIX.glob("*.htm*"))
+
+
+@pytest.fixture(scope="module")
+def turns():
+    snaps = [
+        parse_snapshot((FIX / name).read_text(encoding="utf-8"), log_events=True)
+        for name in FIXTURES
+    ]
+    # Three turns per round, cycling through the fixture pages
+    return [
+        replace(
+            snaps[i % len(snaps)],
+            log=replace(snaps[i % len(snaps)].log, current_round=i // 3),
+        )
+        for i in range(30)
+    ]
+
+
+def fill(path, turns, **options):
+    with HistoryStore(path, **options) as store:
+        for snap in turns:
+            store.append("arena", snap)
+        store.append("other", turns[0], round=7)
+
+
+def test_lookup_and_scan(tmp_path, turns):
+    path = tmp_path / "history.bin"
+    fill(path, turns, block_size=4)
+    with HistoryStore(path) as store:
+        assert len(store) == 31
+        assert store.battles() == ["arena", "other"]
+        assert store.rounds("arena") == list(range(10))
+        # The last turn of a round, from the middle of a block
+        assert store.get("arena", 4) == turns[14]
+        assert store.get("arena", 10) is None
+        assert store.get("other", 7) == turns[0]
+        assert [s for _, s in store.scan("arena", 3, 5)] == turns[9:15]
+        assert [r for r, _ in store.scan("arena")] == [i // 3 for i in range(30)]
+        assert list(store.scan("missing")) == []
+
+
+def test_reopened_store_appends_new_blocks(tmp_path, turns):
+    path = tmp_path / "history.bin"
+    fill(path, turns[:10], block_size=4)
+    with HistoryStore(path, block_size=4) as store:
+        entry = store.append("arena", turns[10])
+        assert entry.block_start
+        with pytest.raises(ValueError):
+            store.append("arena", turns[0])
+        # Appended records are visible to reads right away
+        assert store.get("arena", 3) == turns[10]
+    with HistoryStore(path) as store:
+        assert [s for _, s in store.scan("arena")] == turns[:11]
+
+
+def test_torn_tail_is_truncated(tmp_path, turns):
+    path = tmp_path / "history.bin"
+    fill(path, turns[:6], block_size=4)
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        f.truncate(size - 5)
+    with HistoryStore(path) as store:
+        # The torn record was the "other" battle's only turn
+        assert len(store) == 6
+        assert store.battles() == ["arena"]
+        assert store.get("other", 7) is None
+        store.append("arena", turns[6])
+    with HistoryStore(path) as store:
+        assert [s for _, s in store.scan("arena")] == turns[:7]
+
+
+def test_index_is_rebuilt_from_data(tmp_path, turns):
+    path = tmp_path / "history.bin"
+    fill(path, turns, block_size=4)
+    with HistoryStore(path) as store:
+        expected = store.entries("arena")
+    os.remove(str(path) + ".idx")
+    with HistoryStore(path) as store:
+        assert store.entries("arena") == expected
+        assert store.get("arena", 9) == turns[29]
+    # A torn index entry is dropped and re-read from the data file
+    with open(str(path) + ".idx", "r+b") as f:
+        f.truncate(os.path.getsize(str(path) + ".idx") - 3)
+    with HistoryStore(path) as store:
+        assert len(store) == 31 and store.get("other", 7) == turns[0]
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "history.bin"
+    path.write_bytes(b"not a store")
+    with pytest.raises(StoreError):
+        HistoryStore(path)